@@ -8,6 +8,9 @@ import sys
 
 
 from prepare_data1 import load_and_prepare_data
+from project_goldengo.bt_events import (
+    BUY_CREATE, BUY_EXECUTED, CLOSE, ORDER_FAILED, SELL_CREATE, SELL_EXECUTED, TRADE_CLOSED,
+    EventStrategyMixin)
 
 
 """
@@ -21,16 +24,15 @@ last value
 previous_value = self.sma[-1]
 """
 
-class TestStrat(bt.Strategy):
+class TestStrat(EventStrategyMixin, bt.Strategy):
     params = (
         ('maperiod', 15),
+        ('printlog', True),
+        ('record', False),
     )
-    def log(self, txt, dt=None):
-        # Logging function for this strat
-        dt = dt or self.datas[0].datetime.date(0)
-        print('%s, %s' % (dt.isoformat(), txt))
-
     def __init__(self):
+        # Logging einmal festlegen (printlog=False: next() formatiert nichts mehr)
+        self.init_events(printlog=self.params.printlog, record=self.params.record)
         # Keep reference to the "close" line in the data[0] dataseries
         self.dataclose = self.datas[0].close
         # To keep track of pending orders
@@ -58,16 +60,18 @@ class TestStrat(bt.Strategy):
         # Attention: broker could reject order if not enough cash
         if order.status in [order.Completed]:
             if order.isbuy():
-                self.log('BUY EXECUTED, Price: %.2f, cost: %.2f, Comm %.2f' % (order.executed.price, order.executed.value, order.executed.comm))
+                if self.log_events:
+                    self.event(BUY_EXECUTED, order.executed.price, order.executed.value, order.executed.comm)
                 self.buyprice = order.executed.price
                 self.buycomm = order.executed.comm
-            else:
-                self.log('SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' % (order.executed.price, order.executed.value, order.executed.comm))
+            elif self.log_events:
+                self.event(SELL_EXECUTED, order.executed.price, order.executed.value, order.executed.comm)
 
             self.bar_executed = len(self)
 
         elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            self.log('Order Canceled/Margin/Rejected')
+            if self.log_events:
+                self.event(ORDER_FAILED)
         # Write down: no pending order
         self.order = None
 
@@ -75,12 +79,14 @@ class TestStrat(bt.Strategy):
         if not trade.isclosed:
             return
 
-        self.log('OPERATION PROFIT, GROSS %.2fk NET %.2f' % (trade.pnl, trade.pnlcomm))
+        if self.log_events:
+            self.event(TRADE_CLOSED, trade.pnl, trade.pnlcomm)
 
     # next() will be called on each bar of the system clock (self.datas[0])
     def next(self):
         # Log the closing price of series from reference
-        self.log('Close, %.2f' % self.dataclose[0])
+        if self.log_bars:
+            self.event(CLOSE, self.dataclose[0])
 
         # Check if an order is pending
         if self.order:
@@ -93,14 +99,16 @@ class TestStrat(bt.Strategy):
             # current close less than previous close
             if self.dataclose[0] > self.sma[0]:
                 # buy (with all possible default parameters)
-                self.log('BUY CREATE, %.2f' % self.dataclose[0])
+                if self.log_events:
+                    self.event(BUY_CREATE, self.dataclose[0])
                 # Keep track of the created order to avoid a 2nd order
                 self.order = self.buy()
         else:
             # Already in the market ... we might sell
             if self.dataclose[0] < self.sma[0]:
                 # sell (with all possible default parameters)
-                self.log('SELL CREATE, %.2f' % self.dataclose[0])
+                if self.log_events:
+                    self.event(SELL_CREATE, self.dataclose[0])
                 # Keep track of the created order to avoid a 2nd order
                 self.order = self.sell()
 
@@ -8,13 +8,18 @@ import sys
 
 
 from prepare_data1 import load_and_prepare_data
+from project_goldengo.bt_events import (
+    BUY_CREATE, BUY_EXECUTED, CLOSE, ORDER_FAILED, SELL_CREATE, SELL_EXECUTED, TRADE_CLOSED,
+    EventStrategyMixin)
+from project_goldengo.bt_optimize import optimize_backtrader
 
 
 # Create a Stratey
-class TestStrategy(bt.Strategy):
+class TestStrategy(EventStrategyMixin, bt.Strategy):
     params = (
         ('maperiod', 15),
         ('printlog', False),
+        ('record', False),  # Ereignisse in strategy.events (EventLog) aufzeichnen
     )
 
     def log(self, txt, dt=None, doprint=False):
@@ -24,6 +29,9 @@ class TestStrategy(bt.Strategy):
             print('%s, %s' % (dt.isoformat(), txt))
 
     def __init__(self):
+        # Logging einmal festlegen: next() prüft danach nur noch self.log_bars
+        self.init_events(printlog=self.params.printlog, record=self.params.record)
+
         # Keep a reference to the "close" line in the data[0] dataseries
         self.dataclose = self.datas[0].close
 
@@ -45,24 +53,21 @@ class TestStrategy(bt.Strategy):
         # Attention: broker could reject order if not enough cash
         if order.status in [order.Completed]:
             if order.isbuy():
-                self.log(
-                    'BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
-                    (order.executed.price,
-                     order.executed.value,
-                     order.executed.comm))
+                if self.log_events:
+                    self.event(BUY_EXECUTED, order.executed.price,
+                               order.executed.value, order.executed.comm)
 
                 self.buyprice = order.executed.price
                 self.buycomm = order.executed.comm
-            else:  # Sell
-                self.log('SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
-                         (order.executed.price,
-                          order.executed.value,
-                          order.executed.comm))
+            elif self.log_events:  # Sell
+                self.event(SELL_EXECUTED, order.executed.price,
+                           order.executed.value, order.executed.comm)
 
             self.bar_executed = len(self)
 
         elif order.status in [order.Canceled, order.Margin, order.Rejected]:
-            self.log('Order Canceled/Margin/Rejected')
+            if self.log_events:
+                self.event(ORDER_FAILED)
 
         # Write down: no pending order
         self.order = None
@@ -71,12 +76,13 @@ class TestStrategy(bt.Strategy):
         if not trade.isclosed:
             return
 
-        self.log('OPERATION PROFIT, GROSS %.2f, NET %.2f' %
-                 (trade.pnl, trade.pnlcomm))
+        if self.log_events:
+            self.event(TRADE_CLOSED, trade.pnl, trade.pnlcomm)
 
     def next(self):
         # Simply log the closing price of the series from the reference
-        self.log('Close, %.2f' % self.dataclose[0])
+        if self.log_bars:
+            self.event(CLOSE, self.dataclose[0])
 
         # Check if an order is pending ... if yes, we cannot send a 2nd one
         if self.order:
@@ -89,7 +95,8 @@ class TestStrategy(bt.Strategy):
             if self.dataclose[0] > self.sma[0]:
 
                 # BUY, BUY, BUY!!! (with all possible default parameters)
-                self.log('BUY CREATE, %.2f' % self.dataclose[0])
+                if self.log_events:
+                    self.event(BUY_CREATE, self.dataclose[0])
 
                 # Keep track of the created order to avoid a 2nd order
                 self.order = self.buy()
@@ -98,7 +105,8 @@ class TestStrategy(bt.Strategy):
 
             if self.dataclose[0] < self.sma[0]:
                 # SELL, SELL, SELL!!! (with all possible default parameters)
-                self.log('SELL CREATE, %.2f' % self.dataclose[0])
+                if self.log_events:
+                    self.event(SELL_CREATE, self.dataclose[0])
 
                 # Keep track of the created order to avoid a 2nd order
                 self.order = self.sell()
@@ -109,38 +117,21 @@ class TestStrategy(bt.Strategy):
 
 
 if __name__ == '__main__':
-    # Create a cerebro entity
-    cerebro = bt.Cerebro()
-
-    # Add a strategy
-    strats = cerebro.optstrategy(
-        TestStrategy,
-        maperiod=range(10, 31))
-
-     # Load and prepare Data
+    # Load and prepare Data
     base_dir = os.path.dirname(os.path.abspath(__file__))
     datafile = os.path.join(base_dir, "..", "crypto_data", "BTC", "BTC-USD_1d_20_25.csv")
     prepared_df = load_and_prepare_data(datafile)
 
     if prepared_df is not None:
-        data = bt.feeds.PandasData(dataname=prepared_df)
-        # Add data feed to Cerebro
-        cerebro.adddata(data)
-
-        # set cash amount (if you want something different than 10'000)
-        cerebro.broker.setcash(100000.0)
-
-        # Add a FixedSize sizer according to the stake
-        cerebro.addsizer(bt.sizers.FixedSize, stake=10)
-
-        # Set the commission - 0.1 % (or more) and divide by 100 to remove the %
-        cerebro.broker.setcommission(commission=0.001)
-
-        print('Starting Portfolio Value: %.2f' % cerebro.broker.getvalue())
-
-        # running cerebro instance
-        cerebro.run()
-
-        print('Final Portfolio Value: %.2f' % cerebro.broker.getvalue())
+        # Cerebro mit einmal geladenen Daten, allen Kernen und Analyzern
+        # (Sharpe, Drawdown, Rendite, Trades) statt optstrategy mit Standardwerten
+        results = optimize_backtrader(
+            TestStrategy, prepared_df,
+            cash=100000.0,       # set cash amount
+            commission=0.001,    # 0.1 %
+            stake=10,            # FixedSize sizer
+            maperiod=range(10, 31))
+
+        print(results.to_string(float_format='%.2f'))
     else:
-        print('Error while loading data')
\ No newline at end of file
+        print('Error while loading data')
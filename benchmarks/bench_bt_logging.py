@@ -0,0 +1,191 @@
+# bench_bt_logging.py
+# Misst `cerebro.run()` für die maperiod-Optimierung aus
+# backtrader/optimization.py (optstrategy mit maperiod=range(10, 31), also 21
+# Läufe, maxcpus=1) mit drei Arten zu protokollieren:
+#
+#   vorher:       bisherige TestStrategy: next() formatiert 'Close, %.2f' auf
+#                 jeder Kerze und log() verwirft den String (printlog=False)
+#   leise:        TestStrategy mit project_goldengo.bt_events, printlog=False
+#   aufzeichnen:  dieselbe mit record=True (EventLog + EventLogAnalyzer)
+#
+# Alle drei müssen dieselben Endwerte liefern; beim Aufzeichnen wird zusätzlich
+# geprüft, ob der Puffer die Ausgabe von printlog=True Zeile für Zeile enthält.
+#
+# Mit maxcpus=1 lädt backtrader die PandasData-Reihe für jeden Lauf neu (per
+# iloc, Zelle für Zelle); das dominiert die Laufzeit. Deshalb wird die
+# Protokollzeile in next() zusätzlich für sich gemessen (ns pro Kerze).
+#
+# Aufruf:  python benchmarks/bench_bt_logging.py [Kerzen] [Wiederholungen]
+
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+import timeit
+from types import SimpleNamespace
+
+import backtrader as bt
+import pandas as pd
+
+from project_goldengo.bt_events import CLOSE, EventLog, EventLogAnalyzer
+from validate_vectorized import synthetic_data
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backtrader')
+
+
+def load_optimization():
+    # optimization.py importiert prepare_data1 aus seinem eigenen Ordner
+    sys.path.insert(0, SCRIPT_DIR)
+    spec = importlib.util.spec_from_file_location('bt_optimization', os.path.join(SCRIPT_DIR, 'optimization.py'))
+    module = importlib.util.module_from_spec(spec)
+    # backtrader schlägt beim Anlegen der Strategie ihr Modul in sys.modules nach
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class EagerStrategy(bt.Strategy):
+    """Die bisherige TestStrategy: Strings werden immer formatiert."""
+
+    params = (
+        ('maperiod', 15),
+        ('printlog', False),
+    )
+
+    def log(self, txt, dt=None, doprint=False):
+        if self.params.printlog or doprint:
+            dt = dt or self.datas[0].datetime.date(0)
+            print('%s, %s' % (dt.isoformat(), txt))
+
+    def __init__(self):
+        self.dataclose = self.datas[0].close
+        self.order = None
+        self.sma = bt.indicators.SimpleMovingAverage(self.datas[0], period=self.params.maperiod)
+
+    def notify_order(self, order):
+        if order.status in [order.Submitted, order.Accepted]:
+            return
+        if order.status in [order.Completed]:
+            if order.isbuy():
+                self.log('BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
+                         (order.executed.price, order.executed.value, order.executed.comm))
+            else:
+                self.log('SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f' %
+                         (order.executed.price, order.executed.value, order.executed.comm))
+        elif order.status in [order.Canceled, order.Margin, order.Rejected]:
+            self.log('Order Canceled/Margin/Rejected')
+        self.order = None
+
+    def notify_trade(self, trade):
+        if not trade.isclosed:
+            return
+        self.log('OPERATION PROFIT, GROSS %.2f, NET %.2f' % (trade.pnl, trade.pnlcomm))
+
+    def next(self):
+        self.log('Close, %.2f' % self.dataclose[0])
+        if self.order:
+            return
+        if not self.position:
+            if self.dataclose[0] > self.sma[0]:
+                self.log('BUY CREATE, %.2f' % self.dataclose[0])
+                self.order = self.buy()
+        elif self.dataclose[0] < self.sma[0]:
+            self.log('SELL CREATE, %.2f' % self.dataclose[0])
+            self.order = self.sell()
+
+    def stop(self):
+        self.log('(MA Period %2d) Ending Value %.2f' %
+                 (self.params.maperiod, self.broker.getvalue()), doprint=True)
+
+
+def make_cerebro(df, strategy, **params):
+    cerebro = bt.Cerebro(maxcpus=1)
+    cerebro.optstrategy(strategy, maperiod=range(10, 31), **params)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(100000.0)
+    cerebro.addsizer(bt.sizers.FixedSize, stake=10)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.addanalyzer(EventLogAnalyzer, _name='events')
+    return cerebro
+
+
+def run(df, strategy, repeat, **params):
+    """Beste Laufzeit von cerebro.run() und die Ausgabe des letzten Laufs."""
+    best = float('inf')
+    for _ in range(repeat):
+        cerebro = make_cerebro(df, strategy, **params)
+        out = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(out):
+            results = cerebro.run()
+        best = min(best, time.perf_counter() - start)
+    return best, results, out.getvalue()
+
+
+def per_bar_ns(number=200_000):
+    """Kosten der Protokollzeile in next() pro Kerze, ohne backtrader drumherum."""
+    eager = SimpleNamespace(params=SimpleNamespace(printlog=False))
+    quiet = SimpleNamespace(log_bars=False)
+    events = EventLog(number)
+    statements = {
+        'vorher (eager)': ("log(s, 'Close, %.2f' % x)", dict(log=EagerStrategy.log, s=eager)),
+        'leise': ("if s.log_bars: s.event(CLOSE, x)", dict(s=quiet, CLOSE=CLOSE)),
+        'aufzeichnen': ("append(1, 738000.5, CLOSE, (x,))", dict(append=events.append, CLOSE=CLOSE)),
+    }
+    timings = {}
+    for name, (statement, namespace) in statements.items():
+        events.clear()
+        seconds = min(timeit.repeat(statement, globals=dict(namespace, x=12345.678), number=number, repeat=3))
+        timings[name] = seconds / number * 1e9
+    return timings
+
+
+def ending_values(output):
+    return [line.rsplit(' ', 1)[-1] for line in output.splitlines() if 'Ending Value' in line]
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    # Die Strategie rechnet mit fester Stückzahl 10: Preise auf BTC-Niveau
+    # würden das Startkapital übersteigen, deshalb skaliert
+    df = synthetic_data(rows)[['Open', 'High', 'Low', 'Close', 'Volume']] / [100, 100, 100, 100, 1]
+    TestStrategy = load_optimization().TestStrategy
+
+    t_eager, _, out_eager = run(df, EagerStrategy, repeat)
+    t_quiet, _, out_quiet = run(df, TestStrategy, repeat)
+    t_record, results, out_record = run(df, TestStrategy, repeat, record=True)
+
+    rows_out = [
+        {'Weg': 'vorher (eager)', 'Zeit [s]': t_eager},
+        {'Weg': 'leise', 'Zeit [s]': t_quiet},
+        {'Weg': 'aufzeichnen', 'Zeit [s]': t_record},
+    ]
+    table = pd.DataFrame(rows_out)
+    table['Faktor'] = t_eager / table['Zeit [s]']
+    table['next()-Protokoll [ns/Kerze]'] = table['Weg'].map(per_bar_ns())
+    print(f"{len(df)} Kerzen, 21 Läufe (maperiod 10..30), maxcpus=1\n")
+    print(table.to_string(index=False, float_format='%.2f'))
+
+    same = ending_values(out_eager) == ending_values(out_quiet) == ending_values(out_record)
+    events = [run_result[0].analyzers.events.get_analysis() for run_result in results]
+    print(f"\nAufgezeichnet: {sum(len(frame) for frame in events)} Ereignisse in {len(events)} Läufen")
+    print(events[0].head().to_string())
+
+    # Kontrolle: Puffer des ersten Laufs = Ausgabe mit printlog=True
+    cerebro = bt.Cerebro(maxcpus=1)
+    cerebro.addstrategy(TestStrategy, maperiod=10, printlog=True, record=True)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(100000.0)
+    cerebro.addsizer(bt.sizers.FixedSize, stake=10)
+    cerebro.broker.setcommission(commission=0.001)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        strategy = cerebro.run()[0]
+    printed = [line for line in out.getvalue().splitlines() if 'Ending Value' not in line]
+    same &= printed == strategy.events.format()
+
+    print("\n✅ Endwerte identisch, Puffer entspricht der printlog-Ausgabe." if same
+          else "\n❌ Abweichungen gefunden.")
@@ -0,0 +1,85 @@
+# bench_bt_optimize.py
+# Vergleicht die maperiod-Optimierung aus backtrader/optimization.py
+# (TestStrategy, maperiod=range(10, 31), 21 Läufe):
+#
+#   optstrategy (Standard):  bt.Cerebro() mit Standardwerten und PandasData
+#                            (alle Kerne, Cerebro pro Lauf an den Worker),
+#                            ohne Kennzahlen und mit denselben Analyzern
+#   optstrategy (1 Kern):    dasselbe mit maxcpus=1, Daten pro Lauf neu geladen
+#   optimize_backtrader:     project_goldengo.bt_optimize mit 1 Kern und mit
+#                            allen Kernen (Daten einmal geladen, Analyzer)
+#
+# Die Endwerte aus stop() müssen überall gleich sein.
+#
+# Aufruf:  python benchmarks/bench_bt_optimize.py [Kerzen]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+import backtrader as bt
+import pandas as pd
+
+from bench_bt_logging import ending_values, load_optimization
+from project_goldengo.bt_optimize import FinalValue, optimize_backtrader
+from validate_vectorized import synthetic_data
+
+MAPERIOD = range(10, 31)
+
+
+def plain_optstrategy(df, strategy, analyzers=False, **cerebro_kwargs):
+    cerebro = bt.Cerebro(**cerebro_kwargs)
+    if analyzers:
+        cerebro.addanalyzer(FinalValue, _name='value')
+        cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe', timeframe=bt.TimeFrame.Days,
+                            annualize=True, factor=365)
+        cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+    cerebro.optstrategy(strategy, maperiod=MAPERIOD)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.broker.setcash(100000.0)
+    cerebro.addsizer(bt.sizers.FixedSize, stake=10)
+    cerebro.broker.setcommission(commission=0.001)
+    cerebro.run()
+
+
+def timed(func, *args, **kwargs):
+    out = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(out):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start, sorted(ending_values(out.getvalue()))
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    df = synthetic_data(rows)[['Open', 'High', 'Low', 'Close', 'Volume']] / [100, 100, 100, 100, 1]
+    TestStrategy = load_optimization().TestStrategy
+    cores = os.cpu_count() or 1
+
+    ways = [
+        ('optstrategy (Standard)', plain_optstrategy, {}),
+        ('optstrategy (Standard, Analyzer)', plain_optstrategy, dict(analyzers=True)),
+        ('optstrategy (1 Kern)', plain_optstrategy, dict(maxcpus=1)),
+        ('optimize_backtrader (1 Kern)', optimize_backtrader, dict(maxcpus=1)),
+    ]
+    if cores > 1:
+        ways.append((f'optimize_backtrader ({cores} Kerne)', optimize_backtrader, {}))
+
+    results, reference, same = [], None, True
+    for name, func, kwargs in ways:
+        if func is optimize_backtrader:
+            table, seconds, values = timed(func, TestStrategy, df, maperiod=MAPERIOD, **kwargs)
+        else:
+            _, seconds, values = timed(func, df, TestStrategy, **kwargs)
+        reference = reference or values
+        same &= values == reference
+        results.append({'Weg': name, 'Zeit [s]': seconds, 'Läufe/s': len(MAPERIOD) / seconds})
+
+    print(f"{len(df)} Kerzen, {len(MAPERIOD)} Läufe, {cores} Kern(e)\n")
+    print(pd.DataFrame(results).to_string(index=False, float_format='%.2f'))
+    print("\nBeste Parametersätze nach Sharpe Ratio:")
+    print(table.head().to_string(float_format='%.2f'))
+    print("\n✅ Endwerte überall identisch." if same else "\n❌ Endwerte weichen ab.")
@@ -0,0 +1,73 @@
+# bench_charts.py
+# Vergleicht das Speichern von Charts pro Backtest:
+#
+#   bisher:  bt.plot() im Batch (voller Bokeh-Chart mit allen Kerzen,
+#            hier mit open_browser=False in eine HTML-Datei)
+#   neu:     save_chart -> record_chart (LTTB auf 2000 Punkte) im Batch,
+#            Rendern als PNG im Hintergrund (charts.ChartRenderer als Thread,
+#            Prozess oder auf Abruf mit render_pending)
+#
+# Gemessen wird die Zeit, die der Batch pro Chart blockiert, die gesamte
+# Zeit bis alle Charts fertig sind, und die Dateigröße.
+#
+# Aufruf:  python benchmarks/bench_charts.py [Charts] [Kerzen]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+from backtesting import Backtest
+
+from project_goldengo import saved_output
+from project_goldengo.charts import ChartRenderer, render_pending
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+
+def disk_usage(directory):
+    files = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return len(files), sum(os.path.getsize(f) for f in files)
+
+
+if __name__ == '__main__':
+    charts = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    tsmom = load_script('03_tsmom_btc.py').TSMOMStrategy
+    bt = Backtest(synthetic_data(rows), tsmom, cash=1_000_000, commission=0.002, trade_on_close=True)
+    stats = bt.run()
+    print(f"{charts} Charts à {rows} Kerzen, {stats['# Trades']} Trades")
+
+    results = []
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(charts):
+                bt.plot(results=stats, filename=os.path.join(old_dir, f"BTC_{i}.html"), open_browser=False)
+        elapsed = time.perf_counter() - start
+        files, size = disk_usage(old_dir)
+        results.append({'Weg': 'bt.plot()', 'blockiert [s]': elapsed, 'gesamt [s]': elapsed,
+                        'Dateien': files, 'MB': size / 1e6})
+
+        for mode in ('thread', 'process', 'defer'):
+            saved_output.LOG_DIR = os.path.join(new_dir, mode)
+            os.makedirs(saved_output.LOG_DIR)
+            start = time.perf_counter()
+            with ChartRenderer(mode) as renderer, contextlib.redirect_stdout(io.StringIO()):
+                for i in range(charts):
+                    saved_output.save_chart(bt, stats, f"BTC_{i}", renderer)
+                blocked = time.perf_counter() - start
+            if mode == 'defer':
+                render_pending(saved_output.LOG_DIR)
+            elapsed = time.perf_counter() - start
+            files, size = disk_usage(saved_output.LOG_DIR)
+            results.append({'Weg': f"save_chart, mode='{mode}'", 'blockiert [s]': blocked,
+                            'gesamt [s]': elapsed, 'Dateien': files, 'MB': size / 1e6})
+
+    print(pd.DataFrame(results).to_string(index=False, float_format='%.2f'))
@@ -0,0 +1,93 @@
+# bench_compact.py
+# Speicherbedarf von sechs 5m-Reihen als vorbereiteter DataFrame
+# (load_and_prepare_data) und als CompactOHLCV (project_goldengo.compact).
+#
+# Die synthetischen Kurse werden pro Symbol auf eine realistische
+# Größenordnung skaliert und wie an der Börse auf den Tick gerundet, das
+# Volumen auf 5 (Binance) bzw. 0 Nachkommastellen (yfinance). Eine Reihe
+# kommt als yfinance-Export mit 'Adj Close'. Geprüft wird, ob `to_frame()`
+# die Pflichtspalten des vorbereiteten Frames Bit für Bit wiederherstellt.
+#
+# Aufruf:  python benchmarks/bench_compact.py [Kerzen]
+
+import contextlib
+import io
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from project_goldengo.compact import CompactOHLCV
+from project_goldengo.prepare_data import REQUIRED_COLUMNS, load_and_prepare_data
+from validate_vectorized import synthetic_data
+
+# Symbol -> (höchster Kurs, Nachkommastellen Preis, Nachkommastellen Volumen)
+SYMBOLS = {
+    'BTCUSDT': (110_000, 2, 5),
+    'ETHUSDT': (4_800, 2, 4),
+    'SOLUSDT': (260, 2, 3),
+    'XRPUSDT': (3.4, 4, 1),
+    'TRXUSDT': (0.45, 5, 1),
+    'BTC-USD': (110_000, 2, 0),
+}
+
+
+def symbol_frame(rows, seed, top, price_decimals, volume_decimals):
+    df = synthetic_data(rows, seed=seed)
+    prices = ['Open', 'High', 'Low', 'Close']
+    df[prices] = (df[prices] * (top / df['High'].max())).round(price_decimals)
+    df['Volume'] = (df['Volume'] * 10 ** (volume_decimals + 1)).round(volume_decimals)
+    return df
+
+
+def frame_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+    results, same = [], True
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, (symbol, spec) in enumerate(SYMBOLS.items()):
+            df = symbol_frame(rows, number + 7, *spec)
+            path = os.path.join(tmp, f'{symbol}_5m.csv')
+            if symbol.endswith('-USD'):
+                df['Adj Close'] = df['Close']
+            df.to_csv(path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                prepared = load_and_prepare_data(path)
+
+            start = time.perf_counter()
+            compact = CompactOHLCV.from_frame(prepared)
+            t_compact = time.perf_counter() - start
+            start = time.perf_counter()
+            restored = compact.to_frame()
+            t_frame = time.perf_counter() - start
+
+            same &= restored.equals(prepared[REQUIRED_COLUMNS])
+            results.append({
+                'Symbol': symbol,
+                'Spalten': len(prepared.columns),
+                'float32': ', '.join(col[0] for col, decimals in compact.decimals.items()
+                                     if decimals is not None) or '-',
+                'DataFrame [MB]': frame_bytes(prepared) / 1024 ** 2,
+                'Compact [MB]': compact.nbytes / 1024 ** 2,
+                'Pickle DataFrame [MB]': len(pickle.dumps(prepared)) / 1024 ** 2,
+                'Pickle Compact [MB]': len(pickle.dumps(compact)) / 1024 ** 2,
+                'from_frame [ms]': t_compact * 1e3,
+                'to_frame [ms]': t_frame * 1e3,
+            })
+
+    table = pd.DataFrame(results)
+    table['Ersparnis [%]'] = (1 - table['Compact [MB]'] / table['DataFrame [MB]']) * 100
+    print(f"{rows} Kerzen pro Symbol (5m)\n")
+    print(table.to_string(index=False, float_format='%.1f'))
+    total_frame, total_compact = table['DataFrame [MB]'].sum(), table['Compact [MB]'].sum()
+    print(f"\nSumme: {total_frame:.1f} MB -> {total_compact:.1f} MB "
+          f"({(1 - total_compact / total_frame) * 100:.0f} % weniger)")
+    print("\n✅ to_frame() stellt alle Pflichtspalten exakt wieder her." if same
+          else "\n❌ to_frame() weicht vom vorbereiteten Frame ab.")
@@ -0,0 +1,78 @@
+# bench_csv_parsing.py
+# Misst das Einlesen der CSV-Dateien in load_and_prepare_data (ohne Cache):
+#
+#   robust:          read_csv mit Typ-Erkennung, to_datetime(errors='coerce'),
+#                    to_numeric pro Spalte (bisheriger Weg)
+#   schnell (C):     bekanntes Layout, feste float64-Spalten, ISO-Zeitstempel
+#   schnell (arrow): dasselbe mit der pyarrow-Engine
+#
+# für eine Binance-Datei (`_full.csv`) und einen yfinance-Export mit
+# MultiIndex-Kopf ("Price"/"Ticker"/"Date"). Die Ergebnisse werden mit den
+# geschriebenen Werten verglichen.
+#
+# Aufruf:  python benchmarks/bench_csv_parsing.py [Zeilen]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo import prepare_data
+from validate_vectorized import synthetic_data
+
+warnings.filterwarnings('ignore')
+
+
+def write_yfinance(df, path):
+    frame = df[['Close', 'High', 'Low', 'Open', 'Volume']]
+    frame.columns = pd.MultiIndex.from_product([frame.columns, ['BTC-USD']], names=['Price', 'Ticker'])
+    frame.to_csv(path)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 600_000
+    original = synthetic_data(rows)
+    arrow_options = prepare_data.CSV_READ_OPTIONS
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        files = {'Binance': os.path.join(tmp, 'BTCUSDT_5m_full.csv'),
+                 'yfinance': os.path.join(tmp, 'BTC-USD_5m.csv')}
+        original.to_csv(files['Binance'])
+        write_yfinance(original, files['yfinance'])
+
+        for layout, path in files.items():
+            ways = [('robust', prepare_data._parse_csv_robust, {}),
+                    ('schnell (C)', prepare_data._parse_csv, {})]
+            if arrow_options:
+                ways.append(('schnell (arrow)', prepare_data._parse_csv, arrow_options))
+            for name, parse, options in ways:
+                prepare_data.CSV_READ_OPTIONS = options
+                data, seconds = timed(parse, path)
+                expected = original[data.columns]
+                results.append({
+                    'Layout': layout, 'Weg': name, 'Zeit [s]': seconds,
+                    'Index gleich': data.index.equals(expected.index),
+                    'Werte exakt [%]': (data.to_numpy() == expected.to_numpy()).mean() * 100,
+                    'max. Abweichung': np.abs(data.to_numpy() - expected.to_numpy()).max(),
+                })
+        prepare_data.CSV_READ_OPTIONS = arrow_options
+
+    table = pd.DataFrame(results)
+    robust = table.groupby('Layout')['Zeit [s]'].transform('first')
+    table['Faktor'] = robust / table['Zeit [s]']
+    print(f"{rows} Zeilen pro Datei\n")
+    print(table.to_string(index=False, float_format=lambda x: f"{x:.3g}"))
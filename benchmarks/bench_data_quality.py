@@ -0,0 +1,130 @@
+# bench_data_quality.py
+# Prüft und misst project_goldengo.data_quality:
+#
+#   - scan_ohlcv auf 5m-Daten mit eingebauten Fehlern (Lücken, doppelte und
+#     vertauschte Zeitstempel, Kerzen mit High < Low); die gefundenen Zahlen
+#     müssen den eingebauten entsprechen
+#   - dieselbe Prüfung mit pandas-Mitteln (duplicated, is_monotonic, diff),
+#     dazu scan_ohlcv auf den sauberen Daten vor dem Einbauen der Fehler
+#   - load_and_prepare_data aus dem Cache: Urteil gespeichert vs. jedes Mal
+#     neu geprüft
+#   - repair_ohlcv: danach keine doppelten/unsortierten Zeitstempel und mit
+#     fill_gaps=True keine Lücken mehr
+#
+# Aufruf:  python benchmarks/bench_data_quality.py [Kerzen]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo import prepare_data
+from project_goldengo.data_quality import describe, repair_ohlcv, scan_ohlcv
+from validate_vectorized import synthetic_data
+
+
+def timed(func, *args, repeat=5, **kwargs):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def pandas_scan(df):
+    """Dieselben Zähler mit pandas-Operationen auf Index und Spalten."""
+    index = df.index
+    ordered = index if index.is_monotonic_increasing else index.sort_values()
+    steps = ordered.to_series().diff().dropna()
+    step = steps[steps > pd.Timedelta(0)].median()
+    gaps = steps[steps > step]
+    return {
+        'unsorted': int((index.to_series().diff() < pd.Timedelta(0)).sum()),
+        'duplicates': int(index.duplicated().sum()),
+        'gaps': len(gaps),
+        'missing_bars': int((gaps // step - 1).sum()),
+        'high_below_low': int((df['High'] < df['Low']).sum()),
+        'open_close_outside': int(((df[['Open', 'Close']].max(axis=1) > df['High'])
+                                   | (df[['Open', 'Close']].min(axis=1) < df['Low'])).sum()),
+    }
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 600_000
+    df = synthetic_data(rows)
+    _, t_clean = timed(scan_ohlcv, df)
+    rng = np.random.default_rng(5)
+
+    # Fehler einbauen: 40 Lücken à 1-12 Kerzen, 25 doppelte Zeilen,
+    # 3 vertauschte Nachbarn, 7 Kerzen mit High < Low
+    keep = np.ones(len(df), dtype=bool)
+    starts = rng.choice(np.arange(100, len(df) - 100, 100), 40, replace=False)
+    lengths = rng.integers(1, 13, 40)
+    for start, length in zip(starts, lengths):
+        keep[start:start + length] = False
+    df = df[keep]
+    duplicates = df.iloc[np.sort(rng.choice(np.arange(50, len(df), 100), 25, replace=False))]
+    df = pd.concat([df, duplicates]).sort_index(kind='stable')
+    positions = np.arange(len(df))
+    for i in rng.choice(np.arange(1000, len(df) - 1000, 1000), 3, replace=False):
+        positions[[i, i + 1]] = positions[[i + 1, i]]
+    df = df.iloc[positions].copy()
+    bad = rng.choice(len(df), 7, replace=False)
+    df.iloc[bad, df.columns.get_loc('High')] = df['Low'].iloc[bad] - 1.0
+
+    expected = {'gaps': 40, 'missing_bars': int(lengths.sum()), 'duplicates': 25, 'unsorted': 3,
+                'high_below_low': 7}
+    report, t_scan = timed(scan_ohlcv, df)
+    reference, t_pandas = timed(pandas_scan, df, repeat=2)
+    found = {key: report[key] for key in expected}
+    same = found == expected and all(report[key] == value for key, value in reference.items()
+                                     if key != 'unsorted')
+
+    print(f"{len(df)} 5m-Kerzen\n")
+    print(f"Urteil: {describe(report)}\n")
+    print(pd.DataFrame([
+        {'Weg': 'scan_ohlcv, saubere Daten', 'Zeit [ms]': t_clean * 1e3},
+        {'Weg': 'scan_ohlcv, mit Fehlern', 'Zeit [ms]': t_scan * 1e3},
+        {'Weg': 'pandas (duplicated, diff, ...)', 'Zeit [ms]': t_pandas * 1e3},
+    ]).to_string(index=False, float_format='%.1f'))
+
+    repaired = repair_ohlcv(df)
+    after = scan_ohlcv(repaired)
+    filled = repair_ohlcv(df, fill_gaps=True)
+    after_fill = scan_ohlcv(filled)
+    same &= after['duplicates'] == after['unsorted'] == 0 and after['gaps'] == 40
+    same &= after_fill['gaps'] == 0 and len(filled) == rows
+    same &= after_fill['high_below_low'] == 7
+
+    load_rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'BTCUSDT_5m_full.csv')
+        df.to_csv(path)
+        timed(prepare_data.load_and_prepare_data, path, repeat=1)
+        _, t_cached = timed(prepare_data.load_and_prepare_data, path)
+
+        # Ohne gespeichertes Urteil: bei jedem Laden neu prüfen
+        original = prepare_data._read_quality
+        prepare_data._read_quality = lambda quality_file: None
+        try:
+            _, t_rescan = timed(prepare_data.load_and_prepare_data, path)
+        finally:
+            prepare_data._read_quality = original
+        load_rows += [{'Laden aus dem Cache': 'Urteil gespeichert', 'Zeit [ms]': t_cached * 1e3},
+                      {'Laden aus dem Cache': 'jedes Mal geprüft', 'Zeit [ms]': t_rescan * 1e3}]
+        repaired_load, _ = timed(prepare_data.load_and_prepare_data, path, repeat=1, fill_gaps=True)
+        same &= repaired_load.equals(filled)
+
+    print()
+    print(pd.DataFrame(load_rows).to_string(index=False, float_format='%.1f'))
+    print(f"\nNach repair_ohlcv: {describe(after)}")
+    print(f"Nach repair_ohlcv(fill_gaps=True): {describe(after_fill)}")
+    print("\n✅ Alle eingebauten Fehler gefunden, Reparatur vollständig." if same
+          else f"\n❌ Abweichungen: gefunden {found}, erwartet {expected}, pandas {reference}")
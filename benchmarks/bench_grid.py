@@ -0,0 +1,76 @@
+# bench_grid.py
+# Vergleicht evaluate_grid (project_goldengo.grid) mit bt.optimize für die
+# Gitter aus 01_dual_ma_atr.py und 04_dynamic_momentum_cross_BTC.py: gleiche
+# Heatmap, Laufzeit beider Wege.
+#
+# Aufruf:  python benchmarks/bench_grid.py [CSV-Datei]
+# Ohne CSV-Datei wird ein synthetischer 5m-Random-Walk verwendet. bt.optimize
+# läuft nur auf einem verkleinerten Gitter, das volle Gitter nur vektorisiert.
+
+import sys
+import time
+import warnings
+
+import numpy as np
+from backtesting import Backtest
+
+from project_goldengo.grid import evaluate_grid
+from project_goldengo.prepare_data import load_and_prepare_data
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+
+def compare(name, df, strategy, signal_func, bt_kwargs, small_grid, full_grid, **options):
+    start = time.perf_counter()
+    heatmap = evaluate_grid(df, signal_func, cash=bt_kwargs['cash'], commission=bt_kwargs['commission'],
+                            **options, **small_grid)
+    t_grid = time.perf_counter() - start
+
+    bt = Backtest(df, strategy, **bt_kwargs)
+    start = time.perf_counter()
+    _, expected = bt.optimize(**small_grid, **options, return_heatmap=True)
+    t_bt = time.perf_counter() - start
+
+    expected = expected.reindex(heatmap.index)
+    same = (heatmap.isna() == expected.isna()).all() and np.allclose(
+        heatmap.dropna(), expected.dropna(), rtol=1e-9)
+    print(f"\n=== {name}: {len(heatmap)} Kombinationen ===")
+    print(f"bt.optimize {t_bt:.2f}s, evaluate_grid {t_grid:.2f}s ({t_bt / t_grid:.0f}x)")
+    print(f"Gleiche Heatmap: {same}, beste Kombination: {heatmap.idxmax()}")
+
+    start = time.perf_counter()
+    heatmap = evaluate_grid(df, signal_func, cash=bt_kwargs['cash'], commission=bt_kwargs['commission'],
+                            **options, **full_grid)
+    t_full = time.perf_counter() - start
+    per_run = t_bt / len(expected)
+    print(f"Volles Gitter ({len(heatmap)} Kombinationen): {t_full:.2f}s "
+          f"(bt.optimize geschätzt {per_run * len(heatmap):.0f}s)")
+    return same
+
+
+if __name__ == '__main__':
+    df = load_and_prepare_data(sys.argv[1]) if len(sys.argv) > 1 else synthetic_data(20_000)
+
+    dual_ma = load_script('01_dual_ma_atr.py')
+    ok = compare('DualMaAtrStrategy', df, dual_ma.DualMaAtrStrategy, dual_ma.grid_signals,
+                 dict(cash=100_000, commission=0.001, exclusive_orders=True),
+                 small_grid=dict(n1=range(10, 35, 5), n2=range(40, 75, 10), atr_sl_multiplier=range(2, 8, 2)),
+                 full_grid=dict(n1=range(10, 35, 5), n2=range(40, 75, 5), atr_sl_multiplier=range(2, 8, 1)),
+                 constraint=lambda p: p.n1 < p.n2, maximize='Equity Final [$]')
+
+    try:
+        momentum = load_script('04_dynamic_momentum_cross_BTC.py')
+    except ImportError as e:
+        print(f"\n⚠️ 04_dynamic_momentum_cross_BTC.py lässt sich nicht laden: {e}")
+        momentum = None
+    if momentum is not None:
+        ok &= compare('DynamicMomentumCrossover', df, momentum.DynamicMomentumCrossover, momentum.grid_signals,
+                      dict(cash=1_000_000, commission=0.002, exclusive_orders=True),
+                      small_grid=dict(fast_ema=[10, 30], medium_ema=[20, 60, 100], rsi_threshold=[50, 70, 100],
+                                      atr_multiple=[1.0, 2.5]),
+                      full_grid=dict(fast_ema=range(10, 61, 10), medium_ema=range(20, 121, 20),
+                                     rsi_threshold=range(50, 101, 10), atr_multiple=[1.0, 1.5, 2.0, 2.5, 3.0]),
+                      maximize='Return [%]')
+
+    print("\n✅ Heatmaps stimmen überein." if ok else "\n❌ Abweichungen gefunden.")
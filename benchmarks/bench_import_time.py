@@ -0,0 +1,91 @@
+# bench_import_time.py
+# Misst, was das Importieren der Module kostet, einmal in einem frischen
+# Interpreter und einmal in einem neu gestarteten Worker-Prozess (spawn, wie
+# ProcessPoolExecutor unter Windows/macOS oder mit mp_context='spawn').
+#
+#   jetzt:   nur das Modul (schwere Pakete werden erst bei Bedarf geladen)
+#   vorher:  das Modul plus die Pakete, die es früher beim Import geladen hat
+#            (python-binance, yfinance, matplotlib.pyplot, backtesting);
+#            nicht installierte Pakete werden übersprungen
+#
+# Nicht enthalten ist der Netzwerk-Handshake von `binance.Client()`, den der
+# Import von load_data früher zusätzlich gekostet hat.
+#
+# Aufruf:  python benchmarks/bench_import_time.py [Wiederholungen]
+#
+# Bewusst nur Standardbibliothek auf Modulebene: Worker importieren dieses
+# Skript beim Start mit.
+
+import importlib
+import importlib.util
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+MODULES = {
+    'project_goldengo.load_data': ['binance.client', 'yfinance'],
+    'project_goldengo.saved_output': ['matplotlib.pyplot'],
+    'project_goldengo.grid': ['backtesting'],
+    'project_goldengo.walk_forward': ['backtesting'],
+    'project_goldengo.portfolio': ['backtesting'],
+}
+HEAVY = ('binance', 'yfinance', 'matplotlib', 'backtesting', 'bokeh')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def installed(names):
+    return [name for name in names if importlib.util.find_spec(name.split('.')[0]) is not None]
+
+
+def import_seconds(module, eager):
+    """Importzeit in einem frischen Interpreter und die dabei geladenen schweren Pakete."""
+    code = ("import time, sys\n"
+            "t = time.perf_counter()\n"
+            + "".join(f"import {name}\n" for name in eager + [module])
+            + "print(time.perf_counter() - t)\n"
+            f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))\n")
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT)
+    seconds, loaded = (out.stdout.split('\n') + [''])[:2]
+    return float(seconds), loaded
+
+
+def worker_task(names):
+    for name in names:
+        importlib.import_module(name)
+    return os.getpid()
+
+
+def spawn_seconds(names):
+    """Zeit vom Start eines Worker-Pools (spawn) bis zum ersten Ergebnis."""
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        pool.submit(worker_task, names).result()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    import pandas as pd
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    rows = []
+    for module, eager_names in MODULES.items():
+        eager = installed(eager_names)
+        now = [import_seconds(module, []) for _ in range(repeat)]
+        before = [import_seconds(module, eager) for _ in range(repeat)] if eager else now
+        rows.append({
+            'Modul': module.split('.')[-1],
+            'Import jetzt [s]': min(t for t, _ in now),
+            'Import vorher [s]': min(t for t, _ in before),
+            'Worker jetzt [s]': min(spawn_seconds([module]) for _ in range(repeat)),
+            'Worker vorher [s]': min(spawn_seconds(eager + [module]) for _ in range(repeat)),
+            'schwere Pakete jetzt': now[0][1] or '-',
+            'übersprungen': ', '.join(sorted(set(eager_names) - set(eager))) or '-',
+        })
+
+    table = pd.DataFrame(rows)
+    table['Faktor Worker'] = table['Worker vorher [s]'] / table['Worker jetzt [s]']
+    print(table.to_string(index=False, float_format='%.2f'))
@@ -0,0 +1,91 @@
+# bench_indicators.py
+# Vergleicht die alten Python-Schleifen aus 04_dynamic_momentum_cross_BTC.py
+# mit den vektorisierten Funktionen aus project_goldengo.indicators.
+#
+# Aufruf:  python benchmarks/bench_indicators.py [Anzahl Kerzen]
+
+import sys
+import time
+
+import numpy as np
+
+from project_goldengo import indicators
+
+
+# --- Bisherige Implementierungen (Referenz) ---
+def ema_loop(arr, span):
+    arr = np.array(arr, dtype=float)
+    alpha = 2 / (span + 1)
+    ema_arr = np.empty_like(arr)
+    ema_arr[0] = arr[0]
+    for i in range(1, len(arr)):
+        ema_arr[i] = alpha * arr[i] + (1 - alpha) * ema_arr[i-1]
+    return ema_arr
+
+
+def sma_loop(arr, period):
+    arr = np.array(arr, dtype=float)
+    sma_arr = np.full_like(arr, np.nan)
+    cumsum = np.cumsum(arr)
+    for i in range(period - 1, len(arr)):
+        sma_arr[i] = (cumsum[i] - (cumsum[i - period] if i >= period else 0)) / period
+    return sma_arr
+
+
+def rsi_loop(arr, period):
+    arr = np.array(arr, dtype=float)
+    delta = np.diff(arr, prepend=arr[0])
+    gains = np.where(delta > 0, delta, 0)
+    losses = np.where(delta < 0, -delta, 0)
+    avg_gain = np.full_like(arr, np.nan)
+    avg_loss = np.full_like(arr, np.nan)
+    avg_gain[period] = np.mean(gains[1:period+1])
+    avg_loss[period] = np.mean(losses[1:period+1])
+    for i in range(period+1, len(arr)):
+        avg_gain[i] = (avg_gain[i-1] * (period-1) + gains[i]) / period
+        avg_loss[i] = (avg_loss[i-1] * (period-1) + losses[i]) / period
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def obv_loop(close, volume):
+    close = np.array(close, dtype=float)
+    volume = np.array(volume, dtype=float)
+    obv = np.zeros_like(close)
+    for i in range(1, len(close)):
+        if close[i] > close[i-1]:
+            obv[i] = obv[i-1] + volume[i]
+        elif close[i] < close[i-1]:
+            obv[i] = obv[i-1] - volume[i]
+        else:
+            obv[i] = obv[i-1]
+    return obv
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 600_000
+    rng = np.random.default_rng(42)
+    close = 30_000 + np.cumsum(rng.normal(0, 20, n))
+    volume = rng.uniform(1, 100, n)
+
+    cases = [
+        ('ema(200)', ema_loop, indicators.ema, (close, 200)),
+        ('sma(20)', sma_loop, indicators.sma, (close, 20)),
+        ('rsi(14)', rsi_loop, indicators.rsi, (close, 14)),
+        ('obv', obv_loop, indicators.obv, (close, volume)),
+    ]
+
+    print(f"=== Indikator-Benchmark mit {n:,} Kerzen ===")
+    print(f"{'Indikator':<10} {'Schleife [s]':>13} {'Vektor [s]':>11} {'Speedup':>9}  max. Abweichung")
+    for name, old, new, args in cases:
+        expected, t_old = timed(old, *args)
+        result, t_new = timed(new, *args)
+        assert np.allclose(expected, result, rtol=1e-9, atol=1e-9, equal_nan=True), name
+        diff = np.nanmax(np.abs(expected - result))
+        print(f"{name:<10} {t_old:>13.3f} {t_new:>11.4f} {t_old / t_new:>8.0f}x  {diff:.2e}")
@@ -0,0 +1,66 @@
+# bench_optimizer.py
+# Vergleicht die Suchstrategien aus project_goldengo.optimizer mit dem vollen
+# Gitter für 01_dual_ma_atr.py und 04_dynamic_momentum_cross_BTC.py:
+# Anzahl gerechneter Kombinationen, Laufzeit, bester gefundener Wert und
+# dessen Rang im vollen Gitter (1 = globales Optimum).
+#
+# Aufruf:  python benchmarks/bench_optimizer.py [CSV-Datei]
+# Ohne CSV-Datei wird ein synthetischer 5m-Random-Walk verwendet.
+
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+from project_goldengo.optimizer import optimize
+from project_goldengo.prepare_data import load_and_prepare_data
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+SEEDS = [1, 2, 3]
+METHODS = [
+    ('random', dict(max_evals=None)),
+    ('halving', dict(windows=('30D',))),
+    ('model', dict(max_evals=None, patience=2)),
+]
+
+
+def compare(name, df, signal_func, grid, **options):
+    start = time.perf_counter()
+    full = optimize(df, signal_func, method='grid', **options, **grid)
+    t_grid = time.perf_counter() - start
+    rows = [{'Methode': 'grid', 'Seed': '-', 'Kombinationen': len(full), 'Zeit [s]': t_grid,
+             'Bester Wert': full.max(), 'Rang': 1}]
+
+    for method, extra in METHODS:
+        for seed in SEEDS:
+            start = time.perf_counter()
+            heatmap = optimize(df, signal_func, method=method, random_state=seed, **extra, **options, **grid)
+            rows.append({'Methode': method, 'Seed': seed, 'Kombinationen': len(heatmap),
+                         'Zeit [s]': time.perf_counter() - start, 'Bester Wert': heatmap.max(),
+                         'Rang': int((full > heatmap.max()).sum()) + 1})
+
+    print(f"\n=== {name}: {len(full)} Kombinationen im Gitter ===")
+    print(pd.DataFrame(rows).to_string(index=False, float_format='%.2f'))
+
+
+if __name__ == '__main__':
+    df = load_and_prepare_data(sys.argv[1]) if len(sys.argv) > 1 else synthetic_data(60_000)
+
+    dual_ma = load_script('01_dual_ma_atr.py')
+    compare('DualMaAtrStrategy', df, dual_ma.grid_signals,
+            dict(n1=range(10, 35, 5), n2=range(40, 75, 5), atr_sl_multiplier=range(2, 8, 1)),
+            constraint=lambda p: p.n1 < p.n2, maximize='Equity Final [$]', cash=100_000, commission=0.001)
+
+    try:
+        momentum = load_script('04_dynamic_momentum_cross_BTC.py')
+    except ImportError as e:
+        print(f"\n⚠️ 04_dynamic_momentum_cross_BTC.py lässt sich nicht laden: {e}")
+        momentum = None
+    if momentum is not None:
+        compare('DynamicMomentumCrossover', df, momentum.grid_signals,
+                dict(fast_ema=range(10, 61, 10), medium_ema=range(20, 121, 20),
+                     rsi_threshold=range(50, 101, 10), atr_multiple=[1.0, 1.5, 2.0, 2.5, 3.0]),
+                maximize='Return [%]', cash=1_000_000, commission=0.002)
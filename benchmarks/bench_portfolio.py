@@ -0,0 +1,95 @@
+# bench_portfolio.py
+# Vergleicht den Portfolio-Backtest (project_goldengo.portfolio) über sechs
+# Symbole mit dem bisherigen Weg, jedes Symbol einzeln zu testen:
+#
+#   backtesting.py:  6 × Backtest(...).run() mit DynamicMomentumCrossover
+#   vektorisiert:    6 × evaluate_combos mit einer Kombination
+#   Portfolio:       1 × portfolio_backtest, gemeinsames Kapital
+#
+# Daten: sechs synthetische 5m-Reihen, eine davon startet später und alle
+# haben Lücken. Zur Kontrolle läuft das Portfolio zusätzlich mit fester
+# Stückzahl (1 Einheit) und reichlich Kapital auf lückenlosen Daten: Dann
+# muss sein Gewinn die Summe der Einzel-Backtests sein.
+#
+# Aufruf:  python benchmarks/bench_portfolio.py [Kerzen]
+
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+from project_goldengo.grid import evaluate_combos, parameter_grid
+from project_goldengo.portfolio import portfolio_backtest
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT', 'TRXUSDT', 'ADAUSDT']
+PARAMS = dict(fast_ema=20, medium_ema=50, rsi_threshold=75, atr_multiple=2.0)
+OPTIONS = dict(cash=1_000_000, commission=0.002)
+
+
+def symbol_frames(rows, gaps=True):
+    rng = np.random.default_rng(3)
+    frames = {}
+    for number, symbol in enumerate(SYMBOLS):
+        df = synthetic_data(rows, seed=number + 7)
+        if gaps:
+            df = df[rng.random(len(df)) > 0.002]
+        if symbol == 'SOLUSDT':
+            df = df.iloc[rows // 4:]
+        frames[symbol] = df
+    return frames
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    momentum = load_script('04_dynamic_momentum_cross_BTC.py')
+    frames = symbol_frames(rows)
+    combos = parameter_grid(**PARAMS)
+
+    start = time.perf_counter()
+    for df in frames.values():
+        Backtest(df, momentum.DynamicMomentumCrossover, **OPTIONS).run(**PARAMS)
+    t_bt = time.perf_counter() - start
+
+    start = time.perf_counter()
+    singles = {symbol: evaluate_combos(df, momentum.grid_signals, combos, **OPTIONS).iloc[0]
+               for symbol, df in frames.items()}
+    t_single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = portfolio_backtest(frames, momentum.grid_signals, **OPTIONS, **PARAMS)
+    t_portfolio = time.perf_counter() - start
+
+    print(f"{len(SYMBOLS)} Symbole à ~{rows} Kerzen (5m)\n")
+    print(pd.DataFrame([
+        {'Weg': '6 × backtesting.py', 'Zeit [s]': t_bt},
+        {'Weg': '6 × evaluate_combos', 'Zeit [s]': t_single},
+        {'Weg': 'portfolio_backtest', 'Zeit [s]': t_portfolio},
+    ]).to_string(index=False, float_format='%.2f'))
+
+    print("\nPortfolio (gemeinsames Kapital):")
+    print(stats[['Return [%]', 'Buy & Hold Return [%]', 'Max. Drawdown [%]', 'Sharpe Ratio', '# Trades']].to_string())
+    print(stats['_symbols'].to_string(float_format='%.2f'))
+
+    # Kontrolle: feste Stückzahl, Kapital reicht immer -> Summe der Einzel-Backtests
+    # (ohne Lücken, die das Portfolio auffüllen würde, die Einzel-Backtests aber nicht)
+    frames = symbol_frames(rows, gaps=False)
+
+    def one_unit(data, **params):
+        signals = momentum.grid_signals(data, **params)
+        del signals['stop_dist']
+        return dict(signals, size=1)
+
+    rich = dict(cash=1e9, commission=0.002)
+    total = portfolio_backtest(frames, one_unit, **rich, **PARAMS)
+    parts = [evaluate_combos(df, one_unit, combos, **rich).iloc[0] for df in frames.values()]
+    same = (np.isclose(total['Equity Final [$]'] - rich['cash'],
+                       sum(part['Equity Final [$]'] - rich['cash'] for part in parts))
+            and total['# Trades'] == sum(part['# Trades'] for part in parts))
+    print("\n✅ Feste Größe: Portfolio = Summe der Einzel-Backtests." if same
+          else "\n❌ Feste Größe: Portfolio weicht von den Einzel-Backtests ab.")
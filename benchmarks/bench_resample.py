@@ -0,0 +1,113 @@
+# bench_resample.py
+# Prüft und misst project_goldengo.resample:
+#
+#   - resample_ohlcv gegen pandas `.resample().agg()` (Werte und Laufzeit),
+#     mit künstlichen Lücken in den 5m-Daten
+#   - load_resampled: erster Aufbau des Caches, Aufruf ohne neue Daten und
+#     Aufruf nach dem Anhängen neuer 5m-Kerzen (inkrementell) gegen einen
+#     kompletten Neuaufbau
+#   - resample_to_csv: angehängte 15m-CSV gegen die direkt abgeleitete Reihe
+#
+# Aufruf:  python benchmarks/bench_resample.py [Kerzen]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.prepare_data import load_and_prepare_data
+from project_goldengo.resample import complete_bars, load_resampled, resample_ohlcv, resample_to_csv
+from validate_vectorized import synthetic_data
+
+INTERVALS = ['15m', '1h', '4h', '1d', '1w']
+PANDAS_RULES = {'15m': '15min', '1h': '1h', '4h': '4h', '1d': '1D', '1w': 'W-MON'}
+AGG = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+
+def pandas_resample(df, interval):
+    rule = PANDAS_RULES[interval]
+    options = dict(label='left', closed='left') if interval == '1w' else {}
+    return df.resample(rule, **options).agg(AGG).dropna()
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def quiet(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    df = synthetic_data(rows)
+    # Lücken wie bei Börsenausfällen: einzelne Kerzen und ein ganzer Tag fehlen
+    rng = np.random.default_rng(1)
+    keep = np.ones(len(df), dtype=bool)
+    keep[rng.choice(len(df), len(df) // 200, replace=False)] = False
+    keep[1000:1288] = False
+    df = df[keep]
+    print(f"{len(df)} 5m-Kerzen ({df.index[0]} bis {df.index[-1]})\n")
+
+    results = []
+    all_same = True
+    for interval in INTERVALS:
+        ours, t_ours = timed(resample_ohlcv, df, interval)
+        theirs, t_pandas = timed(pandas_resample, df, interval)
+        same = ours.index.equals(theirs.index) and np.allclose(ours.to_numpy(), theirs.to_numpy())
+        all_same &= same
+        results.append({'Intervall': interval, 'Kerzen': len(ours), 'pandas [ms]': t_pandas * 1e3,
+                        'resample_ohlcv [ms]': t_ours * 1e3, 'Faktor': t_pandas / t_ours,
+                        'identisch': same})
+    print(pd.DataFrame(results).to_string(index=False, float_format='%.2f'))
+
+    split = len(df) - 2_000
+    cache_rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base_csv = os.path.join(tmp, 'BTCUSDT_5m_full.csv')
+        out_csv = os.path.join(tmp, 'BTCUSDT_15m_full.csv')
+        df.iloc[:split].to_csv(base_csv)
+        quiet(load_and_prepare_data, base_csv)
+
+        start = time.perf_counter()
+        quiet(load_resampled, base_csv, '1h')
+        cache_rows.append({'Schritt': 'erster Aufbau', 'Zeit [ms]': (time.perf_counter() - start) * 1e3})
+        quiet(resample_to_csv, base_csv, '15m', out_csv)
+
+        start = time.perf_counter()
+        quiet(load_resampled, base_csv, '1h')
+        cache_rows.append({'Schritt': 'ohne neue Daten', 'Zeit [ms]': (time.perf_counter() - start) * 1e3})
+
+        # Neue 5m-Kerzen kommen wie beim Download hinten dazu
+        df.iloc[split:].to_csv(base_csv, mode='a', header=False)
+        quiet(load_and_prepare_data, base_csv)
+        start = time.perf_counter()
+        incremental = quiet(load_resampled, base_csv, '1h')
+        cache_rows.append({'Schritt': 'inkrementell', 'Zeit [ms]': (time.perf_counter() - start) * 1e3})
+        start = time.perf_counter()
+        rebuilt = quiet(load_resampled, base_csv, '1h', rebuild_cache=True)
+        cache_rows.append({'Schritt': 'Neuaufbau', 'Zeit [ms]': (time.perf_counter() - start) * 1e3})
+        all_same &= incremental.equals(rebuilt)
+
+        quiet(resample_to_csv, base_csv, '15m', out_csv)
+        exported = pd.read_csv(out_csv, index_col=0, parse_dates=True)
+        # Die letzte, noch nicht abgeschlossene Kerze wird nicht exportiert
+        expected = complete_bars(resample_ohlcv(df, '15m'), df, '15m')
+        all_same &= (exported.index.is_unique and exported.index.equals(expected.index)
+                     and np.allclose(exported.to_numpy(), expected.to_numpy()))
+
+    print("\nload_resampled('1h') (Basis-Cache bereits aufgebaut):")
+    print(pd.DataFrame(cache_rows).to_string(index=False, float_format='%.1f'))
+    print("\n✅ Alle Ergebnisse identisch mit pandas und dem Neuaufbau." if all_same
+          else "\n❌ Abweichungen gefunden.")
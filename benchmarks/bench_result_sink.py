@@ -0,0 +1,77 @@
+# bench_result_sink.py
+# Vergleicht das Speichern vieler Backtest-Ergebnisse:
+#
+#   bisher:  save_metrics + save_equity_curve + save_trades (drei CSVs pro Lauf)
+#   neu:     ResultSink (gepuffert, eine Spalten-Datei pro Tabelle und Flush)
+#
+# Gemessen werden Laufzeit, Anzahl Dateien und Platz auf der Platte. Die
+# Ergebnisse eines Laufs werden zurückgelesen und mit dem Original verglichen.
+# Charts sind nicht Teil des Vergleichs.
+#
+# Aufruf:  python benchmarks/bench_result_sink.py [Läufe] [Kerzen]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+from project_goldengo import saved_output
+from project_goldengo.saved_output import ResultSink, load_results
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+
+def disk_usage(directory):
+    files = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+    return len(files), sum(os.path.getsize(f) for f in files)
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    tsmom = load_script('03_tsmom_btc.py').TSMOMStrategy
+    stats = Backtest(synthetic_data(rows), tsmom, cash=1_000_000, commission=0.002,
+                     trade_on_close=True).run()
+    print(f"{runs} Läufe à {rows} Kerzen, {stats['# Trades']} Trades pro Lauf, Format: "
+          f"{saved_output.RESULT_FORMAT}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+        saved_output.LOG_DIR = old_dir
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(runs):
+                stem = f"BTC_{i:04d}"
+                saved_output.save_metrics(stats, 'TSMOM', stem)
+                saved_output.save_equity_curve(stats, stem)
+                saved_output.save_trades(stats, stem)
+        elapsed = time.perf_counter() - start
+        files, size = disk_usage(old_dir)
+        results.append({'Weg': 'CSV pro Lauf', 'Zeit [s]': elapsed, 'Dateien': files, 'MB': size / 1e6})
+
+        start = time.perf_counter()
+        with ResultSink(new_dir) as sink:
+            run_ids = [sink.add_backtest(stats, 'TSMOM', f"BTC_{i:04d}") for i in range(runs)]
+        elapsed = time.perf_counter() - start
+        files, size = disk_usage(new_dir)
+        results.append({'Weg': 'ResultSink', 'Zeit [s]': elapsed, 'Dateien': files, 'MB': size / 1e6})
+
+        equity = load_results('equity', new_dir, run_id=run_ids[-1]).set_index('Date').drop(columns='run_id')
+        trades = load_results('trades', new_dir, run_id=run_ids[-1]).drop(columns='run_id')
+        metrics = load_results('metrics', new_dir)
+        same = (len(metrics) == runs
+                and np.allclose(equity['Equity'], stats._equity_curve['Equity'])
+                and len(trades) == len(stats._trades)
+                and np.allclose(trades['PnL'], stats._trades['PnL']))
+
+    print(pd.DataFrame(results).to_string(index=False, float_format='%.2f'))
+    print("\n✅ Zurückgelesene Ergebnisse identisch." if same else "\n❌ Abweichungen beim Zurücklesen.")
@@ -0,0 +1,84 @@
+# bench_result_store.py
+# Misst, was der ResultStore (project_goldengo.result_store) bei
+# wiederholten Optimierungen mit dem Gitter aus 01_dual_ma_atr.py spart:
+#
+# 1. erster Lauf, nach einem Drittel der Blöcke abgebrochen
+# 2. Fortsetzung des abgebrochenen Laufs
+# 3. unveränderter zweiter Lauf (alles aus der Datenbank)
+# 4. Gitter um zwei Werte erweitert (nur die neuen Kombinationen)
+#
+# Gezählt werden die tatsächlich gerechneten Kombinationen. Die Heatmaps
+# müssen mit einem Lauf ohne Speicher übereinstimmen.
+#
+# Aufruf:  python benchmarks/bench_result_store.py [CSV-Datei]
+
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import pandas as pd
+
+from project_goldengo.optimizer import optimize
+from project_goldengo.prepare_data import load_and_prepare_data
+from project_goldengo.result_store import ResultStore
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+BLOCK_SIZE = 30
+
+
+class Interrupted(Exception):
+    pass
+
+
+if __name__ == '__main__':
+    df = load_and_prepare_data(sys.argv[1]) if len(sys.argv) > 1 else synthetic_data(60_000)
+    dual_ma = load_script('01_dual_ma_atr.py')
+    grid = dict(n1=range(10, 35, 5), n2=range(40, 75, 5), atr_sl_multiplier=range(2, 8, 1))
+    options = dict(constraint=lambda p: p.n1 < p.n2, maximize='Equity Final [$]',
+                   cash=100_000, commission=0.001, block_size=BLOCK_SIZE)
+
+    computed = []
+    fail_after = [None]
+
+    def signals(data, **params):
+        if fail_after[0] is not None and len(computed) == fail_after[0]:
+            raise Interrupted
+        computed.append(len(params['n1']))
+        return dual_ma.grid_signals(data, **params)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ResultStore(os.path.join(tmp, 'results.sqlite'))
+        rows = []
+
+        def measure(label, **overrides):
+            computed.clear()
+            start = time.perf_counter()
+            try:
+                heatmap = optimize(df, signals, store=store, strategy=dual_ma.DualMaAtrStrategy,
+                                   **options, **dict(grid, **overrides))
+            except Interrupted:
+                heatmap = None
+            rows.append({'Lauf': label, 'gerechnet': sum(computed), 'gespeichert': store.count(),
+                         'Zeit [s]': time.perf_counter() - start})
+            return heatmap
+
+        start = time.perf_counter()
+        reference = optimize(df, dual_ma.grid_signals, **options, **grid)
+        rows.append({'Lauf': 'ohne Speicher', 'gerechnet': len(reference), 'gespeichert': 0,
+                     'Zeit [s]': time.perf_counter() - start})
+
+        fail_after[0] = 2
+        measure('abgebrochen')
+        fail_after[0] = None
+        resumed = measure('fortgesetzt')
+        again = measure('wiederholt')
+        measure('Gitter erweitert', atr_sl_multiplier=range(2, 10, 1))
+        store.close()
+
+    print(pd.DataFrame(rows).to_string(index=False, float_format='%.3f'))
+    same = resumed.equals(reference) and again.equals(reference)
+    print("\n✅ Heatmaps identisch." if same else "\n❌ Heatmaps unterscheiden sich.")
@@ -0,0 +1,159 @@
+# bench_shared_memory.py
+# Vergleicht die Datenübergabe an die Optimierungs-Worker:
+#
+#   bisher:  backtesting.Pool = multiprocessing.Pool + bt.optimize
+#            (backtesting.py kopiert die Daten pro Batch in neues Shared Memory
+#            und pickelt pro Batch ein Backtest-Objekt)
+#   neu:     optimize_shared (Daten einmal im Shared Memory, Worker hängen
+#            sich beim Start an)
+#
+# Gemessen werden der Spitzenwert des Speichers aller beteiligten Prozesse
+# (PSS, geteilte Seiten werden anteilig gezählt), die Spitzenbelegung von
+# /dev/shm, die Zeit bis zum ersten Ergebnis und die Gesamtlaufzeit.
+# Nur Linux (/proc).
+#
+# Aufruf:  python benchmarks/bench_shared_memory.py [Kerzen] [Kombinationen]
+#
+# Die Batch-Aufteilung richtet sich in beiden Wegen nach os.cpu_count(). Damit
+# das Ergebnis auch auf kleinen Maschinen dem Verhalten auf unseren 32-Kern-
+# Rechnern entspricht, wird os.cpu_count() hier auf CPU_COUNT gesetzt; die
+# Anzahl echter Worker-Prozesse bleibt bei PROCESSES.
+
+import multiprocessing
+import multiprocessing.pool
+import os
+import sys
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import backtesting
+from backtesting import Backtest, Strategy
+
+from project_goldengo.shared_optimize import optimize_shared
+from validate_vectorized import synthetic_data
+
+warnings.filterwarnings('ignore')
+
+CPU_COUNT = 32
+PROCESSES = 4
+
+
+class Hold(Strategy):
+    """Minimal-Strategie: die Laufzeit soll von der Datenübergabe dominiert werden."""
+    n = 10
+
+    def init(self):
+        pass
+
+    def next(self):
+        if not self.position and len(self.data) % self.n == 0:
+            self.buy()
+        elif self.position and len(self.data) % self.n == self.n // 2:
+            self.position.close()
+
+
+def _pss_kb(pid):
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _children(pid):
+    found = []
+    try:
+        for tid in os.listdir(f'/proc/{pid}/task'):
+            with open(f'/proc/{pid}/task/{tid}/children') as f:
+                found += [int(c) for c in f.read().split()]
+    except OSError:
+        pass
+    return found + [g for c in found for g in _children(c)]
+
+
+def _shm_used():
+    st = os.statvfs('/dev/shm')
+    return (st.f_blocks - st.f_bfree) * st.f_frsize
+
+
+class Sampler(threading.Thread):
+    """Misst alle 20 ms PSS (Eltern- + Kindprozesse) und die Belegung von /dev/shm."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak_pss = 0
+        self.peak_shm = 0
+        self.base_shm = _shm_used()
+        self._done = threading.Event()
+
+    def run(self):
+        me = os.getpid()
+        while not self._done.is_set():
+            pss = sum(_pss_kb(pid) for pid in [me] + _children(me)) * 1024
+            self.peak_pss = max(self.peak_pss, pss)
+            self.peak_shm = max(self.peak_shm, _shm_used() - self.base_shm)
+            time.sleep(0.02)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+class TimedPool(multiprocessing.pool.Pool):
+    """multiprocessing.Pool, der den Zeitpunkt des ersten Ergebnisses festhält."""
+    first_result = None
+
+    def imap(self, func, iterable, chunksize=1):
+        for item in super().imap(func, iterable, chunksize):
+            if TimedPool.first_result is None:
+                TimedPool.first_result = time.perf_counter()
+            yield item
+
+
+def pool(processes=None, initializer=None, initargs=()):
+    return TimedPool(PROCESSES, initializer, initargs)
+
+
+def measure(label, func):
+    TimedPool.first_result = None
+    sampler = Sampler()
+    sampler.start()
+    start = time.perf_counter()
+    _, heatmap = func()
+    total = time.perf_counter() - start
+    sampler.stop()
+    return heatmap, {
+        'Weg': label,
+        'Spitze PSS [MB]': sampler.peak_pss / 1e6,
+        'Spitze /dev/shm [MB]': sampler.peak_shm / 1e6,
+        'Erstes Ergebnis [s]': TimedPool.first_result - start,
+        'Gesamt [s]': total,
+    }
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    combos = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    df = synthetic_data(rows)
+    print(f"Daten: {rows} Kerzen, {df.memory_usage().sum() / 1e6:.1f} MB, "
+          f"{combos} Kombinationen, {PROCESSES} Prozesse, Batches wie bei {CPU_COUNT} Kernen")
+
+    os.cpu_count = lambda: CPU_COUNT
+    backtesting.Pool = pool
+    bt = Backtest(df, Hold, cash=1_000_000, commission=0.001)
+    grid = dict(n=list(range(4, 4 + combos)))
+
+    ref, old = measure('bt.optimize', lambda: bt.optimize(**grid, maximize='Return [%]', return_heatmap=True))
+    heatmap, new = measure('optimize_shared', lambda: optimize_shared(bt, **grid, maximize='Return [%]',
+                                                                      return_heatmap=True))
+
+    print(pd.DataFrame([old, new]).to_string(index=False, float_format='%.2f'))
+    same = np.allclose(ref.to_numpy(), heatmap.to_numpy(), equal_nan=True)
+    print("\n✅ Heatmaps identisch." if same else "\n❌ Heatmaps unterscheiden sich.")
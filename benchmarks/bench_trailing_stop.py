@@ -0,0 +1,137 @@
+# bench_trailing_stop.py
+# Vergleicht den Trailing-Stop von TSMOMStrategy (laufendes Hoch über
+# project_goldengo.trailing_stop) mit der alten Variante, die in jedem next()
+# `self.data.High[entry_bar:].max()` neu berechnet.
+#
+# 1. Nur die Stop-Berechnung pro Kerze für einen Trade über die ganze Reihe:
+#    alt wächst quadratisch mit der Haltedauer, neu linear.
+# 2. Kompletter Backtest im stetigen Aufwärtstrend (Position fast immer offen):
+#    Trades und Stop-Niveaus müssen identisch sein.
+#
+# Aufruf:  python benchmarks/bench_trailing_stop.py
+
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+from validate_vectorized import load_script
+
+warnings.filterwarnings('ignore')
+
+from project_goldengo.trailing_stop import TrailingStop
+
+HOLD_SIZES = [10_000, 20_000, 40_000, 80_000, 160_000]
+BACKTEST_SIZES = [10_000, 40_000]
+
+
+def trending_data(n, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 10 * np.exp(np.cumsum(rng.normal(0.0001, 0.00005, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    spread = np.abs(rng.normal(0, 0.0002, n)) * close
+    index = pd.date_range('2021-01-01', periods=n, freq='5min', tz='UTC', name='Date')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.uniform(1, 100, n),
+    }, index=index)
+
+
+def recording(strategy):
+    """Unterklasse, die jedes gesetzte Stop-Niveau mitschreibt."""
+    class Recording(strategy):
+        def init(self):
+            super().init()
+            self.levels = []
+
+        def next(self):
+            super().next()
+            if self.position:
+                self.levels.append(self.position.sl)
+
+    return Recording
+
+
+def legacy(strategy):
+    """Alte Variante: Hoch seit Einstieg in jedem next() neu berechnen."""
+    class Legacy(strategy):
+        def next(self):
+            price = self.data.Close[-1]
+            if self.equity < price:
+                return
+
+            m = self.momentum[-1]
+            sl_price = price * self.stop_loss_pct
+            risk_fraction = self.risk_per_trade / (1 - self.stop_loss_pct)
+
+            if m > 0 and not self.position:
+                self.buy(size=risk_fraction, sl=sl_price)
+            elif self.position.is_long:
+                entry_bar = self.trades[-1].entry_bar
+                highest = self.data.High[entry_bar:].max()
+                self.position.sl = highest * self.stop_loss_pct
+                if m < 0:
+                    self.position.close()
+
+    return Legacy
+
+
+def time_hold(highs, factor=0.85):
+    """Stop-Niveaus für einen Trade ab Kerze 0, alt (Slice-Maximum) und neu (TrailingStop)."""
+    start = time.perf_counter()
+    old_levels = [highs[:i + 1].max() * factor for i in range(len(highs))]
+    t_old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stop = TrailingStop(factor)
+    new_levels = []
+    for i in range(len(highs)):
+        stop.track(highs[:i + 1], entry_bar=0)
+        new_levels.append(stop.level)
+    t_new = time.perf_counter() - start
+    return t_old, t_new, old_levels == new_levels
+
+
+def run(strategy, df):
+    bt = Backtest(df, strategy, cash=1_000_000, commission=0.002, trade_on_close=True)
+    start = time.perf_counter()
+    stats = bt.run()
+    return stats, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    ok = True
+    rows = []
+    for n in HOLD_SIZES:
+        t_old, t_new, same = time_hold(trending_data(n)['High'].to_numpy())
+        ok &= same
+        rows.append({'Haltedauer [Kerzen]': n, 'alt [s]': t_old, 'neu [s]': t_new,
+                     'Faktor': t_old / t_new, 'identisch': same})
+    print("=== Stop-Berechnung für einen Trade ===")
+    print(pd.DataFrame(rows).to_string(index=False, float_format='%.2f'))
+
+    tsmom = load_script('03_tsmom_btc.py').TSMOMStrategy
+    old_strategy = recording(legacy(tsmom))
+    new_strategy = recording(tsmom)
+
+    rows = []
+    for n in BACKTEST_SIZES:
+        df = trending_data(n)
+        old_stats, t_old = run(old_strategy, df)
+        new_stats, t_new = run(new_strategy, df)
+
+        columns = ['EntryBar', 'ExitBar', 'EntryPrice', 'ExitPrice']
+        same = (old_stats._trades[columns].equals(new_stats._trades[columns])
+                and old_stats._strategy.levels == new_stats._strategy.levels)
+        ok &= same
+        rows.append({'Kerzen': n, 'Trades': old_stats['# Trades'],
+                     'Kerzen in Position': len(new_stats._strategy.levels),
+                     'alt [s]': t_old, 'neu [s]': t_new, 'Faktor': t_old / t_new, 'identisch': same})
+    print("\n=== TSMOMStrategy mit backtesting.py ===")
+    print(pd.DataFrame(rows).to_string(index=False, float_format='%.2f'))
+    print("\n✅ Trades und Stop-Niveaus identisch." if ok else "\n❌ Abweichungen gefunden.")
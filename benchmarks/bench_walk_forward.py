@@ -0,0 +1,63 @@
+# bench_walk_forward.py
+# Vergleicht walk_forward (project_goldengo.walk_forward) mit dem naiven Weg,
+# jedes Trainingsfenster einzeln mit evaluate_grid zu optimieren (Signale und
+# Indikatoren pro Fenster neu). Gitter aus 01_dual_ma_atr.py, rollierende und
+# verankerte Fenster.
+#
+# Aufruf:  python benchmarks/bench_walk_forward.py [CSV-Datei] [Training] [Test]
+# Ohne CSV-Datei: synthetischer 5m-Random-Walk, Training 60D, Test 15D.
+
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+from project_goldengo.grid import evaluate_grid, parameter_grid
+from project_goldengo.indicator_cache import INDICATOR_CACHE
+from project_goldengo.prepare_data import load_and_prepare_data
+from project_goldengo.walk_forward import walk_forward, walk_forward_windows
+from validate_vectorized import load_script, synthetic_data
+
+warnings.filterwarnings('ignore')
+
+
+def naive(df, signal_func, windows, grid, options):
+    """N unabhängige Optimierungen, eine pro Trainingsfenster."""
+    for train_lo, train_hi, _, _ in windows:
+        evaluate_grid(df.iloc[train_lo:train_hi], signal_func, **options, **grid)
+
+
+if __name__ == '__main__':
+    df = load_and_prepare_data(sys.argv[1]) if len(sys.argv) > 1 else synthetic_data(60_000)
+    train = sys.argv[2] if len(sys.argv) > 2 else '60D'
+    test = sys.argv[3] if len(sys.argv) > 3 else '15D'
+
+    dual_ma = load_script('01_dual_ma_atr.py')
+    grid = dict(n1=range(10, 35, 5), n2=range(40, 75, 5), atr_sl_multiplier=range(2, 8, 1))
+    options = dict(constraint=lambda p: p.n1 < p.n2, maximize='Equity Final [$]',
+                   cash=100_000, commission=0.001)
+
+    rows = []
+    for anchored in (False, True):
+        windows = walk_forward_windows(df.index, train, test, anchored)
+
+        INDICATOR_CACHE.clear()
+        start = time.perf_counter()
+        naive(df, dual_ma.grid_signals, windows, grid, options)
+        t_naive = time.perf_counter() - start
+
+        INDICATOR_CACHE.clear()
+        start = time.perf_counter()
+        stats = walk_forward(df, dual_ma.grid_signals, train=train, test=test, anchored=anchored,
+                             max_workers=1, **options, **grid)
+        t_wf = time.perf_counter() - start
+
+        rows.append({'Fenster': 'verankert' if anchored else 'rollierend', 'Anzahl': len(windows),
+                     'einzeln optimiert [s]': t_naive, 'walk_forward [s]': t_wf,
+                     'Faktor': t_naive / t_wf, 'OOS Return [%]': stats['Return [%]'],
+                     'OOS Trades': stats['# Trades']})
+
+    combos = len(parameter_grid(options['constraint'], **grid))
+    print(f"{len(df)} Kerzen, Training {train}, Test {test}, {combos} Kombinationen pro Fenster")
+    print(pd.DataFrame(rows).to_string(index=False, float_format='%.2f'))
@@ -0,0 +1,105 @@
+# validate_vectorized.py
+# Vergleicht die vektorisierte Engine (project_goldengo.vectorized) mit
+# backtesting.py für TSMOMStrategy und DualMaAtrStrategy auf denselben Daten.
+#
+# Aufruf:  python benchmarks/validate_vectorized.py [CSV-Datei]
+# Ohne CSV-Datei wird ein synthetischer 5m-Random-Walk verwendet.
+
+import importlib.util
+import os
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import ta
+from backtesting import Backtest
+
+from project_goldengo.prepare_data import load_and_prepare_data
+from project_goldengo.vectorized import crossover, run_signals
+
+warnings.filterwarnings('ignore')
+
+STRATEGY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'project_goldengo', 'backtesting_py')
+KEYS = ['# Trades', 'Return [%]', 'Equity Final [$]', 'Max. Drawdown [%]', 'Win Rate [%]', 'Sharpe Ratio', 'CAGR [%]']
+
+
+def load_script(filename):
+    """Lädt ein Strategie-Skript (Dateinamen beginnen mit Ziffern, daher kein normaler Import)."""
+    spec = importlib.util.spec_from_file_location(filename[:-3], os.path.join(STRATEGY_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    # Registrieren, damit bt.optimize die Strategie-Klasse an die Worker pickeln kann
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthetic_data(n=100_000, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    open_ = np.r_[close[0], close[:-1]] * (1 + rng.normal(0, 0.0005, n))
+    spread = np.abs(rng.normal(0, 0.002, n)) * close
+    index = pd.date_range('2021-01-01', periods=n, freq='5min', tz='UTC', name='Date')
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.uniform(1, 100, n),
+    }, index=index)
+
+
+def tsmom_signals(df, lookback_period=28, stop_loss_pct=0.85):
+    m = df['Close'].pct_change(lookback_period).to_numpy()
+    with np.errstate(invalid='ignore'):
+        return dict(entries=m > 0, exits=m < 0, sl=df['Close'].to_numpy() * stop_loss_pct,
+                    start=1 + lookback_period)
+
+
+def dual_ma_atr_signals(df, n1=20, n2=50, atr_period=14, atr_sl_multiplier=2, atr_tp_multiplier=4):
+    close = df['Close']
+    fast = ta.trend.ema_indicator(close, window=n1).to_numpy()
+    slow = ta.trend.ema_indicator(close, window=n2).to_numpy()
+    atr = ta.volatility.average_true_range(df['High'], df['Low'], close, window=atr_period).to_numpy()
+    ok = atr > 0
+    return dict(entries=crossover(fast, slow) & ok, exits=crossover(slow, fast) & ok,
+                sl=close.to_numpy() - atr_sl_multiplier * atr,
+                tp=close.to_numpy() + atr_tp_multiplier * atr, start=n2)
+
+
+def compare(name, df, strategy, bt_kwargs, signals, size):
+    start = time.perf_counter()
+    expected = Backtest(df, strategy, **bt_kwargs).run()
+    t_bt = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = run_signals(df, size=size, cash=bt_kwargs['cash'], commission=bt_kwargs['commission'],
+                         trade_on_close=bt_kwargs.get('trade_on_close', False), **signals)
+    t_vec = time.perf_counter() - start
+
+    print(f"\n=== {name}: backtesting.py {t_bt:.2f}s, vektorisiert {t_vec:.3f}s ({t_bt / t_vec:.0f}x) ===")
+    table = pd.DataFrame({'backtesting.py': expected[KEYS], 'vektorisiert': result[KEYS]})
+    print(table.to_string())
+
+    same_trades = (len(expected._trades) == len(result._trades) and
+                   (expected._trades['EntryBar'].to_numpy() == result._trades['EntryBar'].to_numpy()).all() and
+                   (expected._trades['ExitBar'].to_numpy() == result._trades['ExitBar'].to_numpy()).all())
+    equity_diff = np.max(np.abs(expected._equity_curve['Equity'].to_numpy() - result._equity_curve['Equity'].to_numpy()))
+    print(f"Gleiche Trades: {same_trades}, max. Equity-Abweichung: {equity_diff:.6f}")
+    return same_trades
+
+
+if __name__ == '__main__':
+    df = load_and_prepare_data(sys.argv[1]) if len(sys.argv) > 1 else synthetic_data()
+
+    tsmom = load_script('03_tsmom_btc.py').TSMOMStrategy
+    dual_ma = load_script('01_dual_ma_atr.py').DualMaAtrStrategy
+
+    ok = compare('TSMOMStrategy', df, tsmom,
+                 dict(cash=1_000_000, commission=0.002, trade_on_close=True),
+                 tsmom_signals(df), size=tsmom.risk_per_trade / (1 - tsmom.stop_loss_pct))
+    ok &= compare('DualMaAtrStrategy', df, dual_ma,
+                  dict(cash=100_000, commission=0.001, exclusive_orders=True),
+                  dual_ma_atr_signals(df), size=dual_ma.size_prozent)
+    print("\n✅ Ergebnisse stimmen überein." if ok else "\n❌ Abweichungen gefunden.")
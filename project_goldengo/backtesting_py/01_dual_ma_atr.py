@@ -6,8 +6,15 @@ from backtesting.lib import crossover
 
 # Importieren Sie Ihre "kugelsichere" Funktion aus der anderen Datei
 from project_goldengo.prepare_data import load_and_prepare_data
-
-class DualMaAtrStrategy(Strategy):
+# Indikatoren werden zwischen den Optimierungsläufen wiederverwendet
+from project_goldengo.indicator_cache import CachedStrategy
+# Gitter-Optimierung in einem vektorisierten Durchlauf
+from project_goldengo.grid import per_column, warmup
+from project_goldengo.optimizer import optimize
+from project_goldengo.walk_forward import walk_forward
+from project_goldengo.vectorized import crossover as crossover_matrix
+
+class DualMaAtrStrategy(CachedStrategy):
     n1 = 20
     n2 = 50
     atr_period = 14
@@ -53,6 +60,29 @@ class DualMaAtrStrategy(Strategy):
                 self.position.close()
 
 
+def grid_signals(data, n1, n2, atr_sl_multiplier,
+                 atr_period=DualMaAtrStrategy.atr_period,
+                 atr_tp_multiplier=DualMaAtrStrategy.atr_tp_multiplier):
+    """
+    Signale von DualMaAtrStrategy für `evaluate_grid`: jede Spalte ist eine
+    Parameterkombination, die Logik entspricht `init`/`next` oben.
+    """
+    close = data['Close']
+    ema_fast = per_column(ta.trend.ema_indicator, n1, close)
+    ema_slow = per_column(ta.trend.ema_indicator, n2, close)
+    atr = per_column(ta.volatility.average_true_range, atr_period, data['High'], data['Low'], close)
+    price = close.to_numpy()[:, None]
+    atr_ok = atr > 0
+    return dict(
+        entries=crossover_matrix(ema_fast, ema_slow) & atr_ok,
+        exits=crossover_matrix(ema_slow, ema_fast) & atr_ok,
+        sl=price - atr_sl_multiplier * atr,
+        tp=price + atr_tp_multiplier * atr,
+        size=DualMaAtrStrategy.size_prozent,
+        start=warmup(ema_fast, ema_slow, atr),
+    )
+
+
 if __name__ == '__main__':
     from project_goldengo.prepare_data import load_and_prepare_data
 
@@ -71,9 +101,15 @@ if __name__ == '__main__':
             exclusive_orders=True 
         )
 
-        print("Starte Optimierung... das kann einige Minuten dauern.")
+        print("Starte Optimierung...")
 
-        stats = bt.optimize(
+        # Alle 210 Kombinationen in einem vektorisierten Durchlauf bewerten
+        # (gleiche Ergebnisse wie bt.optimize, aber ohne einen Backtest pro
+        # Kombination). Budgetierte Suche: method='model', max_evals=60
+        heatmap = optimize(
+            data,
+            grid_signals,
+            method='grid',
             n1=range(10, 35, 5),
             n2=range(40, 75, 5),
             atr_sl_multiplier=range(2, 8, 1),
@@ -82,8 +118,14 @@ if __name__ == '__main__':
             constraint=lambda params: params.n1 < params.n2,
 
             # Wir wollen die Strategie finden, die die höchste End-Equity hat
-            maximize='Equity Final [$]'
+            maximize='Equity Final [$]',
+            cash=100000,
+            commission=0.001
         )
+
+        # Die beste Kombination einmal vollständig mit backtesting.py laufen lassen
+        best_params = dict(zip(heatmap.index.names, heatmap.idxmax()))
+        stats = bt.run(**best_params)
         print("\n--- BACKTEST ERGEBNISSE ---")
         print(stats)
         # =================================================================
@@ -92,6 +134,25 @@ if __name__ == '__main__':
         print(stats._strategy)
         # =================================================================
 
+        # Die beste Kombination oben ist In-Sample. Walk-Forward: auf 1 Jahr
+        # optimieren, die nächsten 3 Monate Out-of-Sample handeln
+        wf_stats = walk_forward(
+            data,
+            grid_signals,
+            train='365D',
+            test='90D',
+            n1=range(10, 35, 5),
+            n2=range(40, 75, 5),
+            atr_sl_multiplier=range(2, 8, 1),
+            constraint=lambda params: params.n1 < params.n2,
+            maximize='Equity Final [$]',
+            cash=100000,
+            commission=0.001
+        )
+        print("\n--- WALK-FORWARD (OUT-OF-SAMPLE) ---")
+        print(wf_stats)
+        print(wf_stats['_windows'].to_string(index=False))
+
         bt.plot()
     else:
         print("\nBacktest wurde wegen eines Daten-Fehlers nicht gestartet.")
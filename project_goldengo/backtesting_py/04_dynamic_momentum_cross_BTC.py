@@ -1,61 +1,28 @@
 import os, sys
 # Füge das Elternverzeichnis zu sys.path hinzu
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-import glob
-import pandas as pd
 import numpy as np
-from backtesting import Backtest, Strategy
 from backtesting.lib import crossover
-from project_goldengo.prepare_data import load_and_prepare_data
-from project_goldengo.saved_output import save_result  # Ergebnisse abspeichern
-
-# --- Hilfsfunktionen für Indikatoren ---
-def ema(arr, span):
-    arr = np.array(arr, dtype=float)
-    alpha = 2 / (span + 1)
-    ema_arr = np.empty_like(arr)
-    ema_arr[0] = arr[0]
-    for i in range(1, len(arr)):
-        ema_arr[i] = alpha * arr[i] + (1 - alpha) * ema_arr[i-1]
-    return ema_arr
-
-def sma(arr, period):
-    arr = np.array(arr, dtype=float)
-    sma_arr = np.full_like(arr, np.nan)
-    cumsum = np.cumsum(arr)
-    for i in range(period - 1, len(arr)):
-        sma_arr[i] = (cumsum[i] - (cumsum[i - period] if i >= period else 0)) / period
-    return sma_arr
-
-def rsi_func(arr, period):
-    arr = np.array(arr, dtype=float)
-    delta = np.diff(arr, prepend=arr[0])
-    gains = np.where(delta > 0, delta, 0)
-    losses = np.where(delta < 0, -delta, 0)
-    avg_gain = np.full_like(arr, np.nan)
-    avg_loss = np.full_like(arr, np.nan)
-    avg_gain[period] = np.mean(gains[1:period+1])
-    avg_loss[period] = np.mean(losses[1:period+1])
-    for i in range(period+1, len(arr)):
-        avg_gain[i] = (avg_gain[i-1] * (period-1) + gains[i]) / period
-        avg_loss[i] = (avg_loss[i-1] * (period-1) + losses[i]) / period
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
-
-def obv_func(close, volume):
-    close = np.array(close, dtype=float)
-    volume = np.array(volume, dtype=float)
-    obv = np.zeros_like(close)
-    for i in range(1, len(close)):
-        if close[i] > close[i-1]:
-            obv[i] = obv[i-1] + volume[i]
-        elif close[i] < close[i-1]:
-            obv[i] = obv[i-1] - volume[i]
-        else:
-            obv[i] = obv[i-1]
-    return obv
+from project_goldengo.batch_runner import run_batch
+from project_goldengo.grid import per_column, warmup
+from project_goldengo.indicator_cache import CachedStrategy
+from project_goldengo.indicators import ema, sma, rsi, obv
+from project_goldengo.optimizer import optimize
+from project_goldengo.saved_output import LOG_DIR, save_result  # Ergebnisse abspeichern
+from project_goldengo.vectorized import crossover as crossover_matrix
+
+
+# Bereits gerechnete Kombinationen werden hier abgelegt und bei erneuten
+# (oder abgebrochenen) Läufen wiederverwendet
+RESULT_STORE = os.path.join(LOG_DIR, 'optimizer_results.sqlite')
+
 
-class DynamicMomentumCrossover(Strategy):
+def range_atr(hi, lo, span):
+    """Geglättete High-Low-Spanne als einfache ATR-Näherung."""
+    return np.convolve(np.abs(np.array(hi) - np.array(lo)), np.ones(span) / span, mode='same')
+
+
+class DynamicMomentumCrossover(CachedStrategy):
     fast_ema = 20
     medium_ema = 50
     slow_ema = 200
@@ -71,15 +38,10 @@ class DynamicMomentumCrossover(Strategy):
         self.ema_fast = self.I(ema, price, self.fast_ema)
         self.ema_medium = self.I(ema, price, self.medium_ema)
         self.ema_slow = self.I(ema, price, self.slow_ema)
-        self.rsi = self.I(rsi_func, price, self.rsi_period)
-        self.obv = self.I(obv_func, self.data.Close, self.data.Volume)
+        self.rsi = self.I(rsi, price, self.rsi_period)
+        self.obv = self.I(obv, self.data.Close, self.data.Volume)
         self.obv_sma = self.I(sma, self.obv, self.obv_sma_period)
-        span = self.atr_period
-        self.atr = self.I(
-            lambda hi, lo: np.convolve(np.abs(np.array(hi) - np.array(lo)),
-                                       np.ones(span) / span, mode='same'),
-            self.data.High, self.data.Low
-        )
+        self.atr = self.I(range_atr, self.data.High, self.data.Low, self.atr_period)
         self.stop_price = None
 
     def next(self):
@@ -105,58 +67,96 @@ class DynamicMomentumCrossover(Strategy):
             if crossover(self.ema_medium, self.ema_fast) or price < self.stop_price:
                 self.position.close()
 
+
+def grid_signals(data, fast_ema, medium_ema, rsi_threshold, atr_multiple,
+                 slow_ema=DynamicMomentumCrossover.slow_ema,
+                 rsi_period=DynamicMomentumCrossover.rsi_period,
+                 obv_sma_period=DynamicMomentumCrossover.obv_sma_period,
+                 atr_period=DynamicMomentumCrossover.atr_period,
+                 risk_per_trade=DynamicMomentumCrossover.risk_per_trade):
+    """
+    Signale von DynamicMomentumCrossover für `evaluate_grid`: jede Spalte ist
+    eine Parameterkombination, die Logik entspricht `init`/`next` oben
+    (nachgezogener Stop als `trail_exit`, risikobasierte Größe über `stop_dist`).
+    """
+    price = data['Close'].to_numpy(dtype=float)
+    ema_fast = per_column(ema, fast_ema, price)
+    ema_medium = per_column(ema, medium_ema, price)
+    ema_slow = per_column(ema, slow_ema, price)
+    rsi_ = per_column(rsi, rsi_period, price)
+    obv_ = obv(price, data['Volume'].to_numpy(dtype=float))
+    obv_sma = per_column(sma, obv_sma_period, obv_)
+    atr = per_column(range_atr, atr_period, data['High'].to_numpy(dtype=float), data['Low'].to_numpy(dtype=float))
+    stop_dist = atr * atr_multiple
+
+    close = price[:, None]
+    with np.errstate(invalid='ignore'):
+        entries = (~(close <= ema_slow) & crossover_matrix(ema_fast, ema_medium)
+                   & ~(rsi_ >= rsi_threshold) & ~(obv_[:, None] <= obv_sma))
+    return dict(
+        entries=entries,
+        exits=crossover_matrix(ema_medium, ema_fast),
+        trail_exit=close - stop_dist,
+        stop_dist=stop_dist,
+        risk_per_trade=risk_per_trade,
+        start=warmup(ema_fast, ema_medium, ema_slow, rsi_, obv_, obv_sma, atr),
+    )
+
+def optimize_file(bt, stats, file, df):
+    """
+    Läuft im Worker nach dem Basis-Backtest: Basis-Ergebnis speichern,
+    Parameter optimieren, Ergebnis und Heatmap speichern.
+    """
+    base_result = {
+        'file': os.path.basename(file),
+        'Return [%]': stats['Return [%]'],
+        'Equity Final [$]': stats['Equity Final [$]'],
+        'Sharpe Ratio': stats.get('Sharpe Ratio', np.nan)
+    }
+    print(f"Basis-Ergebnisse: {base_result}\n")
+    save_result(base_result, 'DynamicMomentumCrossover_Base')
+
+    # Optimierung mit Heatmap: alle Kombinationen in einem vektorisierten
+    # Durchlauf, danach die beste einmal vollständig mit backtesting.py.
+    # Ergebnisse früherer Läufe kommen aus RESULT_STORE.
+    heatmap = optimize(df, grid_signals,
+                       method='grid',
+                       store=RESULT_STORE,
+                       strategy=DynamicMomentumCrossover,
+                       fast_ema=range(10, 61, 10),
+                       medium_ema=range(20, 121, 20),
+                       rsi_threshold=range(50, 101, 10),
+                       atr_multiple=[1.0, 1.5, 2.0, 2.5, 3.0],
+                       maximize='Return [%]',
+                       cash=1000000,
+                       commission=0.002)
+    opt_stats = bt.run(**dict(zip(heatmap.index.names, heatmap.idxmax())))
+    opt_result = {
+        'file': os.path.basename(file),
+        'fast_ema': opt_stats._strategy.fast_ema,
+        'medium_ema': opt_stats._strategy.medium_ema,
+        'rsi_threshold': opt_stats._strategy.rsi_threshold,
+        'atr_multiple': opt_stats._strategy.atr_multiple,
+        'Opt Return [%]': opt_stats['Return [%]'],
+        'Opt Equity [$]': opt_stats['Equity Final [$]']
+    }
+    print(f"Optimale Parameter & Ergebnis: {opt_result}\n")
+    save_result(opt_result, 'DynamicMomentumCrossover_Opt')
+
+    # Heatmap optional exportieren
+    heatmap.to_csv(os.path.join(LOG_DIR, f"heatmap_{os.path.basename(file)}.csv"))
+    return opt_result
+
+
 if __name__ == '__main__':
-    # BTC CSV-Dateien automatisch einlesen
+    # BTC CSV-Dateien automatisch einlesen, jede Datei in einem eigenen Prozess
     csv_dir = os.path.join('crypto_data', 'BTC')
-    files = sorted(glob.glob(os.path.join(csv_dir, '*.csv')))
-
-    for file in files:
-        print(f"--- Starte Backtest für: {file} ---")
-        df = load_and_prepare_data(file)
-        if df is None or df.empty:
-            print("Datei konnte nicht vorbereitet werden oder ist leer. Überspringe.")
-            continue
-
-        # Backtest initialisieren
-        bt = Backtest(df,
-                      DynamicMomentumCrossover,
-                      cash=1000000,
-                      commission=0.002,
-                      exclusive_orders=True)
-
-        # Basis-Backtest
-        stats = bt.run()
-        base_result = {
-            'file': os.path.basename(file),
-            'Return [%]': stats['Return [%]'],
-            'Equity Final [$]': stats['Equity Final [$]'],
-            'Sharpe Ratio': stats.get('Sharpe Ratio', np.nan)
-        }
-        print(f"Basis-Ergebnisse: {base_result}\n")
-        save_result(base_result, 'DynamicMomentumCrossover_Base')
-
-        # Optimierung mit Heatmap
-        opt_stats, heatmap = bt.optimize(
-            fast_ema=range(10, 61, 10),
-            medium_ema=range(20, 121, 20),
-            rsi_threshold=range(50, 101, 10),
-            atr_multiple=[1.0, 1.5, 2.0, 2.5, 3.0],
-            maximize='Return [%]',
-            return_heatmap=True
-        )
-        opt_result = {
-            'file': os.path.basename(file),
-            'fast_ema': opt_stats._strategy.fast_ema,
-            'medium_ema': opt_stats._strategy.medium_ema,
-            'rsi_threshold': opt_stats._strategy.rsi_threshold,
-            'atr_multiple': opt_stats._strategy.atr_multiple,
-            'Opt Return [%]': opt_stats['Return [%]'],
-            'Opt Equity [$]': opt_stats['Equity Final [$]']
-        }
-        print(f"Optimale Parameter & Ergebnis: {opt_result}\n")
-        save_result(opt_result, 'DynamicMomentumCrossover_Opt')
-
-        # Heatmap optional exportieren
-        heatmap.to_csv(f"heatmap_{os.path.basename(file)}.csv")
+    summary = run_batch(DynamicMomentumCrossover,
+                        os.path.join(csv_dir, '*.csv'),
+                        dict(cash=1000000,
+                             commission=0.002,
+                             exclusive_orders=True),
+                        post_process=optimize_file)
 
+    print(summary.to_string(index=False))
     print("\n--- Alle Backtests und Optimierungen abgeschlossen ---")
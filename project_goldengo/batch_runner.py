@@ -0,0 +1,145 @@
+# batch_runner.py
+"""
+Backtests für viele CSV-Dateien parallel über einen Prozess-Pool.
+
+Die Skripte 03 und 04 arbeiten ihre Dateien in `crypto_data/BTC` einzeln
+nacheinander ab. `run_batch` verteilt die (Datei, Strategie)-Jobs stattdessen
+auf einen `ProcessPoolExecutor`:
+
+- höchstens `max_in_flight` Jobs gleichzeitig eingereicht, es liegen also nie
+  mehr vorbereitete DataFrames im Speicher als nötig
+- mit `max_tasks_per_child` werden Worker nach n Jobs ersetzt und geben ihren
+  Speicher frei (ab Python 3.11)
+- die Worker schicken nur eine kleine Ergebniszeile zurück, keine Frames
+- die Übersicht ist nach Dateiname sortiert, unabhängig davon, welcher Job
+  zuerst fertig wird
+
+Beispiel:
+
+    summary = run_batch(TSMOMStrategy, 'crypto_data/BTC/*.csv',
+                        dict(cash=1_000_000, commission=0.002, trade_on_close=True))
+
+Strategie-Klasse und `post_process` müssen auf Modulebene definiert sein,
+damit sie an die Worker gepickelt werden können.
+"""
+
+import glob
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+from backtesting import Backtest
+
+from project_goldengo.prepare_data import load_and_prepare_data
+
+# Kennzahlen aus bt.run(), die in die Übersicht übernommen werden
+SUMMARY_KEYS = ['Return [%]', 'Buy & Hold Return [%]', 'Equity Final [$]', 'Sharpe Ratio',
+                'Max. Drawdown [%]', '# Trades', 'Win Rate [%]']
+
+
+def backtest_file(file_path, strategy, bt_kwargs, post_process=None):
+    """
+    Standard-Job: Datei laden, Backtest laufen lassen und die Kennzahlen als
+    Dict zurückgeben. `post_process(bt, stats, file_path, data)` läuft danach
+    im selben Worker (z.B. Optimierung oder Speichern); gibt es ein Dict
+    zurück, wird es in die Ergebniszeile übernommen.
+    """
+    row = {'file': os.path.basename(file_path), 'strategy': strategy.__name__}
+    start = time.perf_counter()
+
+    data = load_and_prepare_data(file_path)
+    if data is None or data.empty:
+        row['status'] = 'keine Daten'
+        return row
+
+    bt = Backtest(data, strategy, **bt_kwargs)
+    stats = bt.run()
+    row['rows'] = len(data)
+    row.update({key: stats.get(key) for key in SUMMARY_KEYS})
+
+    if post_process is not None:
+        extra = post_process(bt, stats, file_path, data)
+        if isinstance(extra, dict):
+            row.update(extra)
+
+    row['seconds'] = time.perf_counter() - start
+    row['status'] = 'ok'
+    return row
+
+
+def _make_pool(max_workers, max_tasks_per_child):
+    if max_tasks_per_child is None:
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if sys.version_info < (3, 11):
+        print("⚠️ max_tasks_per_child braucht Python 3.11 oder neuer und wird ignoriert.")
+        return ProcessPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers, max_tasks_per_child=max_tasks_per_child)
+
+
+def _failed(file_path, strategy, error):
+    return {'file': os.path.basename(file_path), 'strategy': strategy.__name__,
+            'status': f"Fehler: {error!r}"}
+
+
+def run_batch(strategy, pattern, bt_kwargs=None, post_process=None, job=backtest_file,
+              max_workers=None, max_in_flight=None, max_tasks_per_child=None):
+    """
+    Führt `job(file_path, strategy, bt_kwargs, post_process)` für jede Datei
+    aus `pattern` (glob-Muster oder Liste von Pfaden) in einem Prozess-Pool
+    aus und gibt die Ergebnisse als DataFrame zurück, eine Zeile pro Datei in
+    sortierter Reihenfolge. Ein fehlgeschlagener Job bricht den Lauf nicht ab, sondern
+    steht mit seiner Fehlermeldung in der Spalte `status`.
+
+    - `max_workers`: Anzahl Prozesse (Standard: alle Kerne, höchstens so viele
+      wie Dateien). `max_workers=1` läuft ohne Pool im aktuellen Prozess.
+    - `max_in_flight`: maximal gleichzeitig eingereichte Jobs (Standard:
+      `max_workers`), begrenzt den Speicherbedarf
+    - `max_tasks_per_child`: Worker nach so vielen Jobs neu starten
+    """
+    files = sorted(glob.glob(pattern) if isinstance(pattern, str) else pattern)
+    if not files:
+        print(f"⚠️ Keine Dateien für '{pattern}' gefunden.")
+        return pd.DataFrame()
+
+    bt_kwargs = bt_kwargs or {}
+    max_workers = min(max_workers or os.cpu_count() or 1, len(files))
+    max_in_flight = max(1, max_in_flight or max_workers)
+    results = [None] * len(files)
+    print(f"--- {len(files)} Dateien, {max_workers} Prozess(e) ---")
+
+    if max_workers == 1:
+        for idx, file_path in enumerate(files):
+            try:
+                results[idx] = job(file_path, strategy, bt_kwargs, post_process)
+            except Exception as e:
+                results[idx] = _failed(file_path, strategy, e)
+        return pd.DataFrame(results)
+
+    with _make_pool(max_workers, max_tasks_per_child) as pool:
+        queue = iter(enumerate(files))
+        pending = {}
+        done_count = 0
+
+        def submit_next():
+            for idx, file_path in queue:
+                pending[pool.submit(job, file_path, strategy, bt_kwargs, post_process)] = idx
+                return
+
+        for _ in range(max_in_flight):
+            submit_next()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = pending.pop(future)
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    results[idx] = _failed(files[idx], strategy, e)
+                done_count += 1
+                print(f"[{done_count}/{len(files)}] {os.path.basename(files[idx])}: {results[idx]['status']}")
+                submit_next()
+
+    return pd.DataFrame(results)
@@ -0,0 +1,174 @@
+# bt_events.py
+"""
+Protokoll für die backtrader-Strategien, das nichts kostet, wenn es aus ist.
+
+Bisher formatierte `next()` auf jeder Kerze einen String ('Close, %.2f' % ...)
+und rief `log()` auf, das ihn dann wegwarf, solange `printlog` nicht gesetzt
+war – bei `optstrategy` also 21 × pro Kerze für nichts. Hier gilt:
+
+- Ereignisse werden mit Art und Rohwerten gemeldet (`self.event(CLOSE, x)`),
+  formatiert wird erst beim Ausgeben.
+- Ob überhaupt etwas passiert, steht einmal nach `init_events()` in
+  `self.log_bars` (pro Kerze) und `self.log_events` (Orders, Trades); `next()`
+  prüft nur noch dieses Attribut.
+- Statt zu drucken können die Ereignisse in einen vorab angelegten,
+  strukturierten NumPy-Puffer (`EventLog`) geschrieben werden. Mit
+  `EventLogAnalyzer` kommen sie auch aus `optstrategy`-Läufen heraus
+  (`optreturn` behält nur Parameter und Analyzer).
+
+Das Modul selbst lädt backtrader nicht; nur `EventLogAnalyzer` wird beim
+ersten Zugriff gebaut.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# Ereignisarten und ihre Textvorlagen (Index = Art)
+CLOSE, BUY_CREATE, SELL_CREATE, BUY_EXECUTED, SELL_EXECUTED, ORDER_FAILED, TRADE_CLOSED = range(7)
+EVENT_NAMES = ['Close', 'Buy create', 'Sell create', 'Buy executed', 'Sell executed',
+               'Order failed', 'Trade closed']
+EVENT_TEMPLATES = [
+    'Close, %.2f',
+    'BUY CREATE, %.2f',
+    'SELL CREATE, %.2f',
+    'BUY EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f',
+    'SELL EXECUTED, Price: %.2f, Cost: %.2f, Comm %.2f',
+    'Order Canceled/Margin/Rejected',
+    'OPERATION PROFIT, GROSS %.2f, NET %.2f',
+]
+EVENT_ARITY = [template.count('%') for template in EVENT_TEMPLATES]
+MAX_VALUES = max(EVENT_ARITY)
+
+EVENT_DTYPE = np.dtype([
+    ('bar', np.int64),           # len(strategy) beim Ereignis
+    ('time', np.float64),        # backtrader-Zeit (Tage seit 0001-01-01, wie bt.date2num)
+    ('kind', np.uint8),
+    ('values', np.float64, (MAX_VALUES,)),
+])
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def num2timestamps(values):
+    """backtrader-Zeitwerte (float) -> DatetimeIndex, ohne backtrader zu laden."""
+    # Tage als float64 sind nur auf einige Mikrosekunden genau; auf
+    # Millisekunden runden, damit Kerzenzeiten exakt herauskommen
+    seconds = (np.asarray(values, dtype=np.float64) - _EPOCH_ORDINAL) * 86400.0
+    return pd.to_datetime(np.round(seconds * 1e3).astype(np.int64), unit='ms')
+
+
+class EventLog:
+    """Strukturierter Ereignispuffer; wächst nur, wenn die Kapazität nicht reicht."""
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._allocate(max(int(capacity), 1))
+
+    def _allocate(self, capacity):
+        data = np.zeros(capacity, dtype=EVENT_DTYPE)
+        if self._size:
+            data[:self._size] = self._data[:self._size]
+        self._data = data
+        # Sichten auf die Felder: einzelne Zuweisungen sind darüber deutlich
+        # billiger als über eine Zeile des strukturierten Arrays
+        self._bar, self._time, self._kind, self._values = (data[name] for name in EVENT_DTYPE.names)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def data(self):
+        """Die bisher geschriebenen Einträge (Sicht, keine Kopie)."""
+        return self._data[:self._size]
+
+    def append(self, bar, time, kind, values=()):
+        i = self._size
+        if i == len(self._data):
+            self._allocate(2 * i)
+        self._bar[i] = bar
+        self._time[i] = time
+        self._kind[i] = kind
+        row = self._values[i]
+        for j, value in enumerate(values):
+            row[j] = value
+        self._size = i + 1
+
+    def clear(self):
+        self._size = 0
+
+    def to_frame(self):
+        """Einträge als DataFrame mit Zeitindex, Ereignisname und den Werten."""
+        data = self.data
+        frame = pd.DataFrame(data['values'], columns=[f'Wert {i + 1}' for i in range(MAX_VALUES)],
+                             index=num2timestamps(data['time']))
+        frame.insert(0, 'Ereignis', pd.Categorical.from_codes(data['kind'], EVENT_NAMES))
+        frame.insert(0, 'Kerze', data['bar'])
+        frame.index.name = 'Zeit'
+        return frame
+
+    def format(self):
+        """Einträge als Textzeilen wie sie `printlog` ausgeben würde."""
+        data = self.data
+        return ['%s, %s' % (day.date().isoformat(), EVENT_TEMPLATES[kind] % tuple(values[:EVENT_ARITY[kind]]))
+                for day, kind, values in zip(num2timestamps(data['time']), data['kind'], data['values'])]
+
+
+class EventStrategyMixin:
+    """
+    Mixin für `bt.Strategy` (vor `bt.Strategy` in die Basisklassen setzen).
+
+    In `__init__` einmal `self.init_events(printlog=..., record=...)` aufrufen;
+    danach meldet die Strategie Ereignisse mit `self.event(ART, *werte)` und
+    bewacht Meldungen pro Kerze mit `if self.log_bars:`.
+    """
+
+    log_bars = False
+    log_events = False
+    events = None
+    _print_events = False
+
+    def init_events(self, printlog=False, record=False, bars=True, capacity=None):
+        """Legt einmal fest, was gemeldet wird; `bars=False` lässt die Meldungen pro Kerze weg."""
+        self._print_events = bool(printlog)
+        if record:
+            if capacity is None:
+                # Daten sind beim Anlegen der Strategie schon geladen: eine
+                # Kerzenmeldung pro Kerze plus Reserve für Orders und Trades
+                capacity = 2 * self.datas[0].buflen() + 64
+            self.events = EventLog(capacity)
+        self.log_events = self._print_events or self.events is not None
+        self.log_bars = self.log_events and bars
+
+    def event(self, kind, *values):
+        if self.events is not None:
+            self.events.append(len(self), self.datas[0].datetime[0], kind, values)
+        if self._print_events:
+            print('%s, %s' % (self.datas[0].datetime.date(0).isoformat(), EVENT_TEMPLATES[kind] % values))
+
+
+def _make_event_log_analyzer():
+    import backtrader as bt
+
+    class EventLogAnalyzer(bt.Analyzer):
+        """Gibt die aufgezeichneten Ereignisse der Strategie als DataFrame zurück."""
+
+        def stop(self):
+            events = getattr(self.strategy, 'events', None)
+            self.rets = events.to_frame() if events is not None else None
+
+        def get_analysis(self):
+            return self.rets
+
+    EventLogAnalyzer.__module__ = __name__
+    EventLogAnalyzer.__qualname__ = 'EventLogAnalyzer'
+    return EventLogAnalyzer
+
+
+def __getattr__(name):
+    # backtrader wird erst geladen, wenn jemand den Analyzer braucht
+    if name == 'EventLogAnalyzer':
+        globals()[name] = _make_event_log_analyzer()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,214 @@
+# bt_optimize.py
+"""
+Parameter-Optimierung für backtrader-Strategien mit Ergebnistabelle.
+
+`cerebro.optstrategy(...)` mit Standard-Einstellungen lädt die PandasData-Reihe
+mit `maxcpus=1` für jeden Lauf neu (per `iloc`, Zelle für Zelle), schickt mit
+mehreren Kernen pro Lauf den ganzen Cerebro an einen Worker und liefert am
+Ende nur `OptReturn`-Objekte, aus denen man sich die Kennzahlen selbst holen
+muss. `optimize_backtrader` stellt das bewusst ein:
+
+- Daten: Pfad (über `load_and_prepare_data`, also mit Parquet-Cache) oder
+  vorbereiteter DataFrame; `FastPandasData` liest die Spalten einmal als
+  Arrays statt pro Zelle über pandas.
+- `preload=True`, `runonce=True`, `optdatas=True`: Die Reihe wird einmal
+  geladen, mit mehreren Kernen im Elternprozess, mit einem Kern über
+  `PreloadedCerebro` ebenfalls nur einmal.
+- `optreturn=True`: Aus den Workern kommen nur Parameter und Analyzer zurück.
+- `stdstats=False`: Die Standard-Beobachter braucht nur der Plot.
+- Sharpe, Drawdown, Rendite und Trades kommen aus Analyzern und landen in
+  einer Tabelle mit einer Zeile pro Parametersatz, sortiert nach `maximize`.
+
+    table = optimize_backtrader(TestStrategy, 'crypto_data/BTC/BTC-USD_1d_20_25.csv',
+                                maperiod=range(10, 31))
+"""
+
+import datetime
+import os
+import time
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from project_goldengo.prepare_data import load_and_prepare_data
+
+# Kennzahlen der Tabelle (Namen wie in den backtesting.py-Statistiken)
+STATS_KEYS = ['Return [%]', 'Equity Final [$]', 'Sharpe Ratio', 'Max. Drawdown [%]',
+              '# Trades', 'Win Rate [%]']
+
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def date2num_array(index):
+    """
+    `bt.date2num` für einen ganzen DatetimeIndex (UTC, wie backtrader
+    zeitzonenbehaftete Zeiten ablegt), mit denselben Rechenschritten, damit
+    die Werte Bit für Bit übereinstimmen.
+    """
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    micros = index.as_unit('us').asi8
+    days, micros = np.divmod(micros, 86_400_000_000)
+    seconds, micro = np.divmod(micros, 1_000_000)
+    hour, rest = np.divmod(seconds, 3600)
+    minute, second = np.divmod(rest, 60)
+    return ((days + _EPOCH_ORDINAL).astype(np.float64)
+            + (hour / 24.0 + minute / 1440.0 + second / 86400.0 + micro / 86400000000.0))
+
+
+class FastPandasData(bt.feeds.PandasData):
+    """
+    `bt.feeds.PandasData` mit denselben Parametern, holt die Spalten beim
+    Start aber einmal als Listen heraus; `_load` liest dann nur noch per Index.
+    """
+
+    def start(self):
+        super().start()
+        frame = self.p.dataname
+        self._n = len(frame)
+        self._columns = []
+        for field, colindex in self._colmapping.items():
+            if field == 'datetime' or colindex is None:
+                continue
+            values = frame.iloc[:, colindex].to_numpy(dtype=np.float64).tolist()
+            self._columns.append((getattr(self.lines, field), values))
+        coldtime = self._colmapping['datetime']
+        stamps = frame.index if coldtime is None else frame.iloc[:, coldtime]
+        self._datetimes = date2num_array(stamps).tolist()
+
+    def _load(self):
+        self._idx += 1
+        idx = self._idx
+        if idx >= self._n:
+            return False
+        for line, values in self._columns:
+            line[0] = values[idx]
+        self.lines.datetime[0] = self._datetimes[idx]
+        return True
+
+
+class PreloadedCerebro(bt.Cerebro):
+    """
+    Cerebro, das die Daten einer Optimierung auch mit `maxcpus=1` nur einmal
+    lädt (so wie es backtrader mit `optdatas` für mehrere Kerne macht).
+    """
+
+    _preloaded = False
+
+    def _predata(self):
+        return (self._dooptimize and self.p.optdatas and self.p.maxcpus == 1
+                and self._dopreload and self._dorunonce)
+
+    def runstrategies(self, iterstrat, predata=False):
+        if not predata and self._predata():
+            if not self._preloaded:
+                for data in self.datas:
+                    data.reset()
+                    if self._exactbars < 1:
+                        data.extend(size=self.params.lookahead)
+                    data._start()
+                    data.preload()
+                self._preloaded = True
+            predata = True
+        return super().runstrategies(iterstrat, predata=predata)
+
+    def run(self, **kwargs):
+        try:
+            return super().run(**kwargs)
+        finally:
+            if self._preloaded:
+                for data in self.datas:
+                    data.stop()
+                self._preloaded = False
+
+
+class FinalValue(bt.Analyzer):
+    """Depotwert am Ende des Laufs."""
+
+    def stop(self):
+        self.rets['value'] = self.strategy.broker.getvalue()
+
+
+def _timeframe(index):
+    """backtrader-Zeitrahmen (und Kompression) aus dem Abstand der Zeitstempel."""
+    step = pd.Series(index).diff().median()
+    if pd.isna(step) or step >= pd.Timedelta(days=1):
+        return bt.TimeFrame.Days, 1
+    return bt.TimeFrame.Minutes, max(1, int(step / pd.Timedelta(minutes=1)))
+
+
+def _stats_row(result, cash):
+    analyzers = result.analyzers
+    value = analyzers.value.get_analysis()['value']
+    trades = analyzers.trades.get_analysis()
+    closed = trades.get('total', {}).get('closed', 0)
+    won = trades.get('won', {}).get('total', 0)
+    sharpe = analyzers.sharpe.get_analysis().get('sharperatio')
+    return {
+        'Return [%]': (value / cash - 1) * 100,
+        'Equity Final [$]': value,
+        'Sharpe Ratio': np.nan if sharpe is None else sharpe,
+        'Max. Drawdown [%]': -analyzers.drawdown.get_analysis()['max']['drawdown'],
+        '# Trades': closed,
+        'Win Rate [%]': won / closed * 100 if closed else np.nan,
+    }
+
+
+def optimize_backtrader(strategy, data, cash=100_000.0, commission=0.001, stake=10,
+                        maximize='Sharpe Ratio', maxcpus=None, annualization=365,
+                        riskfreerate=0.0, **params):
+    """
+    Führt `strategy` für alle Kombinationen aus `params` (Iterables wie bei
+    `optstrategy`) aus und gibt die Kennzahlen als DataFrame mit MultiIndex
+    der Parameter zurück, sortiert nach `maximize` (absteigend). Die Anzahl
+    Läufe pro Sekunde steht in `table.attrs['Läufe/s']`.
+
+    - `data`: Pfad zu einer CSV-Datei oder vorbereiteter DataFrame
+    - `maxcpus`: Prozesse (Standard: alle Kerne)
+    - `annualization`: Handelstage pro Jahr für die Sharpe Ratio auf
+      Tagesrenditen (365 bei Krypto)
+    """
+    if not params:
+        raise ValueError("Keine Parameter für die Optimierung angegeben.")
+    if isinstance(data, (str, os.PathLike)):
+        path = data
+        data = load_and_prepare_data(path)
+        if data is None or data.empty:
+            raise ValueError(f"Keine Daten in '{path}'.")
+
+    maxcpus = maxcpus or os.cpu_count() or 1
+    cerebro = PreloadedCerebro(maxcpus=maxcpus, preload=True, runonce=True, optdatas=True,
+                               optreturn=True, stdstats=False)
+    timeframe, compression = _timeframe(data.index)
+    cerebro.adddata(FastPandasData(dataname=data, timeframe=timeframe, compression=compression))
+    cerebro.broker.setcash(cash)
+    cerebro.broker.setcommission(commission=commission)
+    cerebro.addsizer(bt.sizers.FixedSize, stake=stake)
+    cerebro.optstrategy(strategy, **params)
+
+    cerebro.addanalyzer(FinalValue, _name='value')
+    cerebro.addanalyzer(bt.analyzers.SharpeRatio, _name='sharpe', timeframe=bt.TimeFrame.Days,
+                        annualize=True, factor=annualization, riskfreerate=riskfreerate)
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name='drawdown')
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+
+    names = list(params)
+    start = time.perf_counter()
+    results = cerebro.run()
+    seconds = time.perf_counter() - start
+
+    rows, keys = [], []
+    for run in results:
+        result = run[0]
+        rows.append(_stats_row(result, cash))
+        keys.append(tuple(getattr(result.params, name) for name in names))
+
+    table = pd.DataFrame(rows, columns=STATS_KEYS,
+                         index=pd.MultiIndex.from_tuples(keys, names=names))
+    table = table.sort_values(maximize, ascending=False, na_position='last')
+    table.attrs['Läufe/s'] = len(rows) / seconds
+    print(f"--- {len(rows)} Läufe in {seconds:.2f} s ({len(rows) / seconds:.1f} Läufe/s, "
+          f"{maxcpus} Prozess(e)) ---")
+    return table
@@ -0,0 +1,230 @@
+# charts.py
+"""
+Verzögertes Rendern von Backtest-Charts.
+
+`bt.plot()` baut für jeden Backtest einen vollständigen Bokeh-Chart mit allen
+Kerzen (bei 5m-Daten Hunderttausende Punkte), öffnet dabei ein Browserfenster
+und liegt direkt im kritischen Pfad des Batches. Hier wird stattdessen nur
+festgehalten, was der Chart braucht (`record_chart`): Schlusskurs und
+Equity, per LTTB (Largest-Triangle-Three-Buckets) auf höchstens `max_points`
+Punkte reduziert, dazu die Ein- und Ausstiege der Trades. Gezeichnet wird
+später von einem `ChartRenderer`:
+
+- `mode='thread'`: im Hintergrund (Thread-Pool), der Backtest läuft weiter
+- `mode='process'`: in eigenen Prozessen
+- `mode='defer'`: nur die Chart-Daten werden neben dem Ziel abgelegt
+  (`<ziel>.chart.pkl`), gerendert wird auf Abruf mit `render_pending()`
+
+Das Format richtet sich nach der Endung: `.png` per Matplotlib, `.html`
+per Bokeh (ohne Browser).
+
+    with ChartRenderer() as renderer:
+        for ...:
+            stats = bt.run()
+            renderer.submit(record_chart(bt, stats, 'BTC_2021'), 'BTC_2021.png')
+"""
+
+import atexit
+import glob
+import multiprocessing.util
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MODES = ('thread', 'process', 'defer')
+
+# Obergrenze der Punkte pro Linie im Chart
+MAX_POINTS = 2000
+
+# Endung der abgelegten Chart-Daten bei mode='defer'
+PENDING_SUFFIX = '.chart.pkl'
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: wählt `n_out` Indizes aus (x, y), die die
+    Form der Kurve erhalten (Spitzen bleiben sichtbar). Erster und letzter
+    Punkt sind immer dabei.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Mittelpunkte aller Buckets auf einmal; der "nächste Bucket" des letzten ist der letzte Punkt
+    counts = np.diff(np.append(edges, n - 1))
+    mean_x = np.append(np.add.reduceat(x[:n - 1], edges[:-1]) / counts[:-1], x[-1])
+    mean_y = np.append(np.add.reduceat(y[:n - 1], edges[:-1]) / counts[:-1], y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[i + 1] - ay))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def _downsample(series, max_points):
+    index = series.index
+    x = index.asi8 if isinstance(index, pd.DatetimeIndex) else np.arange(len(series))
+    keep = lttb(x, series.to_numpy(dtype=float), max_points)
+    return series.iloc[keep]
+
+
+def record_chart(bt, stats, title, max_points=MAX_POINTS):
+    """
+    Hält die Daten für den Chart eines Backtests fest: Schlusskurs und
+    Equity (auf `max_points` reduziert) und die Trades. Das Ergebnis ist ein
+    kleines, picklebares Dict.
+    """
+    trades = stats._trades
+    return {
+        'title': title,
+        'close': _downsample(bt._data['Close'], max_points),
+        'equity': _downsample(stats._equity_curve['Equity'], max_points),
+        'entries': pd.Series(trades['EntryPrice'].to_numpy(), index=pd.Index(trades['EntryTime'])),
+        'exits': pd.Series(trades['ExitPrice'].to_numpy(), index=pd.Index(trades['ExitTime'])),
+        'stats': {key: stats.get(key) for key in ('Return [%]', 'Buy & Hold Return [%]',
+                                                  'Max. Drawdown [%]', '# Trades')},
+    }
+
+
+def _render_png(chart, path):
+    # Objekt-API statt pyplot: kein globaler Zustand, auch in Threads nutzbar
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 7))
+    FigureCanvasAgg(fig)
+    ax_eq, ax_price = fig.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [1, 2]})
+    ax_eq.plot(chart['equity'].index, chart['equity'].to_numpy(), color='tab:blue', linewidth=1)
+    ax_eq.set_ylabel('Equity')
+    ax_price.plot(chart['close'].index, chart['close'].to_numpy(), color='black', linewidth=0.8)
+    ax_price.scatter(chart['entries'].index, chart['entries'].to_numpy(), marker='^', color='tab:green', s=14)
+    ax_price.scatter(chart['exits'].index, chart['exits'].to_numpy(), marker='v', color='tab:red', s=14)
+    ax_price.set_ylabel('Close')
+    summary = ', '.join(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}"
+                        for key, value in chart['stats'].items())
+    fig.suptitle(f"{chart['title']}\n{summary}", fontsize=10)
+    fig.savefig(path, dpi=100)
+
+
+def _render_html(chart, path):
+    from bokeh.io import save
+    from bokeh.layouts import column
+    from bokeh.plotting import figure
+    from bokeh.resources import CDN
+
+    equity = figure(title=chart['title'], x_axis_type='datetime', height=250, sizing_mode='stretch_width')
+    equity.line(chart['equity'].index, chart['equity'].to_numpy(), color='navy')
+    price = figure(x_axis_type='datetime', x_range=equity.x_range, height=400, sizing_mode='stretch_width')
+    price.line(chart['close'].index, chart['close'].to_numpy(), color='black')
+    price.scatter(chart['entries'].index, chart['entries'].to_numpy(), marker='triangle', color='green', size=7)
+    price.scatter(chart['exits'].index, chart['exits'].to_numpy(), marker='inverted_triangle', color='red', size=7)
+    save(column(equity, price, sizing_mode='stretch_width'), filename=path, resources=CDN, title=chart['title'])
+
+
+def render_chart(chart, path):
+    """Zeichnet die Daten aus `record_chart` nach `path` (.png oder .html)."""
+    if path.endswith('.html'):
+        _render_html(chart, path)
+    else:
+        _render_png(chart, path)
+    return path
+
+
+def render_pending(directory, max_workers=None):
+    """Rendert alle mit mode='defer' abgelegten Charts in `directory` und löscht die Chart-Daten."""
+    pending = sorted(glob.glob(os.path.join(glob.escape(directory), '*' + PENDING_SUFFIX)))
+    with ChartRenderer(mode='process', max_workers=max_workers) as renderer:
+        for pending_file in pending:
+            with open(pending_file, 'rb') as f:
+                chart = pickle.load(f)
+            renderer.submit(chart, pending_file[:-len(PENDING_SUFFIX)])
+    for pending_file in pending:
+        os.remove(pending_file)
+    return [pending_file[:-len(PENDING_SUFFIX)] for pending_file in pending]
+
+
+class ChartRenderer:
+    """
+    Rendert Charts im Hintergrund (siehe Modul-Doku). `submit` kehrt sofort
+    zurück, `close()` wartet auf alle offenen Charts und meldet Fehler.
+    """
+
+    def __init__(self, mode='thread', max_workers=1):
+        if mode not in MODES:
+            raise ValueError(f"`mode` muss einer dieser Werte sein: {MODES}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self._pool = None
+        self._futures = []
+        self._pid = os.getpid()
+
+    def submit(self, chart, path):
+        """Plant den Chart `chart` (aus `record_chart`) für `path` ein."""
+        if self.mode == 'defer':
+            tmp_file = path + PENDING_SUFFIX + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(chart, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, path + PENDING_SUFFIX)
+            return None
+        if self._pool is None:
+            executor = ThreadPoolExecutor if self.mode == 'thread' else ProcessPoolExecutor
+            self._pool = executor(max_workers=self.max_workers)
+        future = self._pool.submit(render_chart, chart, path)
+        self._futures.append(future)
+        return future
+
+    def wait(self):
+        """Wartet auf alle eingeplanten Charts und gibt die fertigen Pfade zurück."""
+        if os.getpid() != self._pid:
+            # Geforkte Kopie: die Charts gehören dem Elternprozess
+            self._futures.clear()
+            return []
+        done, errors = [], []
+        for future in self._futures:
+            try:
+                done.append(future.result())
+            except Exception as e:
+                errors.append(e)
+        self._futures.clear()
+        for error in errors:
+            print(f"⚠️ Chart konnte nicht gerendert werden: {error!r}")
+        return done
+
+    def close(self):
+        done = self.wait()
+        if self._pool is not None and os.getpid() == self._pid:
+            self._pool.shutdown()
+        self._pool = None
+        return done
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Ein Renderer pro Prozess, wird beim Beenden abgewartet (auch in Worker-Prozessen)
+_default_renderer = None
+
+
+def default_renderer():
+    """Gemeinsamer ChartRenderer (Thread im Hintergrund) des aktuellen Prozesses."""
+    global _default_renderer
+    if _default_renderer is None or _default_renderer._pid != os.getpid():
+        _default_renderer = ChartRenderer()
+        atexit.register(_default_renderer.close)
+        multiprocessing.util.Finalize(None, _default_renderer.close, exitpriority=10)
+    return _default_renderer
@@ -0,0 +1,140 @@
+# compact.py
+"""
+Kompakte OHLCV-Reihe für viele gleichzeitig geladene Symbole.
+
+Ein vorbereiteter Frame aus `load_and_prepare_data` belegt pro Kerze 8 Byte
+Zeitstempel plus 8 Byte je float64-Spalte, dazu kommen mitgeschleppte
+Spalten wie 'Adj Close'. `CompactOHLCV` hält nur die fünf Pflichtspalten als
+zusammenhängende NumPy-Arrays:
+
+- Zeitstempel als int64-Epoch-Werte (UTC, in der Einheit des Index)
+- Preise als float32, wenn sich die float64-Werte daraus exakt
+  zurückgewinnen lassen: Kurse haben eine feste Anzahl Nachkommastellen
+  (Tick), und solange float32 näher als einen halben Tick am Wert liegt,
+  liefert Runden auf diese Stellen wieder genau den eingelesenen Wert.
+  Sonst (zu viele Stellen, zu große Beträge) bleibt die Spalte float64.
+- Volume genauso (bei Binance reicht float32 wegen der vielen Stellen meist
+  nicht, bei gerundeten Volumina schon)
+
+`to_frame()` baut daraus bei Bedarf wieder den float64-DataFrame, den
+backtesting.py und backtrader erwarten, Bit für Bit gleich dem Original.
+
+    series = load_compact('crypto_data/5m/BTCUSDT_5m_full.csv')
+    bt = Backtest(series.to_frame(), Strategy)
+"""
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.prepare_data import REQUIRED_COLUMNS, load_and_prepare_data
+
+MAX_DECIMALS = 8
+# Spaltenname im Frame -> Attribut
+_ATTRS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+
+
+def _decimals(values, max_decimals=MAX_DECIMALS):
+    """Kleinste Anzahl Nachkommastellen, auf die alle Werte schon gerundet sind (oder None)."""
+    for decimals in range(max_decimals + 1):
+        if np.array_equal(np.round(values, decimals), values, equal_nan=True):
+            return decimals
+    return None
+
+
+def _restore(values, decimals):
+    if decimals is None:
+        return values.astype(np.float64)
+    return np.round(values.astype(np.float64), decimals)
+
+
+def compact_column(values, max_decimals=MAX_DECIMALS):
+    """
+    float32-Kopie und Nachkommastellen, wenn `_restore` daraus exakt `values`
+    macht; sonst die float64-Werte und None.
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    decimals = _decimals(values, max_decimals)
+    if decimals is not None:
+        small = values.astype(np.float32)
+        if np.array_equal(_restore(small, decimals), values, equal_nan=True):
+            return small, decimals
+    return values, None
+
+
+class CompactOHLCV:
+    """OHLCV-Reihe über zusammenhängenden Arrays, siehe Moduldokumentation."""
+
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'volume', 'decimals', 'unit', 'tz')
+
+    def __init__(self, time, open, high, low, close, volume, decimals=None, unit='us', tz='UTC'):
+        self.time = np.ascontiguousarray(time, dtype=np.int64)
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        # Nachkommastellen je float32-Spalte (None: Spalte ist float64)
+        self.decimals = dict(decimals or {})
+        self.unit = unit
+        self.tz = tz
+        if not all(len(getattr(self, attr)) == len(self.time) for attr in _ATTRS.values()):
+            raise ValueError("Alle Spalten müssen so lang sein wie die Zeitstempel.")
+
+    @classmethod
+    def from_frame(cls, data, max_decimals=MAX_DECIMALS):
+        """Aus einem vorbereiteten Frame (DatetimeIndex, Spalten wie `REQUIRED_COLUMNS`)."""
+        index = pd.DatetimeIndex(data.index)
+        tz = str(index.tz) if index.tz is not None else None
+        if index.tz is not None:
+            index = index.tz_convert('UTC').tz_localize(None)
+        columns, decimals = {}, {}
+        for col in REQUIRED_COLUMNS:
+            columns[_ATTRS[col]], decimals[col] = compact_column(data[col].to_numpy(), max_decimals)
+        return cls(index.asi8, decimals=decimals, unit=getattr(index, 'unit', 'ns'), tz=tz, **columns)
+
+    def __len__(self):
+        return len(self.time)
+
+    def __repr__(self):
+        dtypes = ', '.join(f"{col}={getattr(self, attr).dtype}" for col, attr in _ATTRS.items())
+        return f"CompactOHLCV({len(self)} Kerzen, {dtypes}, {self.nbytes / 1024 ** 2:.1f} MB)"
+
+    @property
+    def nbytes(self):
+        return self.time.nbytes + sum(getattr(self, attr).nbytes for attr in _ATTRS.values())
+
+    @property
+    def index(self):
+        index = pd.DatetimeIndex(self.time.view(f'datetime64[{self.unit}]'), name='Date')
+        return index.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else index
+
+    def column(self, name):
+        """Spalte `name` ('Open', ..., 'Volume') als float64-Array mit den Originalwerten."""
+        return _restore(getattr(self, _ATTRS[name]), self.decimals.get(name))
+
+    def to_frame(self):
+        """Der float64-DataFrame mit den fünf Spalten, wie ihn `load_and_prepare_data` liefert."""
+        return pd.DataFrame({col: self.column(col) for col in REQUIRED_COLUMNS}, index=self.index)
+
+    def slice(self, start=None, end=None):
+        """Zeitraum `[start, end]` (inklusive) als neue Reihe mit Views, ohne Kopie."""
+        lo = 0 if start is None else int(np.searchsorted(self.time, self._stamp(start), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.time, self._stamp(end), side='right'))
+        columns = {attr: getattr(self, attr)[lo:hi] for attr in _ATTRS.values()}
+        return CompactOHLCV(self.time[lo:hi], decimals=self.decimals, unit=self.unit, tz=self.tz, **columns)
+
+    def _stamp(self, value):
+        ts = pd.Timestamp(value)
+        if ts.tzinfo is None and self.tz is not None:
+            ts = ts.tz_localize(self.tz)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert('UTC').tz_localize(None)
+        return ts.to_datetime64().astype(f'datetime64[{self.unit}]').astype(np.int64)
+
+
+def load_compact(file_path, max_decimals=MAX_DECIMALS, **kwargs):
+    """`load_and_prepare_data` (mit Cache) und gleich in eine `CompactOHLCV` umwandeln."""
+    data = load_and_prepare_data(file_path, **kwargs)
+    if data is None:
+        return None
+    return CompactOHLCV.from_frame(data, max_decimals)
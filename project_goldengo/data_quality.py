@@ -0,0 +1,174 @@
+# data_quality.py
+"""
+Prüfung der OHLCV-Daten auf Lücken, doppelte Zeitstempel und kaputte Kerzen.
+
+`load_and_prepare_data` entfernt nur Zeilen mit fehlenden Werten. Fehlende
+5m-Kerzen, doppelte oder unsortierte Zeitstempel und Kerzen mit High < Low
+verfälschen aber still die Aufwärmphase der Indikatoren und die Fills.
+`scan_ohlcv` findet sie mit wenigen vektorisierten Operationen über die
+Epoch-Werte und die OHLC-Spalten (600k Kerzen in Millisekunden) und liefert
+ein JSON-taugliches Dict. `load_and_prepare_data` legt dieses Urteil neben
+dem Cache-Eintrag ab und rechnet es erst neu, wenn sich die CSV ändert.
+
+`repair_ohlcv` sortiert, entfernt doppelte Zeitstempel (die letzte Zeile
+gewinnt, wie bei `align_symbols`) und füllt auf Wunsch Lücken mit flachen
+Kerzen auf dem letzten Schlusskurs und Volumen 0. Kaputte Kerzen werden nur
+gemeldet, für sie gibt es keinen richtigen Wert.
+
+    summary = scan_files('crypto_data/5m/*_5m_full.csv')
+"""
+
+import glob
+
+import numpy as np
+import pandas as pd
+
+# Bei Änderungen am Inhalt des Urteils erhöhen, dann werden alte neu berechnet
+SCAN_VERSION = 1
+
+_UNITS_PER_SECOND = {'s': 1, 'ms': 1_000, 'us': 1_000_000, 'ns': 1_000_000_000}
+
+# Zähler, die ein einwandfreies Urteil auf 0 haben muss, mit Text für `describe`
+ISSUES = {
+    'unsorted': 'Rücksprünge im Index',
+    'duplicates': 'doppelte Zeitstempel',
+    'gaps': 'Lücken',
+    'off_grid': 'Zeitstempel neben dem Raster',
+    'high_below_low': 'Kerzen mit High < Low',
+    'open_close_outside': 'Kerzen mit Open/Close außerhalb High/Low',
+    'nonpositive_prices': 'Kerzen mit Preis <= 0',
+    'negative_volume': 'Kerzen mit negativem Volumen',
+}
+
+
+def _epoch(index):
+    """Epoch-Werte (UTC) in der Einheit des Index und Einheiten pro Sekunde."""
+    index = pd.DatetimeIndex(index)
+    return index.asi8, _UNITS_PER_SECOND[getattr(index, 'unit', 'ns')]
+
+
+def scan_ohlcv(data, step_seconds=None):
+    """
+    Prüft einen OHLCV-Frame (DatetimeIndex, Spalten Open/High/Low/Close/Volume)
+    und gibt das Urteil als Dict zurück. Der Kerzenabstand wird, falls nicht
+    angegeben, als Median der positiven Abstände geschätzt.
+    """
+    stamps, per_second = _epoch(data.index)
+    steps = np.diff(stamps)
+    unsorted = int(np.count_nonzero(steps < 0))
+    if unsorted:
+        # Fast sortiert: stabiles Sortieren (Timsort) ist hier nahezu linear
+        stamps = np.sort(stamps, kind='stable')
+        steps = np.diff(stamps)
+
+    positive = steps[steps > 0]
+    if step_seconds is None:
+        step = int(np.median(positive)) if len(positive) else 0
+    else:
+        step = int(step_seconds * per_second)
+
+    gaps = missing = off_grid = largest = 0
+    largest_at = None
+    if step > 0 and len(positive):
+        # Nur die wenigen Abstände ungleich dem Raster genauer ansehen
+        irregular = positive[positive != step]
+        off_grid = int(np.count_nonzero(irregular % step))
+        gap_steps = irregular[irregular > step]
+        gaps = len(gap_steps)
+        if gaps:
+            missing = int((gap_steps // step - 1).sum())
+            at = int(np.argmax(steps))
+            largest = int(steps[at] // step - 1)
+            largest_at = pd.Timestamp(int(stamps[at]) * (1_000_000_000 // per_second), tz='UTC').isoformat()
+
+    o, h, l, c, v = (data[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close', 'Volume'))
+    body_high = np.maximum(o, c)
+    body_low = np.minimum(o, c)
+
+    report = {
+        'version': SCAN_VERSION,
+        'rows': len(data),
+        'start': data.index.min().isoformat() if len(data) else None,
+        'end': data.index.max().isoformat() if len(data) else None,
+        'step_seconds': step / per_second,
+        'unsorted': unsorted,
+        'duplicates': int(np.count_nonzero(steps == 0)),
+        'gaps': gaps,
+        'missing_bars': missing,
+        'largest_gap_bars': largest,
+        'largest_gap_at': largest_at,
+        'off_grid': off_grid,
+        'high_below_low': int(np.count_nonzero(h < l)),
+        'open_close_outside': int(np.count_nonzero((body_high > h) | (body_low < l))),
+        'nonpositive_prices': int(np.count_nonzero(np.minimum(body_low, l) <= 0)),
+        'negative_volume': int(np.count_nonzero(v < 0)),
+    }
+    report['ok'] = not any(report[key] for key in ISSUES)
+    return report
+
+
+def describe(report):
+    """Kurzfassung eines Urteils für die Konsole."""
+    if report['ok']:
+        return "keine Auffälligkeiten"
+    parts = []
+    for key, text in ISSUES.items():
+        if report[key]:
+            part = f"{report[key]} {text}"
+            if key == 'gaps':
+                part += (f" ({report['missing_bars']} fehlende Kerzen, größte: "
+                         f"{report['largest_gap_bars']} ab {report['largest_gap_at']})")
+            parts.append(part)
+    return ', '.join(parts)
+
+
+def repair_ohlcv(data, fill_gaps=False, step_seconds=None):
+    """
+    Sortiert den Index, entfernt doppelte Zeitstempel (letzte Zeile bleibt)
+    und füllt mit `fill_gaps=True` fehlende Kerzen im Raster `step_seconds`
+    (Standard: geschätzt wie in `scan_ohlcv`) mit flachen Kerzen auf dem
+    letzten Schlusskurs und Volumen 0 auf. Gibt einen neuen Frame zurück.
+    """
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index(kind='stable')
+    duplicated = data.index.duplicated(keep='last')
+    if duplicated.any():
+        data = data[~duplicated]
+    if not fill_gaps or len(data) < 2:
+        return data
+
+    if step_seconds is None:
+        step_seconds = scan_ohlcv(data)['step_seconds']
+    grid = pd.date_range(data.index[0], data.index[-1], freq=pd.Timedelta(seconds=step_seconds),
+                         unit=getattr(data.index, 'unit', 'ns'))
+    if len(grid) == len(data) and grid.equals(data.index):
+        return data
+    # Zeitstempel neben dem Raster bleiben erhalten
+    data = data.reindex(grid.union(data.index))
+    close = data['Close'].ffill()
+    for col in data.columns:
+        if col in ('Open', 'High', 'Low'):
+            data[col] = data[col].fillna(close)
+        elif col == 'Volume':
+            data[col] = data[col].fillna(0.0)
+        elif col != 'Close':
+            # Zusatzspalten wie 'Adj close' behalten ihren letzten Wert
+            data[col] = data[col].ffill()
+    data['Close'] = close
+    return data
+
+
+def scan_files(pattern, cache_dir=None):
+    """
+    Urteil für jede Datei aus `pattern` (glob-Muster oder Liste von Pfaden)
+    als DataFrame, eine Zeile pro Datei. Für Dateien mit Cache wird das
+    gespeicherte Urteil gelesen, ohne die Daten zu laden.
+    """
+    from project_goldengo.prepare_data import load_quality_report
+
+    files = sorted(glob.glob(pattern) if isinstance(pattern, str) else pattern)
+    rows = []
+    for file_path in files:
+        report = load_quality_report(file_path, cache_dir=cache_dir)
+        rows.append({'file': file_path, **(report or {'ok': None})})
+    return pd.DataFrame(rows)
@@ -0,0 +1,516 @@
+# grid.py
+"""
+Gitter-Optimierung in einem vektorisierten Durchlauf.
+
+`bt.optimize` startet für jede Parameterkombination einen eigenen Backtest.
+`evaluate_grid` rechnet stattdessen einen ganzen Block von Kombinationen auf
+einmal: Die Signal-Funktion liefert Matrizen (Kerzen × Kombinationen), alle
+Spalten werden gleichzeitig simuliert – jede Iteration der Hauptschleife
+bearbeitet den nächsten Trade *aller* Spalten per NumPy-Broadcasting – und die
+Kennzahlen werden spaltenweise berechnet. Die Ausführungslogik ist dieselbe
+wie in `vectorized.run_signals` und damit wie in backtesting.py.
+
+Das Ergebnis ist eine Heatmap wie bei `bt.optimize(..., return_heatmap=True)`.
+
+Beispiel:
+
+    def signals(data, n1, n2):
+        close = data['Close'].to_numpy()
+        fast = per_column(ema, n1, close)
+        slow = per_column(ema, n2, close)
+        return dict(entries=crossover(fast, slow), exits=crossover(slow, fast),
+                    start=warmup(fast, slow))
+
+    heatmap = evaluate_grid(data, signals, n1=range(10, 35, 5), n2=range(40, 75, 5),
+                            constraint=lambda p: p.n1 < p.n2,
+                            cash=100_000, commission=0.001)
+
+Die Signal-Funktion bekommt jeden Gitter-Parameter als Array mit einem Wert
+pro Spalte und gibt ein Dict zurück:
+
+- `entries` (Pflicht) / `exits`: bool-Matrizen, wie `self.buy()` bzw.
+  `self.position.close()` in `next()`
+- `sl` / `tp`: Preisniveaus, übernommen von der Signal-Kerze
+- `trail`: Trailing-Stop-Niveaus wie bei `run_signals`
+- `trail_exit`: Niveaus auf Schlusskursbasis; schließt eine Kerze unter dem
+  Maximum seit der Signal-Kerze, wird zur nächsten Kerze geschlossen
+  (wie ein nachgezogener Stop in `next()` mit `self.position.close()`)
+- `size`: Positionsgröße (Skalar oder je Spalte), überschreibt `size`
+- `stop_dist` + `risk_per_trade`: risikobasierte Größe
+  `Equity * risk_per_trade / stop_dist` (über 1 abgerundet auf ganze
+  Einheiten, darunter Anteil des Kapitals)
+- `start`: erste Kerze mit Signalen, siehe `warmup`
+
+Jeder Eintrag darf die Form (Kerzen,), (Kerzen, 1) oder (Kerzen, Spalten)
+haben und wird auf die volle Matrix gebroadcastet.
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.indicator_cache import cached_indicator
+from project_goldengo.vectorized import _SCAN_WINDOW, _order_units, _period_ends
+
+# Speicherbudget pro Block und grobe Bytes pro Matrixzelle (Signale + Equity)
+_BLOCK_BYTES = 512 * 1024 ** 2
+_BYTES_PER_CELL = 48
+
+# Kennzahlen, die evaluate_grid pro Kombination berechnet (Namen wie bei bt.run())
+STAT_KEYS = [
+    'Exposure Time [%]', 'Equity Final [$]', 'Equity Peak [$]', 'Commissions [$]',
+    'Return [%]', 'Buy & Hold Return [%]', 'Return (Ann.) [%]', 'Volatility (Ann.) [%]',
+    'CAGR [%]', 'Sharpe Ratio', 'Calmar Ratio', 'Max. Drawdown [%]', '# Trades',
+    'Win Rate [%]', 'Best Trade [%]', 'Worst Trade [%]', 'Avg. Trade [%]',
+    'Profit Factor', 'Expectancy [%]', 'SQN',
+]
+
+
+class _Params(dict):
+    """Parameter-Dict mit Attributzugriff, wie es `constraint` bei bt.optimize bekommt."""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def per_column(func, values, *args, **kwargs):
+    """
+    Berechnet `func(*args, value, **kwargs)` für jeden *unterschiedlichen*
+    Wert in `values` genau einmal und gibt eine Matrix (Kerzen × len(values))
+    zurück. Ein Skalar ergibt eine Spalte, die sich gegen die anderen
+    Matrizen broadcasten lässt. Die Ergebnisse laufen über `INDICATOR_CACHE`,
+    folgende Blöcke bekommen sie also aus dem Speicher.
+    """
+    values = np.atleast_1d(values)
+    unique, inverse = np.unique(values, return_inverse=True)
+    func = cached_indicator(func, memo={})
+    columns = np.column_stack([np.asarray(func(*args, value.item(), **kwargs), dtype=float)
+                               for value in unique])
+    return columns[:, inverse]
+
+
+def warmup(*indicators):
+    """
+    Erste handelbare Kerze je Spalte, wie backtesting.py sie bestimmt:
+    1 + die späteste erste Nicht-NaN-Position aller Indikatoren.
+    """
+    start = 1
+    for values in indicators:
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 1:
+            values = values[:, None]
+        start = np.maximum(start, 1 + np.isnan(values).argmin(axis=0))
+    return start
+
+
+def _matrix(value, n, k, dtype=float):
+    if value is None:
+        return None
+    value = np.asarray(value, dtype=dtype)
+    if value.ndim == 1 and len(value) == n:
+        value = value[:, None]
+    return np.broadcast_to(value, (n, k))
+
+
+def _signal_keys(mask, n, start=None):
+    """Sortierte Schlüssel `Spalte * n + Kerze` aller True-Werte."""
+    keys = np.flatnonzero(np.ascontiguousarray(mask.T))
+    if start is not None:
+        keys = keys[keys % n >= start[keys // n]]
+    return keys
+
+
+def _next_signal(keys, n, cols, pos):
+    """Erste Signal-Kerze >= `pos` je Spalte, `n` wenn es keine mehr gibt."""
+    query = cols * n + np.minimum(pos, n)
+    j = np.searchsorted(keys, query)
+    found = keys[np.minimum(j, len(keys) - 1)] if len(keys) else np.full(len(cols), -1)
+    ok = (j < len(keys)) & (found < (cols + 1) * n)
+    return np.where(ok, found - cols * n, n)
+
+
+def _scan_exits(cols, i, f, end, entry_bar, stop0, tp_level, trail, trail_exit, market, trade_on_close):
+    """
+    Sucht für alle Trades gleichzeitig die erste Kerze in [f, end), auf der
+    ein Signal-Exit (`trail_exit`), SL/Trailing-Stop oder TP greift – in dieser
+    Reihenfolge, wie bei `vectorized._find_exit`. Das Suchfenster verdoppelt
+    sich pro Runde. Gibt (Kerze, Preis, ExitBar) zurück, Kerze = -1 wenn nichts.
+    """
+    open_, high, low, close = market['Open'], market['High'], market['Low'], market['Close']
+    n = len(close)
+    count = len(cols)
+    exit_at = np.full(count, -1)
+    exit_price = np.full(count, np.nan)
+    exit_bar = np.full(count, -1)
+    lo = f.copy()
+    carry_trail = np.full(count, -np.inf)
+    carry_level = np.full(count, -np.inf)
+    todo = np.flatnonzero(lo < end)
+    width = _SCAN_WINDOW
+
+    while todo.size:
+        bars = lo[todo, None] + np.arange(width)
+        inside = bars < end[todo, None]
+        bars = np.minimum(bars, n - 1)
+        prev = bars - 1
+        c = cols[todo, None]
+
+        stop = np.broadcast_to(stop0[todo, None], bars.shape)
+        if trail is not None:
+            # Trailing-Stop für Kerze j = Maximum von trail[entry_bar .. j-1]
+            cand = np.where(prev >= entry_bar[todo, None], trail[np.maximum(prev, 0), c], -np.inf)
+            cand = np.maximum.accumulate(np.maximum(cand, carry_trail[todo, None]), axis=1)
+            carry_trail[todo] = cand[:, -1]
+            stop = np.fmax(stop, cand)
+
+        with np.errstate(invalid='ignore'):
+            stop_hit = inside & (low[bars] <= stop)
+            tp_hit = inside & (high[bars] >= tp_level[todo, None])
+            if trail_exit is not None:
+                # Niveau = Maximum seit der Signal-Kerze, Auslöser auf Kerze j-1 >= f
+                level = np.where(prev >= i[todo, None], trail_exit[np.maximum(prev, 0), c], -np.inf)
+                level = np.fmax.accumulate(np.fmax(level, carry_level[todo, None]), axis=1)
+                carry_level[todo] = level[:, -1]
+                sig_hit = inside & (prev >= f[todo, None]) & (close[prev] < level)
+            else:
+                sig_hit = np.zeros_like(inside)
+
+        hits = sig_hit | stop_hit | tp_hit
+        found = hits.any(axis=1)
+        rows = np.flatnonzero(found)
+        if rows.size:
+            first = hits[rows].argmax(axis=1)
+            t = todo[rows]
+            j = bars[rows, first]
+            is_sig = sig_hit[rows, first]
+            is_stop = stop_hit[rows, first]
+            sig_price = close[j - 1] if trade_on_close else open_[j]
+            exit_price[t] = np.where(is_sig, sig_price,
+                                     np.where(is_stop, np.minimum(open_[j], stop[rows, first]),
+                                              np.maximum(open_[j], tp_level[t])))
+            exit_at[t] = j
+            exit_bar[t] = np.where(is_sig & trade_on_close, j - 1, j)
+
+        lo[todo] += width
+        todo = todo[~found & (lo[todo] < end[todo])]
+        width *= 2
+
+    return exit_at, exit_price, exit_bar
+
+
+def _simulate_block(signals, market, k, cash, commission, size, trade_on_close):
+    """
+    Simuliert `k` Spalten gleichzeitig. Gibt die Equity-Matrix (Kerzen × k),
+    die Trades als Dict von Arrays und die Startkerzen zurück.
+    """
+    close, open_ = market['Close'], market['Open']
+    n = len(close)
+
+    start = np.broadcast_to(np.asarray(signals.get('start', 1), dtype=np.int64), (k,))
+    entry_keys = _signal_keys(_matrix(signals['entries'], n, k, bool), n, start)
+    exits = _matrix(signals.get('exits'), n, k, bool)
+    exit_keys = _signal_keys(exits, n) if exits is not None else np.empty(0, dtype=np.int64)
+    sl = _matrix(signals.get('sl'), n, k)
+    tp = _matrix(signals.get('tp'), n, k)
+    trail = _matrix(signals.get('trail'), n, k)
+    trail_exit = _matrix(signals.get('trail_exit'), n, k)
+    stop_dist = _matrix(signals.get('stop_dist'), n, k)
+    risk_per_trade = signals.get('risk_per_trade')
+    sizes = np.broadcast_to(np.asarray(signals.get('size', size), dtype=float), (k,))
+
+    balance = np.full(k, float(cash))
+    pos = start.copy()
+    active = np.arange(k)
+    trades = {name: [] for name in ('col', 'entry_bar', 'exit_bar', 'size', 'entry_price',
+                                    'exit_price', 'pnl', 'commission')}
+    # Equity-Ereignisse: ab der Kerze des Ereignisses gilt Equity = B + U * (Close - P)
+    # (Spalte, Kerze, B, U, P) als Listen von Arrays, Startwert auf Kerze 0
+    events = ([np.arange(k)], [np.zeros(k, dtype=np.int64)], [balance.copy()], [np.zeros(k)], [np.zeros(k)])
+
+    while active.size:
+        i = _next_signal(entry_keys, n, active, pos[active])
+        ok = i + 1 < n
+        active, i = active[ok], i[ok]
+        if not active.size:
+            break
+        f = i + 1
+        price = close[i] if trade_on_close else open_[f]
+        bal = balance[active]
+
+        if stop_dist is not None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dist = stop_dist[i, active]
+                order_size = bal * risk_per_trade / dist
+                order_size = np.where(order_size > 1, np.trunc(order_size), order_size)
+                order_size = np.where(dist > 0, order_size, 0)
+        else:
+            order_size = sizes[active]
+        units = _order_units(bal, price, order_size, commission)
+
+        # Order verworfen: ab der nächsten Kerze weitersuchen
+        skipped = units <= 0
+        pos[active[skipped]] = i[skipped] + 1
+        go = ~skipped
+        c, i, f, price, units, bal = active[go], i[go], f[go], price[go], units[go], bal[go]
+        if not c.size:
+            continue
+        entry_bar = i if trade_on_close else f
+
+        # Signal-Exit: erstes Exit-Signal ab der Ausführungskerze, wirkt eine Kerze später
+        sig_bar = _next_signal(exit_keys, n, c, f) + 1
+        end = np.minimum(sig_bar, n)
+        stop0 = sl[i, c] if sl is not None else np.full(len(c), np.nan)
+        tp_level = tp[i, c] if tp is not None else np.full(len(c), np.nan)
+        exit_at, exit_price, exit_bar = _scan_exits(c, i, f, end, entry_bar, stop0, tp_level,
+                                                    trail, trail_exit, market, trade_on_close)
+        use_sig = (exit_at < 0) & (sig_bar < n)
+        s = sig_bar[use_sig]
+        exit_at[use_sig] = s
+        exit_price[use_sig] = close[s - 1] if trade_on_close else open_[s]
+        exit_bar[use_sig] = s - 1 if trade_on_close else s
+
+        bal = bal - units * price * commission
+        closed = exit_at >= 0
+        # Einstieg (entfällt, wenn der Trade auf derselben Kerze wieder endet)
+        entered = ~closed | (exit_at != f)
+        for store, values in zip(events, (c[entered], f[entered], bal[entered], units[entered], price[entered])):
+            store.append(values)
+
+        c, units, price, bal = c[closed], units[closed], price[closed], bal[closed]
+        exit_at, exit_price = exit_at[closed], exit_price[closed]
+        commissions = units * (price + exit_price) * commission
+        new_balance = bal + (units * (exit_price - price) - units * exit_price * commission)
+        for store, values in zip(events, (c, exit_at, new_balance, np.zeros(len(c)), np.zeros(len(c)))):
+            store.append(values)
+        for name, values in (('col', c), ('entry_bar', entry_bar[closed]), ('exit_bar', exit_bar[closed]),
+                             ('size', units), ('entry_price', price), ('exit_price', exit_price),
+                             ('pnl', units * (exit_price - price) - commissions), ('commission', commissions)):
+            trades[name].append(values)
+
+        balance[c] = new_balance
+        pos[c] = exit_at
+        active = np.sort(np.concatenate((active[skipped], c)))
+
+    equity = _build_equity(events, n, k, close)
+    trades = {name: np.concatenate(values) if values else np.empty(0) for name, values in trades.items()}
+    return equity, trades, start
+
+
+def _build_equity(events, n, k, close):
+    """Setzt die Equity-Matrix aus den Ereignissen zusammen (stückweise konstant + offene Position)."""
+    cols, bars, b, u, p = (np.concatenate(values) for values in events)
+    order = np.lexsort((bars, cols))
+    cols, bars, b, u, p = cols[order], bars[order], b[order], u[order], p[order]
+
+    # Pro Zelle die Nummer des letzten Ereignisses, dann vorwärts auffüllen
+    event_id = np.full((n, k), -1, dtype=np.int64)
+    event_id[bars, cols] = np.arange(len(cols))
+    np.maximum.accumulate(event_id, axis=0, out=event_id)
+    equity = b[event_id]
+    equity += u[event_id] * (close[:, None] - p[event_id])
+    return equity
+
+
+def _geometric_mean_columns(returns, counts, cols=None, k=None):
+    """
+    Spaltenweise Version von `vectorized._geometric_mean`. `returns` ist
+    entweder eine Matrix (Zeilen × Spalten) oder, mit `cols`, ein flaches Array.
+    """
+    returns = np.nan_to_num(returns) + 1
+    positive = returns > 0
+    logs = np.log(np.where(positive, returns, 1))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if cols is None:
+            all_positive = positive.all(axis=0)
+            mean_log = logs.sum(axis=0) / counts
+        else:
+            all_positive = np.bincount(cols, ~positive, minlength=k) == 0
+            mean_log = np.bincount(cols, logs, minlength=k) / counts
+    return np.where(counts == 0, np.nan, np.where(all_positive, np.exp(mean_log) - 1, 0))
+
+
+def _block_stats(equity, trades, start, index, close):
+    """Kennzahlen pro Spalte mit denselben Formeln wie `vectorized.compute_stats`."""
+    n, k = equity.shape
+    s = {}
+
+    col = trades['col'].astype(np.int64)
+    pl = trades['pnl']
+    returns = pl / (trades['size'] * trades['entry_price'])
+    n_trades = np.bincount(col, minlength=k)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Exposure: Kerzen mit Position, Überschneidung Exit/Entry auf derselben Kerze nur einmal
+        order = np.lexsort((trades['entry_bar'], col))
+        c_sorted = col[order]
+        touching = (c_sorted[1:] == c_sorted[:-1]) & (trades['entry_bar'][order][1:] == trades['exit_bar'][order][:-1])
+        bars_held = (np.bincount(col, trades['exit_bar'] - trades['entry_bar'] + 1, minlength=k)
+                     - np.bincount(c_sorted[1:][touching], minlength=k))
+        s['Exposure Time [%]'] = bars_held / n * 100
+
+        s['Equity Final [$]'] = equity[-1]
+        s['Equity Peak [$]'] = equity.max(axis=0)
+        s['Commissions [$]'] = np.where(n_trades > 0, np.bincount(col, trades['commission'], minlength=k), np.nan)
+        s['Return [%]'] = (equity[-1] - equity[0]) / equity[0] * 100
+        first = start - 1
+        s['Buy & Hold Return [%]'] = (close[-1] - close[first]) / close[first] * 100
+
+        gmean_day_return = np.zeros(k)
+        day_var = np.full(k, np.nan)
+        period_ends, annual_trading_days = _period_ends(index)
+        if period_ends is not None:
+            day_equity = equity[period_ends]
+            day_returns = day_equity[1:] / day_equity[:-1] - 1
+            gmean_day_return = _geometric_mean_columns(day_returns, np.full(k, len(day_returns)))
+            if len(day_returns) > 1:
+                day_var = day_returns.var(axis=0, ddof=1)
+
+        annualized_return = (1 + gmean_day_return) ** annual_trading_days - 1
+        s['Return (Ann.) [%]'] = annualized_return * 100
+        s['Volatility (Ann.) [%]'] = np.sqrt(
+            (day_var + (1 + gmean_day_return) ** 2) ** annual_trading_days
+            - (1 + gmean_day_return) ** (2 * annual_trading_days)) * 100
+        if isinstance(index, pd.DatetimeIndex):
+            duration = index[-1] - index[0]
+            time_in_years = (duration.days + duration.seconds / 86400) / 365.25
+            s['CAGR [%]'] = ((equity[-1] / equity[0]) ** (1 / time_in_years) - 1) * 100 if time_in_years else np.nan
+        else:
+            s['CAGR [%]'] = np.full(k, np.nan)
+        vol = s['Volatility (Ann.) [%]']
+        s['Sharpe Ratio'] = s['Return (Ann.) [%]'] / np.where(vol == 0, np.nan, vol)
+
+        max_dd = -np.nan_to_num((1 - equity / np.maximum.accumulate(equity, axis=0)).max(axis=0))
+        s['Calmar Ratio'] = annualized_return / np.where(max_dd == 0, np.nan, -max_dd)
+        s['Max. Drawdown [%]'] = max_dd * 100
+
+        s['# Trades'] = n_trades
+        s['Win Rate [%]'] = np.bincount(col, pl > 0, minlength=k) / np.where(n_trades, n_trades, np.nan) * 100
+        best = np.full(k, -np.inf)
+        worst = np.full(k, np.inf)
+        np.maximum.at(best, col, returns)
+        np.minimum.at(worst, col, returns)
+        s['Best Trade [%]'] = np.where(n_trades > 0, best, np.nan) * 100
+        s['Worst Trade [%]'] = np.where(n_trades > 0, worst, np.nan) * 100
+        s['Avg. Trade [%]'] = _geometric_mean_columns(returns, n_trades, col, k) * 100
+        gains = np.bincount(col, np.where(returns > 0, returns, 0), minlength=k)
+        losses = np.abs(np.bincount(col, np.where(returns < 0, returns, 0), minlength=k))
+        s['Profit Factor'] = gains / np.where(losses == 0, np.nan, losses)
+        s['Expectancy [%]'] = np.bincount(col, returns, minlength=k) / n_trades * 100
+        mean_pl = np.bincount(col, pl, minlength=k) / n_trades
+        std_pl = np.sqrt(np.bincount(col, (pl - mean_pl[col]) ** 2, minlength=k) / (n_trades - 1))
+        s['SQN'] = np.sqrt(n_trades) * mean_pl / np.where(std_pl == 0, np.nan, std_pl)
+
+    return pd.DataFrame(s, columns=STAT_KEYS)
+
+
+def _values(value):
+    """Gitterwerte eines Parameters (Skalar oder Iterable), wie bei bt.optimize."""
+    if isinstance(value, (str, bytes)) or not np.iterable(value):
+        return (value,)
+    return tuple(value)
+
+
+def _maximize_key(maximize):
+    """Prüft `maximize` und gibt den Kennzahl-Namen zurück (None bei einer Funktion)."""
+    if isinstance(maximize, str):
+        if maximize not in STAT_KEYS:
+            raise ValueError(f"`maximize` muss eine dieser Kennzahlen sein: {STAT_KEYS}")
+        return maximize
+    if callable(maximize):
+        return None
+    raise TypeError("`maximize` muss ein Kennzahl-Name oder eine Funktion sein.")
+
+
+def parameter_grid(constraint=None, **params):
+    """
+    Alle zulässigen Kombinationen von `params` in der Reihenfolge von
+    bt.optimize, als Liste von Dicts mit Attributzugriff.
+    """
+    if not params:
+        raise ValueError("Keine Parameter für das Gitter angegeben.")
+    names = list(params)
+    combos = [combo for combo in (_Params(zip(names, values))
+                                  for values in product(*(_values(v) for v in params.values())))
+              if constraint is None or constraint(combo)]
+    if not combos:
+        raise ValueError("Keine zulässigen Parameterkombinationen.")
+    return combos
+
+
+def evaluate_combos(data, signal_func, combos, cash=10_000, commission=0.0,
+                    size=1 - np.finfo(float).eps, trade_on_close=False, block_size=None,
+                    on_block=None):
+    """
+    Rechnet die Kombinationen `combos` (Dicts mit gleichen Schlüsseln) in
+    Blöcken von `block_size` Spalten und gibt alle Kennzahlen als DataFrame
+    mit MultiIndex der Parameter zurück, eine Zeile pro Kombination.
+    `on_block(block, stats)` wird nach jedem fertigen Block aufgerufen
+    (z.B. zum Speichern, siehe `ResultStore`).
+    """
+    names = list(combos[0])
+    n = len(data)
+    block_size = block_size or max(1, _BLOCK_BYTES // (n * _BYTES_PER_CELL))
+    market = {col: data[col].to_numpy(dtype=float) for col in ('Open', 'High', 'Low', 'Close')}
+
+    frames = []
+    for lo in range(0, len(combos), block_size):
+        block = combos[lo:lo + block_size]
+        arrays = {name: np.array([combo[name] for combo in block]) for name in names}
+        signals = signal_func(data, **arrays)
+        equity, trades, start = _simulate_block(signals, market, len(block), cash, commission,
+                                                size, trade_on_close)
+        del signals
+        frames.append(_block_stats(equity, trades, start, data.index, market['Close']))
+        if on_block is not None:
+            on_block(block, frames[-1])
+
+    stats = pd.concat(frames, ignore_index=True)
+    stats.index = pd.MultiIndex.from_tuples([tuple(combo[name] for name in names) for combo in combos],
+                                            names=names)
+    return stats
+
+
+def heatmap_from_stats(stats, maximize='Equity Final [$]'):
+    """Heatmap aus den Kennzahlen von `evaluate_combos`, NaN für Kombinationen ohne Trade."""
+    maximize_key = _maximize_key(maximize)
+    if maximize_key is not None:
+        values = stats[maximize_key]
+    else:
+        values = stats.apply(maximize, axis=1)
+    return values.where(stats['# Trades'] > 0).astype(float).rename(maximize_key)
+
+
+def evaluate_grid(data, signal_func, maximize='Equity Final [$]', constraint=None,
+                  cash=10_000, commission=0.0, size=1 - np.finfo(float).eps,
+                  trade_on_close=False, block_size=None, return_stats=False, **params):
+    """
+    Bewertet alle Kombinationen von `params` (wie bei `bt.optimize`) in
+    Blöcken von `block_size` Spalten und gibt die Heatmap zurück:
+    pd.Series mit MultiIndex der Parameter, Name = `maximize`, NaN für
+    Kombinationen ohne Trade.
+
+    - `maximize`: Kennzahl aus `STAT_KEYS` oder Funktion, die die
+      Kennzahlen einer Kombination (pd.Series) bekommt
+    - `constraint`: Funktion, die die Parameter (mit Attributzugriff)
+      bekommt und zulässige Kombinationen mit True markiert
+    - `cash`, `commission`, `size`, `trade_on_close`: wie bei `run_signals`
+    - `block_size`: Spalten pro Block; Standard richtet sich nach der Länge
+      der Daten (ca. 512 MB pro Block)
+    - `return_stats=True`: zusätzlich alle Kennzahlen als DataFrame
+
+    Nur einen Teil der Kombinationen rechnen (Zufallssuche, Successive
+    Halving, modellbasiert): siehe `project_goldengo.optimizer`.
+    """
+    _maximize_key(maximize)
+    combos = parameter_grid(constraint, **params)
+    stats = evaluate_combos(data, signal_func, combos, cash=cash, commission=commission, size=size,
+                            trade_on_close=trade_on_close, block_size=block_size)
+    heatmap = heatmap_from_stats(stats, maximize)
+
+    if return_stats:
+        return heatmap, stats
+    return heatmap
@@ -0,0 +1,205 @@
+# indicator_cache.py
+"""
+Zwischenspeicher für `self.I(...)`-Indikatoren über mehrere Backtest-Läufe.
+
+Bei `bt.optimize` wird `Strategy.init` für jede Parameterkombination neu
+aufgerufen. Die meisten Indikatoren hängen aber nur von einem Teil der
+Parameter ab (z.B. EMA 200, OBV oder ATR in DynamicMomentumCrossover).
+`CachedStrategy` merkt sich deshalb jedes Indikator-Ergebnis unter dem
+Schlüssel (Funktion, Fingerabdruck der Daten, Parameter) und liefert es beim
+nächsten Lauf mit denselben Eingaben direkt aus dem Speicher.
+
+Der Cache lebt pro Prozess (jeder Optimierungs-Worker hat seinen eigenen)
+und ist per LRU auf `max_bytes` begrenzt.
+"""
+
+import functools
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class _Uncacheable(Exception):
+    """Ein Argument lässt sich nicht zuverlässig in einen Schlüssel umwandeln."""
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=False)))
+    if isinstance(value, tuple):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _copy(value):
+    """Kopie des gespeicherten Ergebnisses, damit Strategien den Cache nicht verändern."""
+    if isinstance(value, tuple):
+        return tuple(_copy(v) for v in value)
+    if hasattr(value, 'copy'):
+        return value.copy()
+    return value
+
+
+class IndicatorCache:
+    """LRU-Cache für Indikator-Ergebnisse mit Obergrenze in Bytes."""
+
+    def __init__(self, max_bytes=512 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key):
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return self._entries[key][0]
+
+    def put(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, old_size) = self._entries.popitem(last=False)
+            self._bytes -= old_size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+
+# Gemeinsamer Cache für alle Läufe in diesem Prozess
+INDICATOR_CACHE = IndicatorCache()
+
+
+def _array_fingerprint(arr):
+    arr = np.ascontiguousarray(arr)
+    if arr.dtype == object:
+        raise _Uncacheable
+    return ('array', arr.dtype.str, arr.shape, hashlib.sha1(memoryview(arr).cast('B')).hexdigest())
+
+
+def fingerprint(value, memo=None):
+    """
+    Wandelt ein Indikator-Argument in einen hashbaren Schlüssel um. Arrays
+    werden über ihren Inhalt gehasht. `memo` (Dict) verhindert, dass dasselbe
+    Array-Objekt innerhalb eines `init` mehrfach gehasht wird.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return (type(value).__name__, value)
+    if isinstance(value, (np.ndarray, pd.Series, pd.DataFrame)):
+        if memo is not None and id(value) in memo:
+            return memo[id(value)][1]
+        if isinstance(value, pd.DataFrame):
+            key = ('frame', tuple(value.columns), _array_fingerprint(value.to_numpy()))
+        else:
+            key = _array_fingerprint(np.asarray(value))
+        if memo is not None:
+            # Das Objekt wird mit abgelegt, damit seine id() nicht neu vergeben wird
+            memo[id(value)] = (value, key)
+        return key
+    if isinstance(value, np.generic):
+        return (type(value).__name__, value.item())
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__, tuple(fingerprint(v, memo) for v in value))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted((k, fingerprint(v, memo)) for k, v in value.items())))
+    if callable(value):
+        return function_key(value, memo)
+    raise _Uncacheable
+
+
+def function_key(func, memo=None):
+    """
+    Schlüssel für eine Indikator-Funktion. Bei Lambdas und inneren Funktionen
+    gehören auch Default-Werte und Closure-Variablen dazu (z.B. `span` beim
+    ATR-Lambda in DynamicMomentumCrossover).
+    """
+    if isinstance(func, functools.partial):
+        return ('partial', function_key(func.func, memo),
+                fingerprint(func.args, memo), fingerprint(func.keywords, memo))
+    code = getattr(func, '__code__', None)
+    if code is None:
+        # Builtins, NumPy-ufuncs usw.
+        try:
+            hash(func)
+        except TypeError:
+            raise _Uncacheable
+        return ('callable', func)
+    if getattr(func, '__self__', None) is not None:
+        # Gebundene Methoden hängen vom Zustand ihres Objekts ab
+        raise _Uncacheable
+    closure = tuple(fingerprint(cell.cell_contents, memo) for cell in (func.__closure__ or ()))
+    return ('function', func.__module__, func.__qualname__, code,
+            fingerprint(func.__defaults__, memo), fingerprint(func.__kwdefaults__, memo), closure)
+
+
+def cached_indicator(func, cache=None, memo=None):
+    """
+    Hüllt `func` so ein, dass Ergebnisse im `cache` (Standard:
+    `INDICATOR_CACHE`) wiederverwendet werden. Lässt sich ein Argument nicht
+    als Schlüssel darstellen, wird `func` einfach normal aufgerufen.
+    """
+    cache = INDICATOR_CACHE if cache is None else cache
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            key = (function_key(func, memo), fingerprint(args, memo), fingerprint(kwargs, memo))
+        except _Uncacheable:
+            return func(*args, **kwargs)
+
+        value = cache.get(key)
+        if value is None:
+            value = func(*args, **kwargs)
+            cache.put(key, value)
+        return _copy(value)
+
+    return wrapper
+
+
+def _make_cached_strategy():
+    from backtesting import Strategy
+
+    class CachedStrategy(Strategy):
+        """
+        Basisklasse für Strategien, deren `self.I(...)`-Aufrufe über
+        `INDICATOR_CACHE` laufen. Sonst verhält sie sich wie `Strategy`.
+        """
+
+        def I(self, func, *args, **kwargs):  # noqa: E743
+            memo = self.__dict__.setdefault('_fingerprint_memo', {})
+            return super().I(cached_indicator(func, memo=memo), *args, **kwargs)
+
+    CachedStrategy.__module__ = __name__
+    CachedStrategy.__qualname__ = 'CachedStrategy'
+    return CachedStrategy
+
+
+def __getattr__(name):
+    # backtesting (und damit Bokeh) wird erst geladen, wenn jemand CachedStrategy
+    # braucht; Worker, die nur Indikatoren cachen, sparen sich den Import
+    if name == 'CachedStrategy':
+        globals()[name] = _make_cached_strategy()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,108 @@
+# indicators.py
+"""
+Vektorisierte Indikatoren für die backtesting.py-Strategien.
+
+Alle Funktionen nehmen Array-ähnliche Eingaben (NumPy, `self.data.Close`,
+pd.Series) und geben NumPy-Arrays gleicher Länge zurück, können also direkt
+mit `self.I(...)` verwendet werden. Rekursive Glättungen (EMA, Wilder) laufen
+über `scipy.signal.lfilter`, ohne SciPy über `pandas.ewm` – beides in C.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+
+def _smooth(x, alpha, y0):
+    """
+    Exponentielle Glättung y[i] = alpha * x[i] + (1 - alpha) * y[i-1] für
+    i >= 1 mit Startwert y[0] = y0. `x[0]` wird ignoriert.
+    """
+    out = np.empty(len(x), dtype=float)
+    if len(x) == 0:
+        return out
+    out[0] = y0
+    if len(x) > 1:
+        if lfilter is not None:
+            out[1:], _ = lfilter([alpha], [1.0, -(1.0 - alpha)], x[1:], zi=[(1.0 - alpha) * y0])
+        else:
+            seeded = np.concatenate(([y0], x[1:]))
+            out[1:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+    return out
+
+
+def ema(arr, span):
+    """Exponentieller gleitender Durchschnitt, Startwert ist der erste Kurs."""
+    arr = np.asarray(arr, dtype=float)
+    if len(arr) == 0:
+        return arr.copy()
+    alpha = 2 / (span + 1)
+    return _smooth(arr, alpha, arr[0])
+
+
+def sma(arr, period):
+    """Einfacher gleitender Durchschnitt über die kumulierte Summe (NaN in der Aufwärmphase)."""
+    arr = np.asarray(arr, dtype=float)
+    sma_arr = np.full_like(arr, np.nan)
+    if len(arr) < period:
+        return sma_arr
+    cumsum = np.cumsum(arr)
+    sma_arr[period - 1:] = (cumsum[period - 1:] - np.concatenate(([0.0], cumsum[:-period]))) / period
+    return sma_arr
+
+
+def rsi(arr, period):
+    """RSI mit Wilder-Glättung. Die ersten `period` Werte sind NaN."""
+    arr = np.asarray(arr, dtype=float)
+    out = np.full_like(arr, np.nan)
+    if len(arr) <= period:
+        return out
+
+    delta = np.diff(arr, prepend=arr[0])
+    gains = np.where(delta > 0, delta, 0)
+    losses = np.where(delta < 0, -delta, 0)
+
+    # Start mit dem Mittelwert der ersten `period` Änderungen, danach Wilder-Glättung
+    avg_gain = _smooth(gains[period:], 1 / period, np.mean(gains[1:period + 1]))
+    avg_loss = _smooth(losses[period:], 1 / period, np.mean(losses[1:period + 1]))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = avg_gain / avg_loss
+        out[period:] = 100 - (100 / (1 + rs))
+    return out
+
+
+def obv(close, volume):
+    """On-Balance-Volume: kumulierte Summe des Volumens mit dem Vorzeichen der Kursänderung."""
+    close = np.asarray(close, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    out = np.zeros_like(close)
+    if len(close) > 1:
+        out[1:] = np.cumsum(np.sign(np.diff(close)) * volume[1:])
+    return out
+
+
+def true_range(high, low, close):
+    """True Range: max(High - Low, |High - Close[-1]|, |Low - Close[-1]|)."""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    tr = high - low
+    if len(close) > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum(tr[1:], np.maximum(np.abs(high[1:] - prev_close),
+                                               np.abs(low[1:] - prev_close)))
+    return tr
+
+
+def atr(high, low, close, period=14):
+    """Average True Range nach Wilder. Die ersten `period - 1` Werte sind NaN."""
+    tr = true_range(high, low, close)
+    out = np.full_like(tr, np.nan)
+    if len(tr) < period:
+        return out
+    out[period - 1:] = _smooth(tr[period - 1:], 1 / period, np.mean(tr[:period]))
+    return out
@@ -1,9 +1,15 @@
-import yfinance as yf
+import argparse
 from datetime import datetime
 import os
+import shutil
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from binance.client import Client
+
+from project_goldengo.ohlcv_store import append_to_store, store_path_for
+from project_goldengo.resample import resample_to_csv
 
 # --- Konfiguration ---
 TICKERS_YFINANCE = [
@@ -27,101 +33,426 @@ TICKERS_BINANCE = [
 
 
 
-INTERVALS = ["15m", "5m"]
+# Von Binance wird nur das feinste Intervall geladen, gröbere werden daraus abgeleitet
+INTERVALS = ["5m"]
+DERIVED_INTERVALS = ["15m"]
 
 START_DATE_2020 = "2020-01-01"
-# Wir setzen das Enddatum auf heute, um die aktuellsten Daten zu erhalten
-END_DATE_TODAY = datetime.now()
 DATA_DIR = "crypto_data"
 
-binance_client = Client()
-
-# --- HELFERFUNKTION FÜR BINANCE-DOWNLOAD ---
-def download_binance_data(symbol, interval, start_str, end_dt):
-    """Lädt historische Daten von Binance in Stücken (Chunks) herunter."""
-    print(f"  Binance: Lade '{symbol}' mit Intervall '{interval}'...")
-
-    try: 
-        # Lade die Daten in einer Schleife, da Binance pro Anfrage limitiert ist
-        klines = binance_client.get_historical_klines(
-            symbol=symbol,
-            interval=interval,
-            start_str=start_str,
-            end_str=end_dt.strftime("%d %b, %Y %H:%M:%S")
-        )
-        if not klines:
-            print(f"  ⚠️ Keine Daten von Binance für {symbol} erhalten.")
+# Binance liefert höchstens 1000 Kerzen pro Anfrage. Nach jedem Block wird
+# an die CSV-Datei angehängt, sie dient damit gleichzeitig als Checkpoint.
+KLINE_CHUNK_SIZE = 1000
+
+# Request-Gewicht einer Kline-Anfrage (limit=1000) und unser Budget pro Minute.
+# Binance erlaubt 6000 pro Minute und IP, wir bleiben bewusst deutlich darunter.
+KLINE_REQUEST_WEIGHT = 2
+WEIGHT_PER_MINUTE = 2400
+
+# Spalten der Übersicht von `download_all` (auch ohne Aufträge)
+SUMMARY_COLUMNS = ['symbol', 'interval', 'rows', 'seconds', 'rows/s', 'attempts', 'status']
+
+INTERVAL_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+binance_client = None
+
+
+def get_binance_client():
+    """Erzeugt den Binance-Client erst bei der ersten Verwendung."""
+    global binance_client
+    if binance_client is None:
+        # python-binance erst hier importieren: der Import (und Client()) kostet Sekunden
+        from binance.client import Client
+        binance_client = Client()
+    return binance_client
+
+def interval_to_ms(interval):
+    """Wandelt ein Binance-Intervall wie '5m' oder '1h' in Millisekunden um."""
+    return int(interval[:-1]) * INTERVAL_MS[interval[-1]]
+
+
+def read_last_timestamp(filepath):
+    """
+    Liest den Zeitstempel der letzten gespeicherten Kerze, ohne die ganze
+    CSV-Datei zu laden (es wird nur das Dateiende gelesen). Eine unvollständige
+    letzte Zeile (z.B. nach einem Abbruch) wird dabei abgeschnitten.
+
+    Gibt `None` zurück, wenn die Datei fehlt oder noch keine Kerzen enthält.
+    """
+    if not os.path.exists(filepath):
+        return None
+
+    with open(filepath, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
             return None
-        
-        # Konvertiere die Rohdaten in einen sauberen Pandas DataFrame
-        df = pd.DataFrame(klines, columns=[
-            'Date', 'Open', 'High', 'Low', 'Close', 'Volume', 
-            'CloseTime', 'QuoteAssetVolume', 'NumberofTrades', 
-            'TakerBuyBaseAssetVolume', 'TakerBuyQuoteAssetVolume', 'Ignore'
-        ])
-
-        # Wichtige Spalten auswählen und Datentypen konvertieren
-        df = df[['Date', 'Open', 'High', 'Low', 'Close', 'Volume']]
-        df['Date'] = pd.to_datetime(df['Date'], unit='ms', utc=True)
-        for col in df.columns[1:]:
-            df[col] = pd.to_numeric(df[col])
-        
-        df.set_index('Date', inplace=True)
-        return df
-    
-    except:
-        print(f" ❌ FEHLER bei Binance-Download für {symbol}: {e}")
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+
+        # Abgebrochene Schreibvorgänge hinterlassen eine Zeile ohne Zeilenende
+        if not tail.endswith(b"\n"):
+            cut = tail.rfind(b"\n")
+            f.truncate(size - len(tail) + cut + 1 if cut >= 0 else 0)
+            tail = tail[:cut + 1] if cut >= 0 else b""
+
+    lines = tail.decode('utf-8').strip().splitlines()
+    if not lines:
+        return None
+    first_field = lines[-1].split(',')[0]
+    if first_field == 'Date':
         return None
-    
-print("Starte den hybriden Download von Kryptodaten...")
-os.makedirs(DATA_DIR, exist_ok=True)
+    return pd.Timestamp(first_field)
+
+
+def klines_to_frame(klines):
+    """
+    Wandelt eine Seite roher Klines direkt in typisierte NumPy-Spalten um und
+    behält nur Date/OHLCV. Es entsteht kein Zwischen-Frame aus Strings.
+    """
+    dates = np.fromiter((k[0] for k in klines), dtype=np.int64, count=len(klines))
+    values = np.array([k[1:6] for k in klines], dtype=np.float64)
+    index = pd.DatetimeIndex(pd.to_datetime(dates, unit='ms', utc=True), name='Date')
+    return pd.DataFrame(values, index=index, columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+
+
+def _append_klines(klines, filepath, store_dir=None):
+    """
+    Hängt einen Block roher Klines als Date/OHLCV-Zeilen an die CSV-Datei
+    (und optional an den Memory-Mapped-Store) an.
+    """
+    df = klines_to_frame(klines)
+
+    write_header = not os.path.exists(filepath) or os.path.getsize(filepath) == 0
+    df.to_csv(filepath, mode='a', header=write_header)
+    if store_dir is not None:
+        append_to_store(df, store_dir)
+    return len(df)
+
+
+def update_binance_csv(symbol, interval, filepath, start_str=START_DATE_2020, end_dt=None,
+                       client=None, chunk_size=KLINE_CHUNK_SIZE, on_chunk=None, store_dir=None):
+    """
+    Inkrementeller Download: Liest den letzten gespeicherten Zeitstempel aus
+    `filepath` und lädt nur die neueren Kerzen nach. Nach jedem Block von
+    `chunk_size` Kerzen wird an die Datei angehängt, ein abgebrochener Lauf
+    setzt beim nächsten Aufruf also an der letzten gespeicherten Kerze fort.
+
+    Existiert die Datei noch nicht, wird ab `start_str` geladen. Noch nicht
+    abgeschlossene Kerzen werden nicht gespeichert.
+
+    `client` kann ein beliebiges Objekt mit `get_historical_klines_generator`
+    sein (z.B. ein Stellvertreter für Tests), Standard ist der Binance-Client.
+    `on_chunk` wird nach jedem gespeicherten Block mit dessen Zeilenzahl
+    aufgerufen. Bricht der Download ab, wird der angefangene Block noch
+    gespeichert. Mit `store_dir` wird jeder Block zusätzlich an den
+    Memory-Mapped-Store (siehe `ohlcv_store`) angehängt.
+
+    Die Klines werden seitenweise verarbeitet: Im Speicher liegt nie mehr
+    als ein Block von `chunk_size` Kerzen.
+
+    Gibt die Anzahl der neu gespeicherten Kerzen zurück.
+    """
+    client = client or get_binance_client()
+    step_ms = interval_to_ms(interval)
+
+    last_ts = read_last_timestamp(filepath)
+    if last_ts is not None:
+        start_ms = int(last_ts.value // 1_000_000) + step_ms
+        print(f"  Binance: '{symbol}' ({interval}) wird ab {last_ts + pd.Timedelta(milliseconds=step_ms)} fortgesetzt...")
+    else:
+        start_ms = int(pd.Timestamp(start_str, tz='UTC').value // 1_000_000)
+        print(f"  Binance: Lade '{symbol}' mit Intervall '{interval}' ab {start_str}...")
+
+    now_ms = int(time.time() * 1000)
+    end_ms = now_ms if end_dt is None else min(now_ms, int(pd.Timestamp(end_dt).to_pydatetime().timestamp() * 1000))
+    if start_ms >= end_ms:
+        return 0
+
+    written = 0
+    chunk = []
+
+    def flush():
+        nonlocal written
+        rows = _append_klines(chunk, filepath, store_dir)
+        chunk.clear()
+        written += rows
+        if on_chunk is not None:
+            on_chunk(rows)
+
+    try:
+        for kline in client.get_historical_klines_generator(symbol, interval, start_ms, end_ms):
+            # Kerze ist noch nicht abgeschlossen -> beim nächsten Lauf holen
+            if int(kline[6]) >= now_ms:
+                break
+            chunk.append(kline)
+            if len(chunk) >= chunk_size:
+                flush()
+    finally:
+        if chunk:
+            flush()
+
+    return written
+
+
+def download_binance_data(symbol, interval, filepath, start_str=START_DATE_2020, end_dt=None,
+                          client=None, store_dir=None):
+    """
+    Lädt die komplette Historie ab `start_str` neu herunter und ersetzt
+    `filepath` (bzw. `store_dir`) erst am Ende. Die Klines werden wie bei
+    `update_binance_csv` seitenweise in eine temporäre Datei geschrieben,
+    der Speicherbedarf hängt also nicht von der Länge der Historie ab.
+
+    Gibt die Anzahl der gespeicherten Kerzen zurück.
+    """
+    tmp_file = filepath + '.tmp'
+    tmp_store = store_dir + '.tmp' if store_dir else None
+    for path in (tmp_file, tmp_store):
+        if path and os.path.isdir(path):
+            shutil.rmtree(path)
+        elif path and os.path.exists(path):
+            os.remove(path)
 
+    rows = update_binance_csv(symbol, interval, tmp_file, start_str, end_dt,
+                              client=client, store_dir=tmp_store)
+    if rows == 0:
+        print(f"  ⚠️ Keine Daten von Binance für {symbol} erhalten.")
+        return 0
 
-# Wir gehen unsere Liste von Tickern durch und laden die Daten für jeden
-for interval in INTERVALS:
-    interval_dir = os.path.join(DATA_DIR, interval)
+    os.replace(tmp_file, filepath)
+    if store_dir:
+        if os.path.isdir(store_dir):
+            shutil.rmtree(store_dir)
+        os.replace(tmp_store, store_dir)
+    return rows
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket: `capacity` Tokens, die mit `rate` Tokens pro
+    Sekunde nachgefüllt werden. `acquire` blockiert, bis genug Tokens da sind.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedClient:
+    """
+    Hülle um einen Binance-Client, die vor jeder Kline-Seite (eine Anfrage à
+    `limit` Kerzen) das Request-Gewicht aus dem Token-Bucket bezieht.
+    """
+
+    def __init__(self, client, bucket, weight=KLINE_REQUEST_WEIGHT, limit=KLINE_CHUNK_SIZE):
+        self.client = client
+        self.bucket = bucket
+        self.weight = weight
+        self.limit = limit
+
+    def get_historical_klines_generator(self, symbol, interval, start_str=None, end_str=None):
+        self.bucket.acquire(self.weight)
+        klines = self.client.get_historical_klines_generator(symbol, interval, start_str, end_str)
+        for i, kline in enumerate(klines, start=1):
+            yield kline
+            if i % self.limit == 0:
+                self.bucket.acquire(self.weight)
+
+
+def _download_job(symbol, interval, filepath, start_str, end_dt, client, retries, backoff, store_dir):
+    """Ein Download-Auftrag mit Wiederholungen. Jeder Versuch setzt dort fort, wo der letzte aufhörte."""
+    started = time.perf_counter()
+    rows = 0
+    error = None
+    attempt = 0
+
+    def count(n):
+        nonlocal rows
+        rows += n
+
+    for attempt in range(1, retries + 2):
+        try:
+            update_binance_csv(symbol, interval, filepath, start_str, end_dt, client=client,
+                               on_chunk=count, store_dir=store_dir)
+            error = None
+            break
+        except Exception as e:
+            error = e
+            if attempt <= retries:
+                delay = backoff * 2 ** (attempt - 1)
+                print(f"  ⚠️ {symbol} ({interval}): Versuch {attempt} fehlgeschlagen ({e}), neuer Versuch in {delay:.0f}s")
+                time.sleep(delay)
+
+    seconds = time.perf_counter() - started
+    return {
+        'symbol': symbol,
+        'interval': interval,
+        'rows': rows,
+        'seconds': round(seconds, 2),
+        'rows/s': round(rows / seconds, 1) if seconds > 0 else float('nan'),
+        'attempts': attempt,
+        'status': 'ok' if error is None else f"Fehler: {error}",
+    }
+
+
+def download_all(symbols=TICKERS_BINANCE, intervals=INTERVALS, data_dir=DATA_DIR,
+                 start_str=START_DATE_2020, end_dt=None, client=None, max_workers=4,
+                 weight_per_minute=WEIGHT_PER_MINUTE, retries=3, backoff=2.0, with_store=False):
+    """
+    Lädt alle Kombinationen aus `symbols` x `intervals` parallel und
+    inkrementell (siehe `update_binance_csv`) nach `<data_dir>/<interval>/`.
+
+    Statt fester Pausen teilen sich alle Threads einen Token-Bucket mit
+    `weight_per_minute` Request-Gewicht pro Minute. Fehlgeschlagene Aufträge
+    werden bis zu `retries` Mal mit exponentiellem Backoff wiederholt.
+    Mit `with_store=True` wird zusätzlich der Memory-Mapped-Store neben
+    jeder CSV-Datei fortgeschrieben.
+
+    Gibt eine Übersicht (DataFrame) mit Zeilen, Dauer und Durchsatz pro
+    Symbol und Intervall zurück.
+    """
+    client = RateLimitedClient(
+        client or get_binance_client(),
+        TokenBucket(rate=weight_per_minute / 60, capacity=max(KLINE_REQUEST_WEIGHT, weight_per_minute / 6)),
+    )
+
+    jobs = []
+    for interval in intervals:
+        interval_dir = os.path.join(data_dir, interval)
+        os.makedirs(interval_dir, exist_ok=True)
+        for symbol in symbols:
+            filepath = os.path.join(interval_dir, f"{symbol}_{interval}_full.csv")
+            store_dir = store_path_for(filepath) if with_store else None
+            jobs.append((symbol, interval, filepath, start_str, end_dt, client, retries, backoff, store_dir))
+
+    started = time.perf_counter()
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_download_job, *job) for job in jobs]
+        for future in as_completed(futures):
+            result = future.result()
+            icon = '✅' if result['status'] == 'ok' else '❌'
+            print(f"  {icon} {result['symbol']} ({result['interval']}): {result['rows']} neue Kerzen in {result['seconds']}s")
+            results.append(result)
+
+    summary = pd.DataFrame(results, columns=SUMMARY_COLUMNS).sort_values(['interval', 'symbol']).reset_index(drop=True)
+    total_seconds = time.perf_counter() - started
+    total_rows = int(summary['rows'].sum()) if not summary.empty else 0
+    print(f"\nGesamt: {total_rows} Kerzen in {total_seconds:.1f}s ({total_rows / max(total_seconds, 1e-9):.0f} Kerzen/s)")
+    return summary
+
+
+def derive_all(symbols=TICKERS_BINANCE, base_interval="5m", intervals=DERIVED_INTERVALS, data_dir=DATA_DIR):
+    """
+    Leitet `intervals` (z.B. 15m, 1h) aus den geladenen `base_interval`-CSVs
+    ab und schreibt sie im selben Format nach `<data_dir>/<interval>/`.
+    Vorhandene Dateien werden nur um neue, abgeschlossene Kerzen ergänzt.
+    """
+    for interval in intervals:
+        interval_dir = os.path.join(data_dir, interval)
+        os.makedirs(interval_dir, exist_ok=True)
+        for symbol in symbols:
+            base_path = os.path.join(data_dir, base_interval, f"{symbol}_{base_interval}_full.csv")
+            if not os.path.exists(base_path):
+                print(f"  ⚠️ {symbol}: keine {base_interval}-Daten, {interval} wird übersprungen.")
+                continue
+            out_path = os.path.join(interval_dir, f"{symbol}_{interval}_full.csv")
+            rows = resample_to_csv(base_path, interval, out_path)
+            print(f"  ✅ {symbol} ({interval}): {rows} neue Kerzen aus {base_interval} abgeleitet")
+
+
+def download_yfinance_daily(tickers=TICKERS_YFINANCE, data_dir=DATA_DIR, end_dt=None):
+    """
+    Lädt Tagesdaten über yfinance nach `<data_dir>/1d/`: einmal die längste
+    verfügbare Historie (`_max.csv`) und einmal ab 2020 (`_2020-today.csv`).
+    """
+    import yfinance as yf
+
+    interval = "1d"
+    interval_dir = os.path.join(data_dir, interval)
     os.makedirs(interval_dir, exist_ok=True)
-    
-    print(f"\n--- Bearbeite Intervall: {interval} ---")
+    end_dt = end_dt or datetime.now()
+
+    for ticker in tickers:
+        print(f"  Ticker: {ticker}")
+        # ANFRAGE 1: Längst möglicher Zeitraum
+        try:
+            data_max = yf.download(tickers=ticker, period="max", interval="1d", progress=False)
+            if not data_max.empty:
+                data_max.to_csv(os.path.join(interval_dir, f"{ticker}_{interval}_max.csv"))
+                print(f"    ✅ MAX: {len(data_max)} Datenpunkte gespeichert.")
+        except Exception as e:
+            print(f"    ❌ FEHLER (max): {e}")
+        time.sleep(1)
+
+        # ANFRAGE 2: Zeitraum ab 2020
+        try:
+            data_2020 = yf.download(tickers=ticker, start="2020-01-01", end=end_dt, interval="1d", progress=False)
+            if not data_2020.empty:
+                data_2020.to_csv(os.path.join(interval_dir, f"{ticker}_{interval}_2020-today.csv"))
+                print(f"    ✅ 2020-heute: {len(data_2020)} Datenpunkte gespeichert.")
+        except Exception as e:
+            print(f"    ❌ FEHLER (2020-heute): {e}")
+        time.sleep(1)
 
-    # Wähle das richtige Werkzeug und die richtige Ticker-Liste
-    if interval == "1d":
+
+def main(argv=None):
+    """Kommandozeile: lädt bzw. aktualisiert alle Daten (Standard: wie konfiguriert oben)."""
+    parser = argparse.ArgumentParser(description="Kryptodaten von Binance (Intraday) und yfinance (1d) laden.")
+    parser.add_argument('--symbols', nargs='+', default=TICKERS_BINANCE, help="Binance-Symbole")
+    parser.add_argument('--intervals', nargs='+', default=INTERVALS,
+                        help="zu ladende Intervalle, '1d' kommt von yfinance")
+    parser.add_argument('--derived', nargs='*', default=DERIVED_INTERVALS,
+                        help="aus dem feinsten Intervall abgeleitete Intervalle")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--start', default=START_DATE_2020, help="Startdatum für neue Dateien")
+    parser.add_argument('--workers', type=int, default=4, help="parallele Downloads")
+    parser.add_argument('--with-store', action='store_true', help="Memory-Mapped-Store mitschreiben")
+    args = parser.parse_args(argv)
+
+    print("Starte den hybriden Download von Kryptodaten...")
+    os.makedirs(args.data_dir, exist_ok=True)
+    end_dt = datetime.now()
+
+    # Tagesdaten kommen weiterhin von yfinance
+    if "1d" in args.intervals:
+        print("\n--- Bearbeite Intervall: 1d ---")
         print("  -> Werkzeug: yfinance (für tägliche Daten)")
-        for ticker in TICKERS_YFINANCE:
-            print(f"  Ticker: {ticker}")
-            # ANFRAGE 1: Längst möglicher Zeitraum
-            try:
-                data_max = yf.download(tickers=ticker, period="max", interval="1d", progress=False)
-                if not data_max.empty:
-                    data_max.to_csv(os.path.join(interval_dir, f"{ticker}_{interval}_max.csv"))
-                    print(f"    ✅ MAX: {len(data_max)} Datenpunkte gespeichert.")
-            except Exception as e:
-                print(f"    ❌ FEHLER (max): {e}")
-            time.sleep(1)
-
-            # ANFRAGE 2: Zeitraum ab 2020
-            try:
-                data_2020 = yf.download(tickers=ticker, start="2020-01-01", end=END_DATE_TODAY, interval="1d", progress=False)
-                if not data_2020.empty:
-                    data_2020.to_csv(os.path.join(interval_dir, f"{ticker}_{interval}_2020-today.csv"))
-                    print(f"    ✅ 2020-heute: {len(data_2020)} Datenpunkte gespeichert.")
-            except Exception as e:
-                print(f"    ❌ FEHLER (2020-heute): {e}")
-            time.sleep(1)
-
-    else: # Für alle Intraday-Intervalle
+        download_yfinance_daily(TICKERS_YFINANCE, args.data_dir, end_dt)
+
+    # Alle Intraday-Intervalle laufen parallel über die Download-Engine
+    intraday_intervals = [interval for interval in args.intervals if interval != "1d"]
+    if intraday_intervals:
+        print("\n--- Binance-Intervalle: " + ", ".join(intraday_intervals) + " ---")
         print("  -> Werkzeug: python-binance (für Intraday-Daten)")
-        for ticker in TICKERS_BINANCE:
-            # Lade die vollständige Historie ab 2020
-            binance_df = download_binance_data(ticker, interval, START_DATE_2020, END_DATE_TODAY)
-            if binance_df is not None:
-                # Wir fragen nur einen Zeitraum an, also speichern wir ihn als "full"
-                filepath = os.path.join(interval_dir, f"{ticker}_{interval}_full.csv")
-                binance_df.to_csv(filepath)
-                print(f"  ✅ Erfolgreich {len(binance_df)} Datenpunkte in '{filepath}' gespeichert.")
-            time.sleep(2) # Längere Pause für Binance API
-
-print("\n" + "=" * 40)
-print("Alle Download-Aufgaben abgeschlossen.")
-print(f"Alle Daten wurden im Ordner '{DATA_DIR}' gespeichert.")
-print("=" * 40)
+        summary = download_all(args.symbols, intraday_intervals, args.data_dir, args.start, end_dt,
+                               max_workers=args.workers, with_store=args.with_store)
+        print(summary.to_string(index=False))
+
+    if args.derived and intraday_intervals:
+        base_interval = min(intraday_intervals, key=interval_to_ms)
+        print("\n--- Abgeleitete Intervalle: " + ", ".join(args.derived) + f" (aus {base_interval}) ---")
+        derive_all(args.symbols, base_interval, args.derived, args.data_dir)
+
+    print("\n" + "=" * 40)
+    print("Alle Download-Aufgaben abgeschlossen.")
+    print(f"Alle Daten wurden im Ordner '{args.data_dir}' gespeichert.")
+    print("=" * 40)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+# ohlcv_store.py
+"""
+Memory-mapped Spaltenspeicher für OHLCV-Daten.
+
+Jede Zeitreihe liegt in einem eigenen Ordner (`<SYMBOL>_<interval>_full.store`)
+mit einer Binärdatei pro Spalte und einer `meta.json`:
+
+    Date.bin    int64   Epoch-Millisekunden (UTC), aufsteigend sortiert
+    Open.bin    float64 oder float32
+    High.bin    ...
+    Low.bin
+    Close.bin
+    Volume.bin
+    meta.json   {"rows": ..., "dtypes": {...}}
+
+Neue Kerzen werden einfach an die Spaltendateien angehängt. Beim Lesen
+werden die Dateien per `np.memmap` eingeblendet und nur der angefragte
+Zeitraum als View zurückgegeben. Mehrere Prozesse, die dieselbe Datei
+lesen, teilen sich dabei die Seiten im Page-Cache des Betriebssystems.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_SUFFIX = '.store'
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+META_FILE = 'meta.json'
+
+
+def store_path_for(csv_path):
+    """Gibt den Store-Ordner zurück, der zu einer CSV-Datei gehört."""
+    return os.path.splitext(csv_path)[0] + STORE_SUFFIX
+
+
+def _read_meta(store_dir):
+    with open(os.path.join(store_dir, META_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_meta(store_dir, meta):
+    # Erst temporär schreiben, dann ersetzen: die Zeilenzahl in meta.json ist
+    # die einzige Wahrheit darüber, wie viele Zeilen gültig sind.
+    tmp_file = os.path.join(store_dir, META_FILE + '.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_file, os.path.join(store_dir, META_FILE))
+
+
+def _to_epoch_ms(index):
+    """Wandelt einen DatetimeIndex in int64-Millisekunden (UTC) um."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return index.values.astype('datetime64[ms]').astype(np.int64)
+
+
+def _column_arrays(data, dtypes):
+    """Baut die zusammenhängenden Spalten-Arrays für den Store."""
+    arrays = {'Date': _to_epoch_ms(data.index)}
+    for col in PRICE_COLUMNS:
+        arrays[col] = np.ascontiguousarray(data[col].to_numpy(dtype=dtypes[col]))
+    return arrays
+
+
+def write_store(data, store_dir, price_dtype='float64'):
+    """
+    Schreibt einen vorbereiteten OHLCV-Frame (siehe `load_and_prepare_data`)
+    als neuen Store. Ein vorhandener Store wird überschrieben.
+
+    `price_dtype='float32'` halbiert den Platzbedarf der Preisspalten.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    data = data.sort_index()
+    dtypes = {'Date': 'int64', **{col: np.dtype(price_dtype).name for col in PRICE_COLUMNS}}
+
+    for col, values in _column_arrays(data, dtypes).items():
+        values.tofile(os.path.join(store_dir, f"{col}.bin"))
+
+    _write_meta(store_dir, {'rows': len(data), 'dtypes': dtypes})
+    return len(data)
+
+
+def append_to_store(data, store_dir):
+    """
+    Hängt neue Kerzen an einen bestehenden Store an. Kerzen, deren Zeitstempel
+    nicht hinter der letzten gespeicherten Kerze liegt, werden übersprungen.
+    Existiert der Store noch nicht, wird er angelegt.
+
+    Gibt die Anzahl der angehängten Zeilen zurück.
+    """
+    if not os.path.exists(os.path.join(store_dir, META_FILE)):
+        return write_store(data, store_dir)
+
+    meta = _read_meta(store_dir)
+    rows = meta['rows']
+    dtypes = meta['dtypes']
+
+    arrays = _column_arrays(data.sort_index(), dtypes)
+    if rows:
+        last_ts = np.fromfile(os.path.join(store_dir, 'Date.bin'), dtype=np.int64,
+                              count=1, offset=(rows - 1) * 8)[0]
+        keep = arrays['Date'] > last_ts
+        arrays = {col: values[keep] for col, values in arrays.items()}
+
+    added = len(arrays['Date'])
+    if not added:
+        return 0
+
+    for col, values in arrays.items():
+        path = os.path.join(store_dir, f"{col}.bin")
+        with open(path, 'r+b') as f:
+            # Reste eines abgebrochenen Schreibvorgangs abschneiden
+            f.truncate(rows * values.itemsize)
+            f.seek(0, os.SEEK_END)
+            f.write(values.tobytes())
+
+    meta['rows'] = rows + added
+    _write_meta(store_dir, meta)
+    return added
+
+
+def _to_ms(value):
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value // 1_000_000)
+
+
+def open_store(store_dir, start=None, end=None, columns=None):
+    """
+    Blendet einen Store per `np.memmap` ein und gibt ein Dict mit Views auf
+    den Zeitraum `[start, end]` zurück (beide Grenzen inklusive, `None` = offen).
+
+    Es wird nichts kopiert: Nur die Seiten, die tatsächlich gelesen werden,
+    landen im Speicher. Der Zeitraum wird per Binärsuche auf `Date` bestimmt.
+    """
+    meta = _read_meta(store_dir)
+    rows = meta['rows']
+    columns = ['Date'] + [c for c in (columns or PRICE_COLUMNS) if c != 'Date']
+
+    if rows == 0:
+        return {col: np.empty(0, dtype=meta['dtypes'][col]) for col in columns}
+
+    dates = np.memmap(os.path.join(store_dir, 'Date.bin'), dtype=np.int64,
+                      mode='r', shape=(rows,))
+    lo = 0 if start is None else int(np.searchsorted(dates, _to_ms(start), side='left'))
+    hi = rows if end is None else int(np.searchsorted(dates, _to_ms(end), side='right'))
+
+    arrays = {'Date': dates[lo:hi]}
+    for col in columns[1:]:
+        values = np.memmap(os.path.join(store_dir, f"{col}.bin"),
+                           dtype=meta['dtypes'][col], mode='r', shape=(rows,))
+        arrays[col] = values[lo:hi]
+    return arrays
+
+
+def store_to_dataframe(arrays):
+    """
+    Baut aus den Arrays von `open_store` den DataFrame, den backtesting.py
+    und backtrader erwarten (UTC-DatetimeIndex namens 'Date').
+    """
+    index = pd.to_datetime(np.asarray(arrays['Date']), unit='ms', utc=True)
+    data = pd.DataFrame({col: np.asarray(values) for col, values in arrays.items() if col != 'Date'},
+                        index=index)
+    data.index.name = 'Date'
+    return data
+
+
+def csv_to_store(csv_path, store_dir=None, price_dtype='float64'):
+    """
+    Konvertiert eine CSV-Datei (z.B. `crypto_data/5m/BTCUSDT_5m_full.csv`)
+    über `load_and_prepare_data` in einen Store und gibt dessen Pfad zurück.
+    """
+    from project_goldengo.prepare_data import load_and_prepare_data
+
+    data = load_and_prepare_data(csv_path)
+    if data is None:
+        return None
+    store_dir = store_dir or store_path_for(csv_path)
+    rows = write_store(data, store_dir, price_dtype=price_dtype)
+    print(f"✅ Store geschrieben: {store_dir} ({rows} Zeilen)")
+    return store_dir
@@ -0,0 +1,278 @@
+# optimizer.py
+"""
+Parametersuche, die nicht jede Kombination des Gitters rechnet.
+
+`evaluate_grid` bewertet das komplette Gitter. Bei 04 sind das 1080
+Kombinationen pro Datei, obwohl meist nur die Spitze interessiert. `optimize`
+bietet dieselbe Schnittstelle (Gitter als Keyword-Argumente, `maximize=`,
+`constraint=`, Heatmap als Ergebnis), wählt die Kombinationen aber nach
+`method` aus:
+
+- `'grid'`: alle Kombinationen, identisch zu `evaluate_grid`
+- `'random'`: zufällige Stichprobe von `max_evals` Kombinationen
+- `'halving'`: Successive Halving auf wachsenden Zeitfenstern. Alle
+  Kombinationen laufen zuerst nur auf den letzten `windows[0]` (Standard:
+  3 Monate), die besten `keep` (Anteil) kommen ins nächste Fenster und
+  zuletzt auf die volle Historie.
+- `'model'`: modellbasierte (Bayes'sche) Suche. Nach einer zufälligen
+  Startrunde sagt ein Gauß-Prozess über die Gitterpositionen Mittelwert und
+  Unsicherheit voraus, jede Runde rechnet die `batch_size` Kombinationen mit
+  dem höchsten erwarteten Zugewinn (Expected Improvement).
+
+Die Skripte (01, 04) rechnen weiterhin das volle Gitter, die übrigen
+Methoden sind für Gitter gedacht, die dafür zu groß sind. Wie nah sie dem
+Optimum kommen, zeigt `benchmarks/bench_optimizer.py`, z.B. für 01:
+
+    heatmap = optimize(data, grid_signals, method='model', max_evals=60, patience=2,
+                       n1=range(10, 35, 5), n2=range(40, 75, 5), atr_sl_multiplier=range(2, 8, 1),
+                       constraint=lambda p: p.n1 < p.n2, maximize='Equity Final [$]')
+
+Bei `'random'` und `'model'` bricht `patience` die Suche ab, wenn sich der
+beste Wert so viele Runden in Folge nicht verbessert hat.
+
+Die Heatmap enthält nur die auf der vollen Historie gerechneten
+Kombinationen (wie `bt.optimize(..., max_tries=...)`), in Gitter-Reihenfolge:
+
+    heatmap = optimize(data, grid_signals, method='halving',
+                       n1=range(10, 35, 5), n2=range(40, 75, 5),
+                       constraint=lambda p: p.n1 < p.n2,
+                       maximize='Equity Final [$]', cash=100_000, commission=0.001)
+    best = dict(zip(heatmap.index.names, heatmap.idxmax()))
+
+Mit `store=` werden die Ergebnisse dauerhaft abgelegt und bei erneuten Läufen
+wiederverwendet (siehe `project_goldengo.result_store`).
+"""
+
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.grid import STAT_KEYS, _maximize_key, evaluate_combos, heatmap_from_stats, parameter_grid
+from project_goldengo.result_store import ResultStore, data_fingerprint
+
+METHODS = ('grid', 'random', 'halving', 'model')
+
+# Kandidaten für die Längenskala des Gauß-Prozesses (Gitterpositionen auf [0, 1] skaliert)
+_LENGTH_SCALES = (0.05, 0.1, 0.2, 0.4, 0.8)
+_NOISE = 1e-4
+
+_erf = np.vectorize(math.erf, otypes=[float])
+
+
+def _window_bars(data, window):
+    """Anzahl Kerzen der letzten `window` (Anzahl Kerzen oder Zeitspanne wie '90D')."""
+    if isinstance(window, (int, np.integer)):
+        return min(int(window), len(data))
+    if not isinstance(data.index, pd.DatetimeIndex):
+        raise TypeError("Zeitfenster wie '90D' brauchen einen DatetimeIndex, sonst Anzahl Kerzen angeben.")
+    since = data.index[-1] - pd.Timedelta(window)
+    return len(data) - int(data.index.searchsorted(since, side='left'))
+
+
+def _ranking(values):
+    """Positionen nach Wert absteigend sortiert, NaN (kein Trade) zuletzt."""
+    values = np.asarray(values, dtype=float)
+    return np.argsort(np.where(np.isnan(values), -np.inf, -values), kind='stable')
+
+
+def _encode(combos, names):
+    """Gitterposition je Parameter, auf [0, 1] skaliert (Merkmale für den Gauß-Prozess)."""
+    columns = []
+    for name in names:
+        levels = sorted(set(combo[name] for combo in combos))
+        position = {level: i for i, level in enumerate(levels)}
+        scale = max(len(levels) - 1, 1)
+        columns.append([position[combo[name]] / scale for combo in combos])
+    return np.array(columns, dtype=float).T
+
+
+class _GaussianProcess:
+    """Kleiner Gauß-Prozess (RBF-Kern) für die modellbasierte Suche."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.mean, self.std = y.mean(), y.std() or 1.0
+        z = (y - self.mean) / self.std
+        best = None
+        for length_scale in _LENGTH_SCALES:
+            k = self._kernel(x, x, length_scale) + _NOISE * np.eye(len(x))
+            chol = np.linalg.cholesky(k)
+            alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, z))
+            # Log-Marginal-Likelihood ohne Konstante
+            score = -0.5 * z @ alpha - np.log(np.diag(chol)).sum()
+            if best is None or score > best[0]:
+                best = (score, length_scale, chol, alpha)
+        _, self.length_scale, self.chol, self.alpha = best
+
+    @staticmethod
+    def _kernel(a, b, length_scale):
+        sq = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+        return np.exp(-0.5 * sq / length_scale ** 2)
+
+    def predict(self, x):
+        k = self._kernel(x, self.x, self.length_scale)
+        mu = k @ self.alpha
+        v = np.linalg.solve(self.chol, k.T)
+        sigma = np.sqrt(np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None))
+        return mu * self.std + self.mean, sigma * self.std
+
+
+def _expected_improvement(mu, sigma, best):
+    z = (mu - best) / sigma
+    cdf = 0.5 * (1 + _erf(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return (mu - best) * cdf + sigma * pdf
+
+
+def _propose(features, evaluated, values, batch_size):
+    """
+    Nächste `batch_size` Kandidaten nach Expected Improvement. Innerhalb einer
+    Runde wird jeder gewählte Punkt mit seiner Vorhersage als beobachtet
+    angenommen ("Kriging Believer"), damit die Runde nicht auf einem Fleck landet.
+    """
+    x = features[evaluated]
+    y = np.asarray(values, dtype=float)
+    finite = np.isfinite(y)
+    # Kein Trade zählt wie das schlechteste bisher gesehene Ergebnis
+    y = np.where(finite, y, y[finite].min() if finite.any() else 0.0)
+
+    chosen = []
+    candidates = np.setdiff1d(np.arange(len(features)), evaluated)
+    for _ in range(min(batch_size, len(candidates))):
+        model = _GaussianProcess(x, y)
+        mu, sigma = model.predict(features[candidates])
+        pick = int(np.argmax(_expected_improvement(mu, sigma, y.max())))
+        chosen.append(candidates[pick])
+        x = np.vstack([x, features[candidates[pick]]])
+        y = np.append(y, mu[pick])
+        candidates = np.delete(candidates, pick)
+    return chosen
+
+
+def _evaluate_stored(store, run_key, data, signal_func, combos, run):
+    """
+    `evaluate_combos` mit `ResultStore`: bekannte Kombinationen kommen aus
+    dem Speicher, nur die übrigen werden gerechnet und blockweise abgelegt.
+    """
+    data_key = data_fingerprint(data)
+    found = store.load(run_key, data_key, combos)
+    missing = [combo for i, combo in enumerate(combos) if i not in found]
+    if missing:
+        computed = evaluate_combos(data, signal_func, missing,
+                                   on_block=lambda block, stats: store.save(run_key, data_key, block, stats),
+                                   **run)
+        computed = iter(computed.to_dict('records'))
+    rows = [found[i] if i in found else next(computed) for i in range(len(combos))]
+
+    names = list(combos[0])
+    return pd.DataFrame(rows, columns=STAT_KEYS,
+                        index=pd.MultiIndex.from_tuples([tuple(combo[name] for name in names)
+                                                         for combo in combos], names=names))
+
+
+def optimize(data, signal_func, method='grid', maximize='Equity Final [$]', constraint=None,
+             max_evals=None, batch_size=None, patience=None, windows=('90D',), keep=1 / 3,
+             random_state=None, return_stats=False, store=None, strategy=None,
+             cash=10_000, commission=0.0, size=1 - np.finfo(float).eps, trade_on_close=False,
+             block_size=None, **params):
+    """
+    Parametersuche über das Gitter `params` mit der Strategie `method` (siehe
+    Modul-Doku). Gibt die Heatmap der auf der vollen Historie gerechneten
+    Kombinationen zurück, mit `return_stats=True` zusätzlich deren Kennzahlen.
+
+    - `maximize`, `constraint`, `cash`, `commission`, `size`,
+      `trade_on_close`, `block_size`: wie bei `evaluate_grid`
+    - `max_evals`: Budget an Kombinationen auf der vollen Historie für
+      `'random'`/`'model'` (Standard: ein Fünftel des Gitters). Bei
+      `'halving'` wird damit vorab eine Zufallsstichprobe gezogen.
+    - `batch_size`: Kombinationen pro Runde (`'random'`: Standard alles in
+      einer Runde, `'model'`: Standard ein Fünftel des Budgets, höchstens 16)
+    - `patience`: Runden ohne Verbesserung bis zum Abbruch
+    - `windows`: Zeitfenster der Vorrunden bei `'halving'`, aufsteigend
+      (Anzahl Kerzen oder Zeitspanne wie '90D')
+    - `keep`: Anteil, der bei `'halving'` in die nächste Runde kommt
+    - `random_state`: Startwert des Zufallsgenerators
+    - `store`: `ResultStore` (oder Pfad zur SQLite-Datei). Bereits
+      gerechnete Kombinationen werden daraus geladen, neue nach jedem Block
+      gespeichert. Der Schlüssel umfasst den Quelltext von `signal_func`
+      und `strategy` (z.B. die Strategie-Klasse), die Daten und
+      `cash`/`commission`/`size`/`trade_on_close`.
+    """
+    if method not in METHODS:
+        raise ValueError(f"`method` muss eine dieser Methoden sein: {METHODS}")
+    _maximize_key(maximize)
+    combos = parameter_grid(constraint, **params)
+    names = list(params)
+    rng = np.random.default_rng(random_state)
+    run = dict(cash=cash, commission=commission, size=size, trade_on_close=trade_on_close,
+               block_size=block_size)
+
+    if store is not None:
+        store = ResultStore(store) if isinstance(store, (str, os.PathLike)) else store
+        run_key = store.run_key(signal_func, *([strategy] if strategy is not None else []),
+                                cash=cash, commission=commission, size=size, trade_on_close=trade_on_close)
+
+    def evaluate(positions, frame=data):
+        chosen = [combos[i] for i in positions]
+        if store is None:
+            stats = evaluate_combos(frame, signal_func, chosen, **run)
+        else:
+            stats = _evaluate_stored(store, run_key, frame, signal_func, chosen, run)
+        return stats, heatmap_from_stats(stats, maximize).to_numpy()
+
+    if max_evals is None:
+        max_evals = len(combos) if method in ('grid', 'halving') else max(1, math.ceil(len(combos) / 5))
+    max_evals = min(max_evals, len(combos))
+    order = rng.permutation(len(combos))[:max_evals] if max_evals < len(combos) else np.arange(len(combos))
+
+    frames = []
+    if method == 'grid':
+        frames.append(evaluate(np.arange(len(combos)))[0])
+
+    elif method == 'halving':
+        candidates = np.sort(order)
+        for window in windows:
+            bars = _window_bars(data, window)
+            if bars >= len(data) or len(candidates) <= 1:
+                break
+            _, values = evaluate(candidates, data.iloc[-bars:])
+            n_keep = max(1, math.ceil(len(candidates) * keep))
+            candidates = np.sort(candidates[_ranking(values)[:n_keep]])
+        frames.append(evaluate(candidates)[0])
+
+    else:
+        if batch_size is None:
+            batch_size = max_evals if method == 'random' else max(1, min(16, max_evals // 5))
+        features = _encode(combos, names) if method == 'model' else None
+        evaluated, values = [], []
+        best, stale = -np.inf, 0
+        while len(evaluated) < max_evals:
+            budget = min(batch_size, max_evals - len(evaluated))
+            if method == 'random' or not evaluated:
+                batch = order[len(evaluated):len(evaluated) + budget]
+            else:
+                batch = _propose(features, evaluated, values, budget)
+            stats, batch_values = evaluate(batch)
+            frames.append(stats)
+            evaluated += [int(i) for i in batch]
+            values += list(batch_values)
+
+            batch_best = np.nanmax(batch_values) if np.isfinite(batch_values).any() else -np.inf
+            if batch_best > best:
+                best, stale = batch_best, 0
+            else:
+                stale += 1
+                if patience is not None and stale >= patience:
+                    break
+
+    stats = pd.concat(frames)
+    # Gitter-Reihenfolge wie bei evaluate_grid
+    grid_order = {tuple(combo.values()): i for i, combo in enumerate(combos)}
+    stats = stats.iloc[np.argsort([grid_order[key] for key in stats.index], kind='stable')]
+    heatmap = heatmap_from_stats(stats, maximize)
+
+    if return_stats:
+        return heatmap, stats
+    return heatmap
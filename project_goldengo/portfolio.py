@@ -0,0 +1,360 @@
+# portfolio.py
+"""
+Portfolio-Backtest über mehrere Symbole mit gemeinsamem Kapital.
+
+Die Skripte testen bisher ein Symbol pro Lauf. `portfolio_backtest` nimmt
+die OHLCV-Frames mehrerer Symbole, legt sie auf einen gemeinsamen
+Zeitstempel-Index und lässt eine Signal-Funktion (dieselbe wie für
+`evaluate_grid`) auf allen Symbolen gleichzeitig laufen. Alle Positionen
+teilen sich ein Konto: Risikobasierte Größen (`stop_dist` +
+`risk_per_trade`) beziehen sich auf die Equity des ganzen Portfolios,
+gekauft wird nur, was das freie Kapital hergibt.
+
+Ablauf:
+
+1. Signale pro Symbol (auf dessen eigener Historie ab der ersten Kerze).
+2. Für alle Symbole gleichzeitig die Kette möglicher Trades: Der Ausstieg
+   eines Trades hängt nur von Kursen und Signalen ab, nicht vom Kapital.
+   Dazu werden die Symbole hintereinander auf eine Zeitachse gelegt
+   (Symbol × Kerze) und mit `grid._scan_exits` in einem Durchlauf gesucht.
+3. Eine Ereignis-Schleife über die Trades (nicht über die Kerzen) geht die
+   Ein- und Ausstiege aller Symbole chronologisch durch und bestimmt die
+   Stückzahlen mit dem gemeinsamen Kapital. Wird eine Order mangels
+   Kapital verworfen, wird nur die Kette dieses Symbols ab der nächsten
+   Kerze neu gesucht.
+
+Ausführung wie bei `run_signals`/backtesting.py, dazu:
+
+- Ausstiege auf einer Kerze werden vor Einstiegen verbucht (das Kapital
+  ist dann schon frei), gleichzeitige Einstiege in der Reihenfolge der
+  Symbole.
+- `size < 1` ist ein Anteil des *freien* Kapitals, risikobasierte Größen
+  rechnen mit der Portfolio-Equity zum Schluss der Signal-Kerze.
+- Fehlende Kerzen eines Symbols (Lücken im gemeinsamen Index) werden mit
+  dem letzten Schlusskurs aufgefüllt, auf ihnen wird nicht eingestiegen.
+  Vor der ersten Kerze eines Symbols gibt es für dieses keine Signale.
+
+    frames = load_portfolio(['BTCUSDT', 'ETHUSDT', 'SOLUSDT'], interval='1h')
+    stats = portfolio_backtest(frames, grid_signals, cash=100_000, commission=0.001,
+                               fast_ema=20, medium_ema=50, rsi_threshold=75, atr_multiple=2.0)
+    print(stats)              # Kennzahlen des Portfolios wie bei bt.run()
+    print(stats['_symbols'])  # Beitrag der einzelnen Symbole
+"""
+
+import heapq
+import os
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.grid import _scan_exits
+from project_goldengo.vectorized import _order_units, compute_stats
+
+OHLC = ('Open', 'High', 'Low', 'Close')
+
+
+def load_portfolio(symbols=None, interval='5m', data_dir='crypto_data', base_interval='5m'):
+    """
+    Lädt die Binance-Daten von `symbols` (Standard: `TICKERS_BINANCE`) als
+    Dict Symbol -> Frame. Intervalle, die nicht heruntergeladen wurden,
+    werden aus `base_interval` abgeleitet (siehe `resample`).
+    """
+    from project_goldengo.prepare_data import load_and_prepare_data
+    from project_goldengo.resample import load_resampled
+
+    if symbols is None:
+        from project_goldengo.load_data import TICKERS_BINANCE
+        symbols = TICKERS_BINANCE
+
+    frames = {}
+    for symbol in symbols:
+        path = os.path.join(data_dir, interval, f"{symbol}_{interval}_full.csv")
+        if os.path.exists(path):
+            data = load_and_prepare_data(path)
+        else:
+            base_path = os.path.join(data_dir, base_interval, f"{symbol}_{base_interval}_full.csv")
+            data = load_resampled(base_path, interval) if os.path.exists(base_path) else None
+        if data is None:
+            print(f"⚠️ {symbol}: keine Daten für {interval}, wird übersprungen.")
+            continue
+        frames[symbol] = data
+    return frames
+
+
+def align_symbols(frames, how='outer'):
+    """
+    Legt die Frames (Dict Symbol -> OHLCV-Frame) auf einen gemeinsamen Index
+    (`how='outer'`: alle Zeitstempel, `'inner'`: nur gemeinsame). Gibt
+    (Index, Dict Symbol -> aufgefüllter Frame ab der ersten eigenen Kerze,
+    erste Kerze je Symbol, Maske der echten Kerzen (Kerzen × Symbole)) zurück.
+    """
+    if not frames:
+        raise ValueError("Keine Symbole angegeben.")
+    if how not in ('outer', 'inner'):
+        raise ValueError("`how` muss 'outer' oder 'inner' sein.")
+    index = None
+    for data in frames.values():
+        index = data.index if index is None else (index.union(data.index) if how == 'outer'
+                                                  else index.intersection(data.index))
+    if len(index) < 2:
+        raise ValueError("Zu wenig gemeinsame Kerzen.")
+
+    aligned, first, present = {}, [], []
+    for symbol, data in frames.items():
+        data = data[~data.index.duplicated(keep='last')]
+        mask = index.isin(data.index)
+        lo = int(mask.argmax())
+        frame = data.reindex(index[lo:])
+        close = frame['Close'].ffill()
+        for col in ('Open', 'High', 'Low'):
+            frame[col] = frame[col].fillna(close)
+        frame['Close'] = close
+        frame['Volume'] = frame['Volume'].fillna(0.0)
+        aligned[symbol] = frame
+        first.append(lo)
+        present.append(mask)
+    return index, aligned, np.array(first), np.column_stack(present)
+
+
+def _flat_signals(aligned, first, present, signal_func, params, n):
+    """
+    Signale aller Symbole auf der gemeinsamen Zeitachse Symbol × Kerze
+    (Position `a * n + Kerze`). Zeilen vor der ersten Kerze eines Symbols
+    bekommen keine Signale.
+    """
+    columns = {}
+    scalars = {}
+    start = []
+    arrays = {name: np.array([value]) for name, value in params.items()}
+    for a, (symbol, frame) in enumerate(aligned.items()):
+        signals = signal_func(frame, **arrays)
+        lo = first[a]
+        for key, value in signals.items():
+            if key == 'start':
+                start.append(lo + int(np.asarray(value).reshape(-1)[0]))
+                continue
+            value = np.asarray(value)
+            if value.ndim >= 1 and len(value) == len(frame):
+                column = value.reshape(len(frame), -1)[:, 0]
+                pad = np.zeros(lo, dtype=bool) if column.dtype == bool else np.full(lo, np.nan)
+                columns.setdefault(key, [None] * len(aligned))[a] = np.concatenate([pad, column.astype(pad.dtype)])
+            else:
+                scalars.setdefault(key, [np.nan] * len(aligned))[a] = float(value.reshape(-1)[0])
+        if 'start' not in signals:
+            start.append(lo + 1)
+
+    flat = {key: np.concatenate(values) for key, values in columns.items()}
+    flat['entries'] = flat['entries'] & present.T.ravel()
+    flat.update({key: np.array(values) for key, values in scalars.items()})
+    flat['start'] = np.array(start)
+    return flat
+
+
+def _trade_chains(flat, market, n, assets, pos, trade_on_close, rounds=None):
+    """
+    Alle Trades (höchstens `rounds` pro Symbol), die die Symbole `assets` ab
+    der Position `pos` (Symbol × Kerze) nacheinander eingehen würden,
+    jeweils ab dem Ausstieg des vorigen. Gibt pro Symbol ein Dict von Arrays
+    zurück (Kerzen relativ zum Symbol, `exit_at = -1` für einen bis zum Ende
+    offenen Trade).
+    """
+    close, open_ = market['Close'], market['Open']
+    entry_idx, exit_idx = flat['entry_idx'], flat['exit_idx']
+    sl, tp = flat.get('sl'), flat.get('tp')
+    trail = flat['trail'][:, None] if 'trail' in flat else None
+    trail_exit = flat['trail_exit'][:, None] if 'trail_exit' in flat else None
+
+    parts = []
+    active, pos = np.asarray(assets), np.asarray(pos)
+    while active.size and (rounds is None or len(parts) < rounds):
+        asset_end = (active + 1) * n
+        j = np.searchsorted(entry_idx, pos)
+        i = entry_idx[np.minimum(j, len(entry_idx) - 1)] if len(entry_idx) else np.zeros(len(active), dtype=np.int64)
+        ok = (j < len(entry_idx)) & (i + 1 < asset_end)
+        active, i, asset_end = active[ok], i[ok], asset_end[ok]
+        if not active.size:
+            break
+        f = i + 1
+        entry_bar = i if trade_on_close else f
+
+        # Signal-Exit: erstes Exit-Signal des Symbols ab der Ausführungskerze, wirkt eine Kerze später
+        m = np.searchsorted(exit_idx, f)
+        sig_bar = np.where(m < len(exit_idx), exit_idx[np.minimum(m, len(exit_idx) - 1)] + 1, asset_end) \
+            if len(exit_idx) else asset_end
+        sig_bar = np.minimum(sig_bar, asset_end)
+        stop0 = sl[i] if sl is not None else np.full(len(i), np.nan)
+        tp_level = tp[i] if tp is not None else np.full(len(i), np.nan)
+        exit_at, exit_price, exit_bar = _scan_exits(np.zeros(len(i), dtype=np.int64), i, f, sig_bar, entry_bar,
+                                                    stop0, tp_level, trail, trail_exit, market, trade_on_close)
+        use_sig = (exit_at < 0) & (sig_bar < asset_end)
+        s = sig_bar[use_sig]
+        exit_at[use_sig] = s
+        exit_price[use_sig] = close[s - 1] if trade_on_close else open_[s]
+        exit_bar[use_sig] = s - 1 if trade_on_close else s
+
+        offset = active * n
+        parts.append(dict(asset=active, i=i - offset, f=f - offset, entry_bar=entry_bar - offset,
+                          exit_at=np.where(exit_at >= 0, exit_at - offset, -1), exit_price=exit_price,
+                          exit_bar=exit_bar - offset))
+        closed = exit_at >= 0
+        active, pos = active[closed], exit_at[closed]
+
+    chains = {}
+    for a in np.asarray(assets):
+        chains[int(a)] = {key: np.concatenate([part[key][part['asset'] == a] for part in parts])
+                          if parts else np.empty(0) for key in ('i', 'f', 'entry_bar', 'exit_at',
+                                                                'exit_price', 'exit_bar')}
+    return chains
+
+
+def _resume_chain(flat, market, n, a, chain, skipped, pos, trade_on_close):
+    """
+    Kette des Symbols `a`, nachdem der Trade Nummer `skipped` verworfen
+    wurde, neu ab Kerze `pos`. Sobald ein neuer Trade an einer Stelle endet,
+    an der die alte Kette flach war, geht es mit der alten Kette weiter.
+    """
+    rest = {key: values[skipped + 1:] for key, values in chain.items()}
+    # Suchbeginn jedes alten Trades = Ausstieg des vorigen
+    searched_from = np.r_[chain['exit_at'][skipped], rest['exit_at'][:-1]][:len(rest['i'])]
+    parts = []
+    while True:
+        step = _trade_chains(flat, market, n, [a], [a * n + pos], trade_on_close, rounds=1)[a]
+        parts.append(step)
+        if not len(step['f']) or step['exit_at'][0] < 0:
+            break
+        pos = int(step['exit_at'][0])
+        join = np.flatnonzero((searched_from <= pos) & (pos <= rest['i']))
+        if join.size:
+            parts.append({key: values[join[0]:] for key, values in rest.items()})
+            break
+    return {key: np.concatenate([part[key] for part in parts]) for key in chain}
+
+
+def portfolio_backtest(frames, signal_func, cash=10_000, commission=0.0, size=1 - np.finfo(float).eps,
+                       trade_on_close=False, how='outer', **params):
+    """
+    Backtest der Signal-Funktion `signal_func` (wie bei `evaluate_grid`, mit
+    den festen Parametern `params`) auf allen Symbolen in `frames` (Dict
+    Symbol -> OHLCV-Frame) mit gemeinsamem Kapital, siehe Modul-Doku.
+
+    Gibt die Kennzahlen des Portfolios als pd.Series zurück wie `bt.run()`
+    mit `_equity_curve`, `_trades` (zusätzliche Spalte `Symbol`) und
+    `_symbols` (Trades, PnL und Buy & Hold pro Symbol). `Buy & Hold` ist
+    das gleichgewichtete Portfolio aller Symbole, jeweils ab der ersten
+    handelbaren Kerze (wie bei backtesting.py nach der Aufwärmphase).
+    """
+    symbols = list(frames)
+    index, aligned, first, present = align_symbols(frames, how)
+    n, count = len(index), len(symbols)
+    flat = _flat_signals(aligned, first, present, signal_func, params, n)
+
+    prices = {col: np.column_stack([np.r_[np.full(first[a], np.nan), aligned[s][col].to_numpy(dtype=float)]
+                                    for a, s in enumerate(symbols)]) for col in OHLC}
+    market = {col: prices[col].T.ravel() for col in OHLC}
+    offsets = np.arange(count) * n
+    flat['entry_idx'] = np.flatnonzero(flat['entries'])
+    flat['entry_idx'] = flat['entry_idx'][flat['entry_idx'] % n >= flat['start'][flat['entry_idx'] // n]]
+    flat['exit_idx'] = np.flatnonzero(flat['exits']) if 'exits' in flat else np.empty(0, dtype=np.int64)
+    stop_dist = flat.get('stop_dist')
+    risk_per_trade = flat.get('risk_per_trade')
+    sizes = np.broadcast_to(flat.get('size', np.full(count, size)), (count,))
+    close = prices['Close']
+
+    chains = _trade_chains(flat, market, n, np.arange(count), offsets + flat['start'], trade_on_close)
+    pointer = dict.fromkeys(range(count), 0)
+    heap = []
+
+    def schedule(a):
+        if pointer[a] < len(chains[a]['f']):
+            heapq.heappush(heap, (int(chains[a]['f'][pointer[a]]), 1, a))
+
+    for a in range(count):
+        schedule(a)
+
+    balance = float(cash)
+    open_positions = {}
+    balance_events = [(0, balance)]
+    position_events = {a: [(0, 0.0, 0.0)] for a in range(count)}
+    trades = []
+
+    while heap:
+        bar, kind, a = heapq.heappop(heap)
+        trade = {key: values[pointer[a]] for key, values in chains[a].items()}
+
+        if kind == 0:
+            # Ausstieg
+            units, price = open_positions.pop(a)
+            exit_price = trade['exit_price']
+            commissions = units * (price + exit_price) * commission
+            balance += units * (exit_price - price) - units * exit_price * commission
+            balance_events.append((bar, balance))
+            position_events[a].append((bar, 0.0, 0.0))
+            trades.append((a, units, int(trade['entry_bar']), int(trade['exit_bar']), price, exit_price,
+                           units * (exit_price - price) - commissions, commissions))
+            pointer[a] += 1
+            schedule(a)
+            continue
+
+        # Einstieg: Größe mit Portfolio-Equity zum Schluss der Signal-Kerze
+        i, f = int(trade['i']), int(trade['f'])
+        price = close[i, a] if trade_on_close else prices['Open'][f, a]
+        equity = balance + sum(u * (close[i, b] - p) for b, (u, p) in open_positions.items())
+        free = balance - sum(u * p for u, p in open_positions.values())
+        if stop_dist is not None:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                dist = stop_dist[a * n + i]
+                order_size = equity * risk_per_trade[a] / dist
+                order_size = np.trunc(order_size) if order_size > 1 else order_size
+                order_size = order_size if dist > 0 else 0
+        else:
+            order_size = sizes[a]
+        units = float(_order_units(free, price, order_size, commission))
+
+        if units <= 0:
+            # Order verworfen: Kette dieses Symbols ab der nächsten Kerze neu suchen
+            chains[a] = _resume_chain(flat, market, n, a, chains[a], pointer[a], i + 1, trade_on_close)
+            pointer[a] = 0
+            schedule(a)
+            continue
+
+        balance -= units * price * commission
+        balance_events.append((f, balance))
+        position_events[a].append((f, units, price))
+        open_positions[a] = (units, price)
+        if trade['exit_at'] >= 0:
+            heapq.heappush(heap, (int(trade['exit_at']), 0, a))
+
+    # Equity = Kontostand + offene Positionen zum Schlusskurs (stückweise aus den Ereignissen)
+    bars = np.arange(n)
+    event_bars, values = map(np.array, zip(*balance_events))
+    equity = values[np.searchsorted(event_bars, bars, side='right') - 1]
+    for a in range(count):
+        event_bars, units, entry = map(np.array, zip(*position_events[a]))
+        current = np.searchsorted(event_bars, bars, side='right') - 1
+        held = units[current] != 0
+        equity[held] += units[current][held] * (close[held, a] - entry[current][held])
+
+    trades = pd.DataFrame(trades, columns=['Asset', 'Size', 'EntryBar', 'ExitBar', 'EntryPrice', 'ExitPrice',
+                                           'PnL', 'Commission'])
+    trades.insert(0, 'Symbol', [symbols[a] for a in trades.pop('Asset')])
+    trades['ReturnPct'] = trades['PnL'] / (trades['Size'] * trades['EntryPrice'])
+    trades['EntryTime'] = index[trades['EntryBar'].to_numpy(dtype=int)]
+    trades['ExitTime'] = index[trades['ExitBar'].to_numpy(dtype=int)]
+    trades['Duration'] = trades['ExitTime'] - trades['EntryTime']
+
+    # Gleichgewichtetes Buy & Hold: jedes Symbol ab seiner ersten handelbaren Kerze, vorher Kasse
+    base = close[flat['start'] - 1, np.arange(count)]
+    growth = np.where(np.arange(n)[:, None] >= flat['start'] - 1, close / base, 1.0)
+    benchmark = pd.DataFrame({'Close': growth.mean(axis=1)}, index=index)
+    stats = compute_stats(equity, trades, benchmark)
+
+    last = close[-1]
+    per_symbol = trades.groupby('Symbol').agg(**{'# Trades': ('PnL', 'size'), 'PnL [$]': ('PnL', 'sum'),
+                                                'Win Rate [%]': ('PnL', lambda pl: (pl > 0).mean() * 100)})
+    per_symbol = per_symbol.reindex(symbols)
+    per_symbol['# Trades'] = per_symbol['# Trades'].fillna(0).astype(int)
+    per_symbol['Open Position'] = [open_positions.get(a, (0.0, 0.0))[0] for a in range(count)]
+    per_symbol['Buy & Hold Return [%]'] = (last / base - 1) * 100
+    per_symbol.index.name = 'Symbol'
+    stats['_symbols'] = per_symbol
+    return stats
@@ -1,61 +1,303 @@
 # prepare_data.py
 
+import glob
+import hashlib
+import json
+import os
+
 import pandas as pd
 
-def load_and_prepare_data(file_path):
+from project_goldengo.data_quality import SCAN_VERSION, describe, repair_ohlcv, scan_ohlcv
+
+# Parquet braucht pyarrow. Ohne pyarrow fällt der Cache auf Pickle zurück.
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+# Bei Änderungen am Inhalt der vorbereiteten Frames (Spalten, dtypes) erhöhen,
+# dann werden alte Cache-Einträge nicht mehr gelesen und neu geschrieben.
+# 2: schneller CSV-Weg, alle bekannten Spalten als float64
+CACHE_VERSION = 2
+
+# Unterordner (neben der CSV-Datei), in dem die vorbereiteten Frames liegen
+CACHE_SUBDIR = '.goldengo_cache'
+# Urteil von `scan_ohlcv` neben dem Cache-Eintrag: `<name>.<schlüssel>.quality.json`
+QUALITY_SUFFIX = '.quality.json'
+
+# Mit pyarrow liest pandas CSV-Dateien mehrspurig und erkennt Zeitstempel selbst
+CSV_READ_OPTIONS = {'engine': 'pyarrow'} if CACHE_FORMAT == 'parquet' else {}
+
+REQUIRED_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+# Spalten, die der schnelle Weg kennt (nach `_standard_columns`)
+KNOWN_COLUMNS = REQUIRED_COLUMNS + ['Adj close']
+
+
+def _cache_key(file_path):
+    """
+    Schlüssel für den Cache: absoluter Pfad + Änderungszeit + Dateigröße +
+    `CACHE_VERSION`. Sobald sich die CSV-Datei oder das Format ändert,
+    passt der Schlüssel nicht mehr.
+    """
+    stat = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{CACHE_VERSION}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def _cache_path(file_path, cache_dir=None):
+    """Gibt den Pfad der Cache-Datei für `file_path` zurück."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_SUBDIR)
+    extension = 'parquet' if CACHE_FORMAT == 'parquet' else 'pkl'
+    name = os.path.basename(file_path)
+    return os.path.join(cache_dir, f"{name}.{_cache_key(file_path)}.{extension}")
+
+
+def _read_cache(cache_file):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(cache_file)
+    return pd.read_pickle(cache_file)
+
+
+def _write_cache(data, cache_file):
+    """
+    Schreibt den vorbereiteten Frame in den Cache und entfernt veraltete
+    Einträge derselben Quelldatei. Geschrieben wird zuerst in eine temporäre
+    Datei, damit ein abgebrochener Lauf keinen halben Cache hinterlässt.
+    """
+    cache_dir = os.path.dirname(cache_file)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    tmp_file = cache_file + '.tmp'
+    if CACHE_FORMAT == 'parquet':
+        data.to_parquet(tmp_file)
+    else:
+        data.to_pickle(tmp_file)
+    os.replace(tmp_file, cache_file)
+    _remove_stale(cache_file, '.' + cache_file.rsplit('.', 1)[1])
+
+
+def _remove_stale(current_file, suffix):
+    """Entfernt Einträge derselben Quelldatei mit anderem Schlüssel."""
+    # Alte Einträge haben dasselbe Muster "<name>.<16 Zeichen Schlüssel><suffix>"
+    name, key = os.path.basename(current_file)[:-len(suffix)].rsplit('.', 1)
+    pattern = f"{glob.escape(name)}.{'?' * len(key)}{suffix}"
+    for old_file in glob.glob(os.path.join(glob.escape(os.path.dirname(current_file)), pattern)):
+        if old_file != current_file:
+            os.remove(old_file)
+
+
+def _quality_path(cache_file):
+    return cache_file.rsplit('.', 1)[0] + QUALITY_SUFFIX
+
+
+def _read_quality(quality_file):
+    """Gespeichertes Urteil oder None (fehlt, kaputt oder alte Version)."""
+    try:
+        with open(quality_file, encoding='utf-8') as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return report if report.get('version') == SCAN_VERSION else None
+
+
+def _quality_report(data, cache_file, fresh=False):
+    """
+    Urteil von `scan_ohlcv` für `data`. Mit Cache wird es neben dem Eintrag
+    gespeichert und beim nächsten Laden nur gelesen (außer `fresh=True`,
+    wenn die Daten gerade neu eingelesen wurden).
+    """
+    quality_file = _quality_path(cache_file) if cache_file else None
+    report = _read_quality(quality_file) if quality_file and not fresh else None
+    if report is not None:
+        return report
+
+    report = scan_ohlcv(data)
+    if quality_file:
+        try:
+            os.makedirs(os.path.dirname(quality_file), exist_ok=True)
+            tmp_file = quality_file + '.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(report, f)
+            os.replace(tmp_file, quality_file)
+            _remove_stale(quality_file, QUALITY_SUFFIX)
+        except OSError as e:
+            print(f"⚠️ Prüfergebnis konnte nicht gespeichert werden: {e}")
+    return report
+
+
+def _standard_columns(columns):
+    """Spaltennamen wie 'close', 'Adj Close' oder 'price' auf 'Close', 'Adj close' usw. bringen."""
+    rename_map = {'price': 'Close', 'adj close': 'Adj Close'}
+    return [rename_map.get(col.lower(), col.lower()).capitalize() for col in columns]
+
+
+def _sniff_layout(file_path):
+    """
+    Erkennt die bekannten Layouts an den ersten Zeilen:
+
+    - eine Kopfzeile `Date,Open,High,Low,Close,Volume` (Binance `_full.csv`,
+      alte yfinance-Exporte, auch mit `Adj Close`)
+    - drei Kopfzeilen `Price,...` / `Ticker,...` / `Date,,,` (yfinance mit
+      MultiIndex-Spalten)
+
+    Gibt (Anzahl Kopfzeilen, Spaltennamen ohne Datum) zurück oder None.
+    """
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        head = [f.readline().rstrip('\r\n') for _ in range(3)]
+    fields = head[0].split(',')
+    columns = _standard_columns(fields[1:])
+    if not set(REQUIRED_COLUMNS) <= set(columns) or not set(columns) <= set(KNOWN_COLUMNS):
+        return None
+    if fields[0].lower() in ('date', 'datetime'):
+        return 1, columns
+    if fields[0].lower() == 'price' and head[1].startswith('Ticker,') and head[2].startswith('Date,'):
+        return 3, columns
+    return None
+
+
+def _parse_known_layout(file_path, layout):
+    """
+    Schneller Weg für bekannte Layouts: feste Spalten, float64 ohne
+    Typ-Erkennung, Zeitstempel direkt beim Lesen (mit pyarrow). Wirft eine
+    Exception, wenn die Datei doch nicht passt.
+    """
+    header_rows, columns = layout
+    data = pd.read_csv(file_path, skiprows=header_rows, header=None, names=['Date'] + columns,
+                       index_col=0, dtype=dict.fromkeys(columns, 'float64'), **CSV_READ_OPTIONS)
+    index = data.index
+    if not (isinstance(index, pd.DatetimeIndex) and index.tz is not None):
+        # Ohne pyarrow bzw. reine Datumsangaben (yfinance) kommt der Index als Text/Datum
+        index = pd.to_datetime(index, format='ISO8601', utc=True)
+    data.index = index.tz_convert('UTC').as_unit('us').rename('Date')
+    return data
+
+
+def _parse_csv(file_path):
     """
     Liest eine CSV-Datei, bereinigt sie und bereitet sie für backtesting.py vor.
     Diese Funktion ist so gebaut, dass sie häufige Datenprobleme automatisch löst.
+
+    Bekannte Layouts (siehe `_sniff_layout`) gehen über den schnellen Weg,
+    alles andere oder Dateien mit kaputten Zeilen über den robusten.
+    """
+    layout = _sniff_layout(file_path)
+    if layout is not None:
+        try:
+            return _clean(_parse_known_layout(file_path, layout))
+        except (ValueError, TypeError) as e:
+            print(f"INFO: Schnelles Einlesen nicht möglich ({e}), lese robust.")
+    return _parse_csv_robust(file_path)
+
+
+def _parse_csv_robust(file_path):
+    """Robuster Weg für unbekannte Layouts und unsaubere Dateien."""
+    # SCHRITT 1: DATEN LADEN
+    data = pd.read_csv(file_path, index_col=0)
+
+    # =============================================================================
+    # NEUER REINIGUNGSSCHRITT: "SCHMUTZIGE" ZEILEN IM INDEX ENTFERNEN
+    # =============================================================================
+    # Wir versuchen, den Index in eine Zahl umzuwandeln. Alles, was keine Zahl ist
+    # (wie das Wort "Ticker" oder andere Texte), wird zu 'NaT' (Not a Time) / 'NaN'.
+    # 'errors=coerce' ist der Schlüssel hierfür.
+    original_index = data.index
+    clean_index = pd.to_datetime(original_index, errors='coerce', utc=True)
+
+    # Wir behalten nur die Zeilen, bei denen die Umwandlung erfolgreich war.
+    # Alle Zeilen, in denen "Ticker" o.ä. stand, werden hier entfernt.
+    valid = clean_index.notna()
+    data = data[valid]
+
+    # Wir weisen den jetzt sauberen Index wieder zu (ohne ein zweites Parsen).
+    data.index = clean_index[valid]
+    data.index.name = 'Date'
+
+    # SCHRITT 3: SPALTENNAMEN STANDARDISIEREN
+    data.columns = _standard_columns(data.columns)
+
+    # SCHRITT 4: DATENTYPEN VALIDIEREN
+    for col in REQUIRED_COLUMNS:
+        if col not in data.columns:
+            print(f"❌ FEHLER: Die erwartete Spalte '{col}' wurde nicht gefunden.")
+            return None
+        data[col] = pd.to_numeric(data[col], errors='coerce')
+
+    return _clean(data)
+
+
+def _clean(data):
+    # SCHRITT 5: DATEN SÄUBERN
+    initial_rows = len(data)
+    data.dropna(inplace=True)
+
+    if len(data) < initial_rows:
+        print(f"INFO: {initial_rows - len(data)} Zeilen mit fehlenden Werten wurden entfernt.")
+
+    if data.empty:
+        print("❌ FEHLER: Nach der Bereinigung sind keine gültigen Daten mehr übrig.")
+        return None
+
+    return data
+
+
+def load_and_prepare_data(file_path, use_cache=True, rebuild_cache=False, cache_dir=None,
+                          repair=False, fill_gaps=False):
+    """
+    Liest eine CSV-Datei, bereinigt sie und bereitet sie für backtesting.py vor.
+    Diese Funktion ist so gebaut, dass sie häufige Datenprobleme automatisch löst.
+
+    Das Ergebnis wird binär (Parquet bzw. Pickle) im Ordner `.goldengo_cache`
+    neben der CSV-Datei zwischengespeichert. Der Cache-Schlüssel besteht aus
+    Pfad, Änderungszeit und Größe der Datei, wiederholte Aufrufe sparen sich
+    also das komplette CSV-Parsing.
+
+    - `use_cache=False` umgeht den Cache vollständig (weder lesen noch schreiben).
+    - `rebuild_cache=True` ignoriert einen vorhandenen Eintrag und schreibt ihn neu.
+    - `cache_dir` überschreibt den Speicherort des Caches.
+
+    Die Daten werden auf Lücken, doppelte/unsortierte Zeitstempel und kaputte
+    Kerzen geprüft (`scan_ohlcv`); das Urteil liegt neben dem Cache-Eintrag.
+    Auffälligkeiten werden gemeldet, der Frame bleibt aber unverändert, außer:
+
+    - `repair=True` sortiert und entfernt doppelte Zeitstempel,
+      `fill_gaps=True` füllt zusätzlich fehlende Kerzen auf (`repair_ohlcv`).
     """
     print(f"--- Starte Datenvorbereitung für: {file_path} ---")
 
     try:
-        # SCHRITT 1: DATEN LADEN
-        data = pd.read_csv(file_path, index_col=0)
-        
-        # =============================================================================
-        # NEUER REINIGUNGSSCHRITT: "SCHMUTZIGE" ZEILEN IM INDEX ENTFERNEN
-        # =============================================================================
-        # Wir versuchen, den Index in eine Zahl umzuwandeln. Alles, was keine Zahl ist
-        # (wie das Wort "Ticker" oder andere Texte), wird zu 'NaT' (Not a Time) / 'NaN'.
-        # 'errors=coerce' ist der Schlüssel hierfür.
-        original_index = data.index
-        clean_index = pd.to_datetime(original_index, errors='coerce', utc=True)
-        
-        # Wir behalten nur die Zeilen, bei denen die Umwandlung erfolgreich war.
-        # Alle Zeilen, in denen "Ticker" o.ä. stand, werden hier entfernt.
-        data = data[clean_index.notna()]
-        
-        # Wir weisen den jetzt sauberen Index wieder zu.
-        data.index = pd.to_datetime(data.index, utc=True)
-        data.index.name = 'Date'
-        
-        # SCHRITT 3: SPALTENNAMEN STANDARDISIEREN
-        data.columns = data.columns.str.lower()
-        rename_map = {'price': 'Close', 'adj close': 'Adj Close'}
-        data.rename(columns=rename_map, inplace=True)
-        data.columns = [col.capitalize() for col in data.columns]
-
-        # SCHRITT 4: DATENTYPEN VALIDIEREN
-        required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-        for col in required_columns:
-            if col not in data.columns:
-                print(f"❌ FEHLER: Die erwartete Spalte '{col}' wurde nicht gefunden.")
+        cache_file = _cache_path(file_path, cache_dir) if use_cache else None
+
+        data = None
+        if cache_file and not rebuild_cache and os.path.exists(cache_file):
+            try:
+                data = _read_cache(cache_file)
+                print("✅ Daten aus dem Cache geladen.")
+            except Exception as e:
+                print(f"⚠️ Cache konnte nicht gelesen werden, lese CSV neu: {e}")
+
+        fresh = data is None
+        if fresh:
+            data = _parse_csv(file_path)
+            if data is None:
                 return None
-            data[col] = pd.to_numeric(data[col], errors='coerce')
-        
-        # SCHRITT 5: DATEN SÄUBERN
-        initial_rows = len(data)
-        data.dropna(inplace=True)
-        
-        if len(data) < initial_rows:
-            print(f"INFO: {initial_rows - len(data)} Zeilen mit fehlenden Werten wurden entfernt.")
-
-        if data.empty:
-            print("❌ FEHLER: Nach der Bereinigung sind keine gültigen Daten mehr übrig.")
-            return None
 
-        print("✅ Datenvorbereitung erfolgreich abgeschlossen.")
+            if cache_file:
+                try:
+                    _write_cache(data, cache_file)
+                except Exception as e:
+                    print(f"⚠️ Cache konnte nicht geschrieben werden: {e}")
+
+        report = _quality_report(data, cache_file, fresh=fresh)
+        if not report['ok']:
+            print(f"⚠️ Datenqualität: {describe(report)}")
+            if repair or fill_gaps:
+                data = repair_ohlcv(data, fill_gaps=fill_gaps, step_seconds=report['step_seconds'])
+                print(f"INFO: Daten repariert, {len(data)} Zeilen.")
+
+        if fresh:
+            print("✅ Datenvorbereitung erfolgreich abgeschlossen.")
         return data
 
     except FileNotFoundError:
@@ -64,3 +306,23 @@ def load_and_prepare_data(file_path):
     except Exception as e:
         print(f"❌ Ein unerwarteter Fehler ist aufgetreten: {e}")
         return None
+
+
+def load_quality_report(file_path, cache_dir=None):
+    """
+    Gespeichertes Prüfergebnis (siehe `scan_ohlcv`) für `file_path`. Fehlt
+    es oder ist der Cache veraltet, wird die Datei über
+    `load_and_prepare_data` geladen und das Ergebnis dabei erzeugt.
+    """
+    try:
+        quality_file = _quality_path(_cache_path(file_path, cache_dir))
+    except FileNotFoundError:
+        print(f"❌ FEHLER: Die Datei unter dem Pfad '{file_path}' wurde nicht gefunden.")
+        return None
+    report = _read_quality(quality_file)
+    if report is not None:
+        return report
+    data = load_and_prepare_data(file_path, cache_dir=cache_dir)
+    if data is None:
+        return None
+    return _quality_report(data, _cache_path(file_path, cache_dir))
@@ -0,0 +1,233 @@
+# resample.py
+"""
+Gröbere Intervalle (15m, 1h, 4h, 1d, ...) aus der feinsten gespeicherten Reihe.
+
+Eine 15m-Kerze ist nichts anderes als drei 5m-Kerzen: Open der ersten, High-
+Maximum, Low-Minimum, Close der letzten, Volumen-Summe. Statt jedes Intervall
+einzeln bei Binance zu laden, wird nur das Basisintervall geladen und der
+Rest hier abgeleitet. Die Kerzen sind wie bei Binance an UTC ausgerichtet
+(Stunden/Tage ab Mitternacht, Wochen ab Montag), beschriftet mit ihrem
+Beginn. Lücken in den Basisdaten erzeugen keine leeren Kerzen.
+
+- `resample_ohlcv(data, '1h')`: reine Umrechnung eines Frames
+- `update_resampled(derived, base, '1h')`: rechnet nur ab der letzten
+  abgeleiteten Kerze neu (die noch unvollständig gewesen sein kann)
+- `load_resampled(base_csv, '1h')`: wie `load_and_prepare_data`, mit
+  binärem Cache pro Intervall, der inkrementell fortgeschrieben wird
+- `resample_to_csv(base_csv, '15m', out_csv)`: hängt neue, vollständige
+  Kerzen an eine CSV-Datei an (für `load_data`)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.prepare_data import CACHE_FORMAT, CACHE_SUBDIR, load_and_prepare_data
+
+UNIT_NS = {'m': 60 * 10 ** 9, 'h': 3600 * 10 ** 9, 'd': 86400 * 10 ** 9, 'w': 7 * 86400 * 10 ** 9}
+
+# 1970-01-01 war ein Donnerstag; Wochenkerzen beginnen wie bei Binance am Montag
+_WEEK_ORIGIN_NS = 4 * 86400 * 10 ** 9
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def interval_to_ns(interval):
+    """Wandelt ein Intervall wie '15m', '4h' oder '1d' in Nanosekunden um."""
+    try:
+        return int(interval[:-1]) * UNIT_NS[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unbekanntes Intervall '{interval}' (erwartet z.B. '15m', '1h', '4h', '1d', '1w')")
+
+
+_NS_PER_UNIT = {'s': 10 ** 9, 'ms': 10 ** 6, 'us': 10 ** 3, 'ns': 1}
+
+
+def _epoch(index):
+    """
+    Zeitstempel als int64 seit 1970-01-01 UTC in der Einheit des Index (auch
+    bei Zeitzonen ohne Umrechnung) und Nanosekunden pro Schritt. Ein
+    `as_unit('ns')` würde den ganzen Index kopieren und prüfen.
+    """
+    index = pd.DatetimeIndex(index)
+    return index.asi8, _NS_PER_UNIT[index.unit]
+
+
+def _epoch_ns(index):
+    stamps, ns_per_step = _epoch(index)
+    return stamps * ns_per_step
+
+
+def _bins(index, interval):
+    """Startzeit der Zielkerze für jede Basiskerze (int64 in der Einheit des Index)."""
+    stamps, ns_per_step = _epoch(index)
+    step = interval_to_ns(interval) // ns_per_step
+    origin = _WEEK_ORIGIN_NS // ns_per_step if interval.endswith('w') else 0
+    return (stamps - origin) // step * step + origin
+
+
+def resample_ohlcv(data, interval):
+    """
+    Fasst einen OHLCV-Frame (DatetimeIndex, aufsteigend) zu Kerzen der Länge
+    `interval` zusammen. Weitere Spalten werden nicht übernommen.
+    """
+    if not data.index.is_monotonic_increasing:
+        data = data.sort_index()
+    if data.empty:
+        return data[OHLCV_COLUMNS].copy()
+
+    bins = _bins(data.index, interval)
+    starts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+    ends = np.r_[starts[1:], len(bins)] - 1
+
+    values = {col: data[col].to_numpy(dtype=float) for col in OHLCV_COLUMNS}
+    out = {
+        'Open': values['Open'][starts],
+        'High': np.maximum.reduceat(values['High'], starts),
+        'Low': np.minimum.reduceat(values['Low'], starts),
+        'Close': values['Close'][ends],
+        'Volume': np.add.reduceat(values['Volume'], starts),
+    }
+    index = pd.DatetimeIndex(bins[starts].astype(f'datetime64[{data.index.unit}]'), name=data.index.name)
+    tz = data.index.tz
+    index = index.tz_localize('UTC').tz_convert(tz) if tz is not None else index
+    return pd.DataFrame(out, index=index, columns=OHLCV_COLUMNS)
+
+
+def update_resampled(derived, base, interval):
+    """
+    Schreibt einen abgeleiteten Frame fort. Neu gerechnet wird nur ab dem
+    Beginn der letzten abgeleiteten Kerze; alles davor bleibt unverändert.
+    Setzt voraus, dass `base` nur hinten wächst (wie beim Download).
+    """
+    if derived is None or derived.empty:
+        return resample_ohlcv(base, interval)
+    tail = base[base.index >= derived.index[-1]]
+    return pd.concat([derived.iloc[:-1], resample_ohlcv(tail, interval)])
+
+
+def complete_bars(derived, base, interval):
+    """
+    Entfernt die letzte abgeleitete Kerze, wenn ihr Zeitraum in `base` noch
+    nicht abgeschlossen ist (die letzte Basiskerze endet vor dem Kerzenende).
+    """
+    if derived.empty or len(base) < 2:
+        return derived
+    base_step = int(np.median(np.diff(_epoch_ns(base.index[-100:]))))
+    last_base_end = _epoch_ns(base.index[-1:])[0] + base_step
+    last_bar_end = _epoch_ns(derived.index[-1:])[0] + interval_to_ns(interval)
+    return derived if last_base_end >= last_bar_end else derived.iloc[:-1]
+
+
+def _resampled_cache_path(base_path, interval, cache_dir=None):
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(base_path)), CACHE_SUBDIR)
+    extension = 'parquet' if CACHE_FORMAT == 'parquet' else 'pkl'
+    return os.path.join(cache_dir, f"{os.path.basename(base_path)}.{interval}.{extension}")
+
+
+def _read_derived(cache_file):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(cache_file)
+    return pd.read_pickle(cache_file)
+
+
+def _write_derived(data, cache_file):
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = cache_file + '.tmp'
+    if CACHE_FORMAT == 'parquet':
+        data.to_parquet(tmp_file)
+    else:
+        data.to_pickle(tmp_file)
+    os.replace(tmp_file, cache_file)
+
+
+def _consistent(derived, base, interval):
+    """
+    Stichprobe, ob der Cache zu den Basisdaten passt: die vorletzte
+    abgeleitete Kerze wird aus `base` neu gerechnet und verglichen.
+    """
+    if len(derived) < 2:
+        return True
+    start = derived.index[-2]
+    bar = resample_ohlcv(base[(base.index >= start) & (base.index < derived.index[-1])], interval)
+    return len(bar) == 1 and bar.index[0] == start and np.allclose(
+        bar.to_numpy(), derived.iloc[[-2]][OHLCV_COLUMNS].to_numpy(), equal_nan=True)
+
+
+def load_resampled(base_path, interval, cache_dir=None, rebuild_cache=False):
+    """
+    Lädt die Basisdaten `base_path` (über `load_and_prepare_data`) und gibt
+    sie im Intervall `interval` zurück. Der abgeleitete Frame wird neben dem
+    Cache der Basisdaten abgelegt und beim nächsten Aufruf nur um die neuen
+    Kerzen ergänzt. Passt der Cache nicht mehr zu den Basisdaten (z.B. nach
+    einer Reparatur), wird er neu aufgebaut.
+    """
+    base = load_and_prepare_data(base_path, cache_dir=cache_dir)
+    if base is None:
+        return None
+    return _derive_cached(base, base_path, interval, cache_dir, rebuild_cache)
+
+
+def _derive_cached(base, base_path, interval, cache_dir=None, rebuild_cache=False):
+    cache_file = _resampled_cache_path(base_path, interval, cache_dir)
+    derived = None
+    if not rebuild_cache and os.path.exists(cache_file):
+        try:
+            derived = _read_derived(cache_file)
+        except Exception as e:
+            print(f"⚠️ Cache ({interval}) konnte nicht gelesen werden, rechne neu: {e}")
+        if derived is not None and not _consistent(derived, base, interval):
+            print(f"INFO: Cache ({interval}) passt nicht mehr zu den Basisdaten, rechne neu.")
+            derived = None
+
+    previous = derived
+    derived = update_resampled(previous, base, interval)
+    if previous is not None and len(derived) == len(previous) and derived.iloc[[-1]].equals(previous.iloc[[-1]]):
+        # Keine neuen Basiskerzen: der Cache ist aktuell
+        return derived
+    try:
+        _write_derived(derived, cache_file)
+    except Exception as e:
+        print(f"⚠️ Cache ({interval}) konnte nicht geschrieben werden: {e}")
+    if previous is None:
+        print(f"✅ {interval}: {len(derived)} Kerzen aus {len(base)} Basiskerzen abgeleitet.")
+    else:
+        print(f"✅ {interval}: {len(derived) - len(previous) + 1} Kerzen aktualisiert ({len(derived)} gesamt).")
+    return derived
+
+
+def _last_csv_timestamp(filepath):
+    """Zeitstempel der letzten Zeile einer CSV-Datei (nur das Dateiende wird gelesen)."""
+    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+        return None
+    with open(filepath, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 4096))
+        lines = f.read().decode('utf-8').strip().splitlines()
+    first_field = lines[-1].split(',')[0] if lines else 'Date'
+    return None if first_field == 'Date' else pd.Timestamp(first_field)
+
+
+def resample_to_csv(base_path, interval, out_path, cache_dir=None):
+    """
+    Leitet `interval` aus der CSV-Datei `base_path` ab und hängt alle
+    vollständigen Kerzen, die `out_path` noch nicht enthält, an `out_path`
+    an (gleiches Format wie die Binance-Downloads). Gibt die Anzahl neuer
+    Zeilen zurück.
+    """
+    base = load_and_prepare_data(base_path, cache_dir=cache_dir)
+    if base is None:
+        return 0
+    derived = complete_bars(_derive_cached(base, base_path, interval, cache_dir), base, interval)
+
+    last_ts = _last_csv_timestamp(out_path)
+    if last_ts is not None:
+        derived = derived[derived.index > last_ts]
+    if derived.empty:
+        return 0
+
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    derived.to_csv(out_path, mode='a', header=last_ts is None)
+    return len(derived)
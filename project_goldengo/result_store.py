@@ -0,0 +1,162 @@
+# result_store.py
+"""
+Persistenter Speicher für Optimierungsergebnisse (SQLite).
+
+Jede gerechnete Parameterkombination wird mit allen Kennzahlen unter dem
+Schlüssel (Quelltext-Hash der Strategie, Fingerabdruck der Daten,
+Backtest-Argumente, Parameter) abgelegt. Ein erneuter Lauf mit denselben
+Eingaben holt bekannte Kombinationen aus der Datenbank und rechnet nur die
+neuen. Weil nach jedem Block geschrieben wird, setzt ein abgebrochener Lauf
+beim nächsten Start dort fort, wo er aufgehört hat.
+
+    store = ResultStore('backtest_results/optimizer_results.sqlite')
+    heatmap = optimize(df, grid_signals, store=store, strategy=DynamicMomentumCrossover,
+                       fast_ema=range(10, 61, 10), ...)
+
+Ändert sich der Quelltext der Strategie (oder der Signal-Funktion), die Daten
+oder z.B. die Kommission, entsteht ein neuer Schlüssel; alte Ergebnisse
+werden dann nicht mehr verwendet.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    run_key  TEXT NOT NULL,
+    data_key TEXT NOT NULL,
+    params   TEXT NOT NULL,
+    stats    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    PRIMARY KEY (run_key, data_key, params)
+)
+"""
+
+
+def _plain(value):
+    """NumPy-Skalare in Python-Werte umwandeln, damit sie sich als JSON schreiben lassen."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def source_hash(*objects):
+    """
+    SHA1 über den Quelltext von Klassen bzw. Funktionen. Ohne verfügbaren
+    Quelltext (z.B. interaktiv definiert) zählen Modul, Name und Bytecode.
+    """
+    digest = hashlib.sha1()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode('utf-8'))
+        except (OSError, TypeError):
+            digest.update(f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', obj)!r}".encode())
+            code = getattr(obj, '__code__', None)
+            if code is not None:
+                digest.update(code.co_code)
+    return digest.hexdigest()
+
+
+def data_fingerprint(data):
+    """SHA1 über Index, Spaltennamen und Werte eines OHLCV-DataFrames."""
+    digest = hashlib.sha1()
+    digest.update(repr(list(data.columns)).encode('utf-8'))
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(str(index.tz).encode('utf-8'))
+        index = (index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index)
+        index = index.as_unit('ns').asi8
+    digest.update(np.ascontiguousarray(np.asarray(index)).tobytes())
+    digest.update(np.ascontiguousarray(data.to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def params_key(params):
+    """Parameterkombination als stabiler JSON-Text (sortierte Schlüssel)."""
+    return json.dumps({name: _plain(value) for name, value in params.items()}, sort_keys=True)
+
+
+class ResultStore:
+    """
+    SQLite-Datei mit einer Zeile pro (Lauf, Daten, Parameter). Mehrere
+    Prozesse (z.B. `run_batch`) dürfen gleichzeitig in dieselbe Datei
+    schreiben; die Verbindung wird pro Prozess beim ersten Zugriff geöffnet.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    def _connect(self):
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=self.timeout)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(_SCHEMA)
+            self._pid = os.getpid()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # Verbindungen lassen sich nicht an andere Prozesse schicken
+        return {'path': self.path, 'timeout': self.timeout, '_conn': None, '_pid': None}
+
+    @staticmethod
+    def run_key(*strategy, **bt_kwargs):
+        """
+        Schlüssel eines Laufs: Quelltext-Hash von `strategy` (Strategie-Klasse,
+        Signal-Funktion, ...) und die Backtest-Argumente (cash, commission, ...).
+        """
+        kwargs = json.dumps({k: _plain(v) for k, v in bt_kwargs.items()}, sort_keys=True, default=repr)
+        return hashlib.sha1(f"{source_hash(*strategy)}|{kwargs}".encode('utf-8')).hexdigest()
+
+    def load(self, run_key, data_key, combos):
+        """
+        Gespeicherte Kennzahlen für `combos`. Gibt ein Dict
+        {Position in combos: Kennzahlen-Dict} für alle bekannten Kombinationen zurück.
+        """
+        wanted = {}
+        for i, combo in enumerate(combos):
+            wanted.setdefault(params_key(combo), []).append(i)
+        found = {}
+        rows = self._connect().execute(
+            'SELECT params, stats FROM results WHERE run_key = ? AND data_key = ?', (run_key, data_key))
+        for params, stats in rows:
+            for i in wanted.get(params, ()):
+                found[i] = json.loads(stats)
+        return found
+
+    def save(self, run_key, data_key, combos, stats):
+        """Schreibt die Kennzahlen (DataFrame, eine Zeile pro Kombination) in einer Transaktion."""
+        now = time.time()
+        records = [(run_key, data_key, params_key(combo),
+                    json.dumps({k: _plain(v) for k, v in row.items()}), now)
+                   for combo, row in zip(combos, stats.to_dict('records'))]
+        conn = self._connect()
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', records)
+
+    def count(self, run_key=None):
+        """Anzahl gespeicherter Kombinationen (insgesamt oder für einen Lauf)."""
+        if run_key is None:
+            return self._connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+        return self._connect().execute('SELECT COUNT(*) FROM results WHERE run_key = ?',
+                                       (run_key,)).fetchone()[0]
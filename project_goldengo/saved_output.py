@@ -1,12 +1,32 @@
 import os
 import csv
+import atexit
+import itertools
+import uuid
+import multiprocessing.util
 from datetime import datetime
 import pandas as pd
-import matplotlib.pyplot as plt
 
-# Basisverzeichnis für alle Outputs
+from project_goldengo.charts import default_renderer, record_chart
+
+# Parquet braucht pyarrow. Ohne pyarrow schreibt der ResultSink gzip-Pickles.
+try:
+    import pyarrow  # noqa: F401
+    RESULT_FORMAT = 'parquet'
+except ImportError:
+    RESULT_FORMAT = 'pickle'
+
+# Basisverzeichnis für alle Outputs (wird erst beim ersten Speichern angelegt)
 LOG_DIR = "backtest_results"
-os.makedirs(LOG_DIR, exist_ok=True)
+
+# Unterordner von LOG_DIR für die Tabellen des ResultSink
+RESULTS_SUBDIR = "results"
+
+
+def _log_path(filename):
+    """Pfad in LOG_DIR; legt das Verzeichnis bei Bedarf an."""
+    os.makedirs(LOG_DIR, exist_ok=True)
+    return os.path.join(LOG_DIR, filename)
 
 
 def save_metrics(stats, strategy_name, file_stem):
@@ -27,7 +47,7 @@ def save_metrics(stats, strategy_name, file_stem):
         'Num Trades': stats.get('# Trades', float('nan')),
         'Win Rate [%]': stats.get('Win Rate [%]', float('nan'))
     }
-    filepath = os.path.join(LOG_DIR, f"{file_stem}_metrics_{timestamp}.csv")
+    filepath = _log_path(f"{file_stem}_metrics_{timestamp}.csv")
     pd.DataFrame([metrics]).to_csv(filepath, index=False)
     print(f"✅ Kennzahlen gespeichert: {filepath}")
 
@@ -35,7 +55,7 @@ def save_metrics(stats, strategy_name, file_stem):
 def save_equity_curve(stats, file_stem):
     """Speichert die Equity-Kurve des Backtests als CSV."""
     eq = stats._equity_curve
-    filepath = os.path.join(LOG_DIR, f"{file_stem}_equity_curve.csv")
+    filepath = _log_path(f"{file_stem}_equity_curve.csv")
     eq.to_csv(filepath)
     print(f"✅ Equity Curve gespeichert: {filepath}")
 
@@ -43,36 +63,181 @@ def save_equity_curve(stats, file_stem):
 def save_trades(stats, file_stem):
     """Speichert alle Trades des Backtests als CSV."""
     trades = stats._trades
-    filepath = os.path.join(LOG_DIR, f"{file_stem}_trades.csv")
+    filepath = _log_path(f"{file_stem}_trades.csv")
     trades.to_csv(filepath, index=False)
     print(f"✅ Trades gespeichert: {filepath}")
 
 
-def save_chart(bt, stats, file_stem):
-    """Erzeugt und speichert den Chart des Backtests als PNG-Datei."""
-    figs = bt.plot()
-    if figs:
-        fig = figs[0]
-        filepath = os.path.join(LOG_DIR, f"{file_stem}_equity_chart.png")
-        fig.savefig(filepath)
-        plt.close(fig)
-        print(f"✅ Chart gespeichert: {filepath}")
+def save_chart(bt, stats, file_stem, renderer=None, fmt='png'):
+    """
+    Plant den Chart des Backtests als PNG- (oder mit `fmt='html'`
+    HTML-)Datei ein. Erfasst werden nur die reduzierten Chart-Daten, gezeichnet
+    wird im Hintergrund vom `renderer` (Standard: `charts.default_renderer()`,
+    spätestens beim Prozessende). Gibt den Zielpfad zurück.
+    """
+    filepath = _log_path(f"{file_stem}_equity_chart.{fmt}")
+    chart = record_chart(bt, stats, file_stem)
+    (renderer or default_renderer()).submit(chart, filepath)
+    print(f"✅ Chart eingeplant: {filepath}")
+    return filepath
+
+
+def _part_extension():
+    return 'parquet' if RESULT_FORMAT == 'parquet' else 'pkl.gz'
+
+
+class ResultSink:
+    """
+    Sammelt Ergebnisse vieler Backtests im Speicher und schreibt sie gebündelt.
+
+    Jede Tabelle (`metrics`, `equity`, `trades` oder ein eigener Name) ist ein
+    Ordner unter `<directory>/results/` mit angehängten, komprimierten
+    Spalten-Dateien (`part-*.parquet`). Bestehende Dateien werden nie
+    umgeschrieben. Ein Flush schreibt pro Tabelle eine Datei, ein Sweep über
+    1000 Läufe erzeugt also nur eine Handvoll Dateien statt Tausender CSVs.
+    Equity-Kurven und Trades tragen die `run_id` aus der Metrik-Zeile.
+
+    Geflusht wird, sobald `max_buffer_rows` Zeilen gepuffert sind, bei
+    `flush()`/`close()` und beim Verlassen des `with`-Blocks.
+    """
+
+    def __init__(self, directory=None, max_buffer_rows=1_000_000):
+        self.directory = os.path.join(directory or LOG_DIR, RESULTS_SUBDIR)
+        self.max_buffer_rows = max_buffer_rows
+        self._buffers = {}
+        self._rows = 0
+        self._pid = os.getpid()
+        self._seq = itertools.count()
+
+    def add_rows(self, table, frame):
+        """Hängt einen DataFrame an den Puffer der Tabelle `table` an."""
+        self._buffers.setdefault(table, []).append(frame)
+        self._rows += len(frame)
+        if self._rows >= self.max_buffer_rows:
+            self.flush()
+
+    def add_row(self, table, row):
+        """Hängt eine einzelne Zeile (Dict) an die Tabelle `table` an."""
+        self.add_rows(table, pd.DataFrame([row]))
+
+    def add_backtest(self, stats, strategy_name, file_stem, extra=None):
+        """
+        Puffert Kennzahlen, Equity-Kurve und Trades eines Backtests und gibt
+        die `run_id` zurück, unter der sie abgelegt werden.
+        """
+        timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H-%M-%SZ")
+        run_id = f"{file_stem}-{timestamp}-{uuid.uuid4().hex[:8]}"
+        metrics = {
+            'run_id': run_id,
+            'timestamp': timestamp,
+            'strategy': strategy_name,
+            'file': file_stem,
+            'Return [%]': stats['Return [%]'],
+            'Buy & Hold Return [%]': stats['Buy & Hold Return [%]'],
+            'Sharpe Ratio': stats.get('Sharpe Ratio', float('nan')),
+            'CAGR [%]': stats.get('CAGR [%]', float('nan')),
+            'Volatility (Ann.) [%]': stats.get('Volatility (Ann.) [%]', float('nan')),
+            'Max Drawdown [%]': stats.get('Max. Drawdown [%]', float('nan')),
+            'Num Trades': stats.get('# Trades', float('nan')),
+            'Win Rate [%]': stats.get('Win Rate [%]', float('nan'))
+        }
+        metrics.update(extra or {})
+        self.add_row('metrics', metrics)
+
+        equity = stats._equity_curve.rename_axis('Date').reset_index()
+        equity.insert(0, 'run_id', run_id)
+        self.add_rows('equity', equity)
+
+        trades = stats._trades.copy()
+        trades.insert(0, 'run_id', run_id)
+        self.add_rows('trades', trades)
+        return run_id
+
+    def flush(self):
+        """Schreibt alle gepufferten Tabellen, je Tabelle eine neue Datei."""
+        if os.getpid() != self._pid:
+            # Geforkte Kopie: die Puffer gehören dem Elternprozess
+            self._buffers.clear()
+            return
+        for table, frames in self._buffers.items():
+            if not frames:
+                continue
+            data = pd.concat(frames, ignore_index=True)
+            table_dir = os.path.join(self.directory, table)
+            os.makedirs(table_dir, exist_ok=True)
+            stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+            part = os.path.join(table_dir, f"part-{stamp}-{self._pid}-{next(self._seq)}.{_part_extension()}")
+            # Erst temporär schreiben, damit Leser nie eine halbe Datei sehen
+            tmp_file = part + '.tmp'
+            if RESULT_FORMAT == 'parquet':
+                data.to_parquet(tmp_file, compression='zstd', index=False)
+            else:
+                data.to_pickle(tmp_file, compression='gzip')
+            os.replace(tmp_file, part)
+        self._buffers.clear()
+        self._rows = 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_results(table, directory=None, run_id=None):
+    """
+    Liest eine Tabelle des ResultSink (alle Teil-Dateien) als DataFrame,
+    optional nur die Zeilen einer `run_id`.
+    """
+    table_dir = os.path.join(directory or LOG_DIR, RESULTS_SUBDIR, table)
+    extension = _part_extension()
+    parts = sorted(os.path.join(table_dir, name) for name in os.listdir(table_dir)
+                   if name.endswith('.' + extension)) if os.path.isdir(table_dir) else []
+    if not parts:
+        return pd.DataFrame()
+    if RESULT_FORMAT == 'parquet':
+        filters = [('run_id', '==', run_id)] if run_id is not None else None
+        return pd.concat([pd.read_parquet(part, filters=filters) for part in parts], ignore_index=True)
+    data = pd.concat([pd.read_pickle(part, compression='gzip') for part in parts], ignore_index=True)
+    return data[data['run_id'] == run_id].reset_index(drop=True) if run_id is not None else data
+
+
+# Ein Sink pro Prozess, wird beim Beenden geflusht (auch in Worker-Prozessen,
+# die ohne atexit enden)
+_default_sink = None
+
+
+def default_sink():
+    """Gemeinsamer ResultSink des aktuellen Prozesses."""
+    global _default_sink
+    if _default_sink is None or _default_sink._pid != os.getpid():
+        _default_sink = ResultSink()
+        atexit.register(_default_sink.flush)
+        multiprocessing.util.Finalize(None, _default_sink.flush, exitpriority=10)
+    return _default_sink
+
+
+def save_result(result, name, sink=None):
+    """Hängt eine Ergebniszeile (Dict) an die Tabelle `name` an (gepuffert)."""
+    (sink or default_sink()).add_row(name, result)
 
 
-def save_backtest_outputs(bt, stats, strategy_name, file_path):
+def save_backtest_outputs(bt, stats, strategy_name, file_path, sink=None, renderer=None):
     """
     Konsolidierte Funktion, um alle Outputs eines Backtests zu speichern:
-    - Metrics (inkl. Buy & Hold)
-    - Equity Curve
-    - Trades
-    - Chart
+    - Metrics (inkl. Buy & Hold), Equity Curve und Trades gepuffert im
+      ResultSink (Standard: `default_sink()`), siehe `load_results`
+    - Chart, im Hintergrund gerendert (siehe `save_chart`)
 
-    `file_path` wird als Basisname verwendet (ohne Extension).
+    `file_path` wird als Basisname verwendet (ohne Extension). Gibt die
+    `run_id` zurück.
     """
     # Basisname aus Pfad
     file_stem = os.path.splitext(os.path.basename(file_path))[0]
     # Speichern
-    save_metrics(stats, strategy_name, file_stem)
-    save_equity_curve(stats, file_stem)
-    save_trades(stats, file_stem)
-    save_chart(bt, stats, file_stem)
\ No newline at end of file
+    run_id = (sink or default_sink()).add_backtest(stats, strategy_name, file_stem)
+    save_chart(bt, stats, file_stem, renderer)
+    return run_id
\ No newline at end of file
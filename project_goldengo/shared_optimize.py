@@ -0,0 +1,190 @@
+# shared_optimize.py
+"""
+`bt.optimize` mit einmal veröffentlichten OHLCV-Daten im Shared Memory.
+
+backtesting.py (0.6) kopiert den kompletten DataFrame für *jeden* Batch der
+Optimierung in ein neues Shared-Memory-Segment, bei 32 Kernen also gut 30
+Kopien gleichzeitig, dazu wird pro Batch ein Backtest-Objekt gepickelt.
+`optimize_shared` legt die vorbereiteten Arrays dagegen genau einmal in einen
+`multiprocessing.shared_memory`-Block. Jeder Worker hängt sich beim Start
+einmal an (ohne Kopie, nur lesend) und bekommt danach nur noch die
+Parameter-Batches geschickt. Beim Verlassen wird der Block wieder freigegeben.
+
+    stats, heatmap = optimize_shared(bt, n1=range(10, 35, 5), n2=range(40, 75, 5),
+                                     constraint=lambda p: p.n1 < p.n2,
+                                     maximize='Equity Final [$]', return_heatmap=True)
+"""
+
+import os
+from copy import copy
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+import backtesting
+
+from project_goldengo.grid import parameter_grid
+
+
+class SharedOHLCV:
+    """
+    Legt Index (int64) und alle Spalten (float64) eines DataFrames in
+    einen einzigen Shared-Memory-Block. `handle` ist klein und lässt sich an
+    andere Prozesse schicken, dort liefert `attach(handle)` den DataFrame.
+    """
+
+    def __init__(self, data):
+        n = len(data)
+        columns = list(data.columns)
+        index = pd.DatetimeIndex(data.index)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * n * (len(columns) + 1)))
+        try:
+            stamps, values = _views(self._shm.buf, n, len(columns))
+            stamps[:] = (index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index).asi8
+            for i, col in enumerate(columns):
+                values[i] = data[col].to_numpy(dtype=np.float64)
+        except Exception:
+            self.close()
+            raise
+        tz = str(index.tz) if index.tz is not None else None
+        # Auflösung des Zeitstempels (ab pandas 2 nicht immer ns)
+        unit = getattr(index, 'unit', 'ns')
+        self.handle = (self._shm.name, n, columns, tz, unit, data.index.name)
+
+    def close(self):
+        """Gibt den Block frei (im erzeugenden Prozess)."""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _views(buf, n, n_columns):
+    stamps = np.ndarray((n,), dtype=np.int64, buffer=buf)
+    values = np.ndarray((n_columns, n), dtype=np.float64, buffer=buf, offset=8 * n)
+    return stamps, values
+
+
+def _attach_shm(name):
+    """Hängt sich an einen Block an, ohne ihn beim Resource-Tracker anzumelden."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 kennt `track` nicht. Abmelden nach dem Anhängen geht
+        # nicht: geforkte Worker teilen sich den Tracker mit dem Elternprozess.
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def attach(handle):
+    """
+    Baut aus einem `SharedOHLCV.handle` einen DataFrame, dessen Spalten direkt
+    auf den Shared-Memory-Block zeigen (schreibgeschützt). Gibt
+    (DataFrame, SharedMemory) zurück; das SharedMemory-Objekt muss leben,
+    solange der DataFrame benutzt wird.
+    """
+    name, n, columns, tz, unit, index_name = handle
+    shm = _attach_shm(name)
+    stamps, values = _views(shm.buf, n, len(columns))
+    stamps.setflags(write=False)
+    values.setflags(write=False)
+
+    index = pd.DatetimeIndex(stamps.view(f'datetime64[{unit}]'), name=index_name)
+    if tz is not None:
+        index = index.tz_localize('UTC').tz_convert(tz)
+    data = pd.DataFrame(values.T, index=index, columns=columns, copy=False)
+    return data, shm
+
+
+# Zustand der Worker-Prozesse, gesetzt vom Pool-Initializer
+_worker = {}
+
+
+def _init_worker(template, handle):
+    data, shm = attach(handle)
+    template._data = data
+    _worker['bt'] = template
+    _worker['shm'] = shm
+
+
+def _run_batch(params_batch):
+    bt = _worker['bt']
+    return [stats.filter(regex='^[^_]') if stats['# Trades'] else None
+            for stats in (bt.run(**params) for params in params_batch)]
+
+
+def _stat_keys():
+    """Kennzahlen eines bt.run()-Ergebnisses, gegen die bt.optimize `maximize` prüft (None: unbekannt)."""
+    try:
+        from backtesting._stats import dummy_stats
+    except ImportError:
+        return None
+    return [key for key in dummy_stats().index if not key.startswith('_')]
+
+
+def _batches(seq, processes):
+    # Gleiche Aufteilung wie backtesting.py, aber nach Anzahl der Worker
+    size = int(np.clip(len(seq) // processes, 1, 300))
+    return [seq[i:i + size] for i in range(0, len(seq), size)]
+
+
+def optimize_shared(bt, maximize='SQN', constraint=None, return_heatmap=False,
+                    processes=None, **params):
+    """
+    Gitter-Optimierung wie `bt.optimize(...)` (gleiche `maximize`-,
+    `constraint`- und `return_heatmap`-Konventionen), aber die Daten werden
+    nur einmal per Shared Memory an die Worker übergeben. Der Pool kommt aus
+    `backtesting.Pool`, eigene Pools (z.B. `multiprocessing.Pool`) greifen
+    also weiterhin. Die beste Kombination wird im aktuellen Prozess noch
+    einmal vollständig gerechnet.
+    """
+    if isinstance(maximize, str):
+        # Jede Kennzahl aus bt.run() ist erlaubt, nicht nur die von `grid`
+        maximize_key = maximize
+        keys = _stat_keys()
+        if keys is not None and maximize_key not in keys:
+            raise ValueError(f"`maximize` muss eine Kennzahl aus bt.run() sein: {list(keys)}")
+
+        def maximize(stats, _key=maximize_key):
+            return stats[_key]
+    elif callable(maximize):
+        maximize_key = None
+    else:
+        raise TypeError("`maximize` muss ein Kennzahl-Name oder eine Funktion sein.")
+
+    combos = parameter_grid(constraint, **params)
+    names = list(params)
+
+    heatmap = pd.Series(np.nan, name=maximize_key,
+                        index=pd.MultiIndex.from_tuples([tuple(c.values()) for c in combos], names=names))
+
+    # Backtest ohne Daten an die Worker schicken, die Daten kommen aus dem Shared Memory
+    template = copy(bt)
+    template._data = None
+    batches = _batches(combos, processes or os.cpu_count() or 1)
+
+    with SharedOHLCV(bt._data) as shared, \
+            backtesting.Pool(processes, _init_worker, (template, shared.handle)) as pool:
+        for batch, results in zip(batches, pool.imap(_run_batch, batches)):
+            for combo, stats in zip(batch, results):
+                if stats is not None:
+                    heatmap[tuple(combo.values())] = maximize(stats)
+
+    if heatmap.isna().all():
+        stats = bt.run(**combos[0])
+    else:
+        stats = bt.run(**dict(zip(names, heatmap.idxmax())))
+
+    if return_heatmap:
+        return stats, heatmap
+    return stats
@@ -0,0 +1,86 @@
+# trailing_stop.py
+"""
+Trailing-Stop auf Basis des höchsten Hochs seit dem Einstieg.
+
+Statt in jedem `next()` `self.data.High[entry_bar:].max()` neu zu berechnen
+(O(Haltedauer) pro Kerze, bei langen Trades also quadratisch), führt
+`TrailingStop` das Hoch laufend mit: Jede Kerze wird genau einmal
+angeschaut. Bei einem neuen Trade (andere Einstiegskerze) wird automatisch
+zurückgesetzt.
+
+Verwendung in einer backtesting.py-Strategie:
+
+    def init(self):
+        self.trailing_stop = TrailingStop(self.stop_loss_pct)
+
+    def next(self):
+        ...
+        if self.position:
+            stop = self.trailing_stop.update(self)
+"""
+
+import numpy as np
+
+
+class TrailingStop:
+    """
+    Laufendes Maximum der Hochs seit `entry_bar`. `level` ist das Hoch mal
+    `factor` (z.B. 0.85 für einen Stop 15 % unter dem Hoch).
+    """
+
+    def __init__(self, factor=1.0):
+        self.factor = factor
+        self.reset()
+
+    def reset(self):
+        """Vergisst den aktuellen Trade (z.B. wenn keine Position mehr offen ist)."""
+        self.entry_bar = None
+        self.highest = np.nan
+        self._next_bar = 0
+
+    def start(self, entry_bar, highs):
+        """Beginnt einen neuen Trade ab `entry_bar` und liest die Hochs bis zur aktuellen Kerze."""
+        self.entry_bar = entry_bar
+        self.highest = -np.inf
+        self._next_bar = entry_bar
+        return self.track(highs)
+
+    def track(self, highs, entry_bar=None):
+        """
+        Nimmt alle Kerzen seit dem letzten Aufruf in das Maximum auf.
+        `highs` sind die Hochs bis einschließlich der aktuellen Kerze (z.B.
+        `self.data.High`). Ändert sich `entry_bar`, beginnt ein neuer Trade.
+        Gibt das höchste Hoch seit dem Einstieg zurück.
+        """
+        if entry_bar is not None and entry_bar != self.entry_bar:
+            return self.start(entry_bar, highs)
+
+        end = len(highs)
+        if end > self._next_bar:
+            # Normalfall: genau eine neue Kerze, nach übersprungenen Aufrufen mehrere
+            if end == self._next_bar + 1:
+                high = highs[end - 1]
+            else:
+                high = np.max(highs[self._next_bar:end])
+            # NaN bleibt wie bei `.max()` hängen
+            if high > self.highest or high != high:
+                self.highest = float(high)
+            self._next_bar = end
+        return self.highest
+
+    @property
+    def level(self):
+        """Aktuelles Stop-Niveau (`highest * factor`)."""
+        return self.highest * self.factor
+
+    def update(self, strategy):
+        """
+        Bequemer Aufruf aus `Strategy.next()`: führt das Hoch für den letzten
+        offenen Trade nach und gibt das Stop-Niveau zurück. Ohne Position wird
+        zurückgesetzt und None zurückgegeben.
+        """
+        if not strategy.position:
+            self.reset()
+            return None
+        self.track(strategy.data.High, strategy.trades[-1].entry_bar)
+        return self.level
@@ -0,0 +1,292 @@
+# vectorized.py
+"""
+Vektorisierte Backtest-Engine für signalbasierte Long-Strategien.
+
+Statt `Strategy.next()` für jede Kerze aufzurufen, bekommt `run_signals`
+fertige Einstiegs-/Ausstiegssignale als Arrays (plus optionale Stop-Loss-,
+Take-Profit- und Trailing-Stop-Niveaus). Simuliert wird Trade für Trade: Pro
+Trade wird nur der Abschnitt bis zum Ausstieg mit NumPy durchsucht, eine
+Python-Schleife über die Kerzen gibt es nicht.
+
+Die Ausführungslogik folgt backtesting.py (Version 0.6):
+
+- Ein Signal auf Kerze `i` wird auf Kerze `i + 1` ausgeführt, zum Open bzw.
+  mit `trade_on_close=True` zum Close von Kerze `i`.
+- `size < 1` ist ein Anteil des verfügbaren Kapitals (ganze Einheiten),
+  `size >= 1` eine feste Stückzahl.
+- Die Kommission wird beim Ein- und Ausstieg auf den Handelswert berechnet.
+- SL/TP werden ab der Ausführungskerze geprüft. Ein Signal-Exit aus der
+  Vorkerze wird vor SL/TP ausgeführt, danach gilt SL vor TP.
+  SL füllt zu min(Open, SL), TP zu max(Open, TP).
+- Offene Trades am Ende zählen nicht als Trade, stecken aber in der Equity.
+
+`run_signals` gibt eine pd.Series mit denselben Kennzahlen-Namen zurück wie
+`bt.run()`, sie kann also direkt an `saved_output.save_metrics` gehen.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Startbreite des Suchfensters pro Trade, wird bei Bedarf verdoppelt
+_SCAN_WINDOW = 64
+
+
+def crossover(series1, series2):
+    """
+    Vektorisierte Version von `backtesting.lib.crossover`: True auf jeder
+    Kerze, auf der `series1` von unten über `series2` kreuzt.
+    """
+    a, b = np.broadcast_arrays(np.asarray(series1, dtype=float), np.asarray(series2, dtype=float))
+    out = np.zeros(a.shape, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        out[1:] = (a[:-1] < b[:-1]) & (a[1:] > b[1:])
+    return out
+
+
+def _level(value, n):
+    """Stop-/Ziel-Niveaus als float-Array (NaN = kein Niveau)."""
+    if value is None:
+        return None
+    return np.broadcast_to(np.asarray(value, dtype=float), (n,))
+
+
+def _order_units(balance, price, size, commission):
+    """
+    Stückzahl einer Kauforder wie beim Broker von backtesting.py: `size < 1`
+    ist ein Anteil des Kapitals, sonst eine feste Stückzahl. Reicht das
+    Kapital nicht, ist das Ergebnis 0 (Order verworfen). Funktioniert mit
+    Skalaren und Arrays.
+    """
+    size = np.asarray(size, dtype=float)
+    abs_size = np.abs(size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        price_plus_commission = price + abs_size * price * commission / abs_size
+        units = np.where(size < 1, np.floor_divide(balance * size, price_plus_commission), np.trunc(size))
+        units = np.where((units > 0) & (units * price_plus_commission <= balance), units, 0)
+    return units
+
+
+def _find_exit(f, entry_bar, stop0, tp_level, trail, sig_bar, open_, high, low):
+    """
+    Sucht ab Kerze `f` die erste Kerze, auf der SL/Trailing-Stop oder TP
+    ausgelöst wird, höchstens bis vor `sig_bar` (dort greift der Signal-Exit).
+    Gibt (Kerze, Preis, Art) zurück oder None.
+    """
+    n = len(low)
+    lo = f
+    width = _SCAN_WINDOW
+    carry = -np.inf
+    end = n if sig_bar is None else sig_bar
+
+    while lo < end:
+        hi = min(end, lo + width)
+        stop = np.full(hi - lo, stop0)
+        if trail is not None:
+            # Trailing-Stop für Kerze j = Maximum von trail[entry_bar .. j-1]
+            prev = np.arange(lo - 1, hi - 1)
+            cand = np.where(prev >= entry_bar, trail[np.maximum(prev, 0)], -np.inf)
+            cand = np.maximum.accumulate(np.maximum(cand, carry))
+            carry = cand[-1]
+            stop = np.fmax(stop, cand)
+
+        with np.errstate(invalid='ignore'):
+            stop_hit = low[lo:hi] <= stop
+            tp_hit = high[lo:hi] >= tp_level if not np.isnan(tp_level) else None
+        hits = stop_hit if tp_hit is None else stop_hit | tp_hit
+        if hits.any():
+            k = int(np.argmax(hits))
+            j = lo + k
+            if stop_hit[k]:
+                return j, min(open_[j], stop[k]), 'SL'
+            return j, max(open_[j], tp_level), 'TP'
+
+        lo = hi
+        width *= 2
+    return None
+
+
+def run_signals(data, entries, exits=None, sl=None, tp=None, trail=None,
+                cash=10_000, commission=0.0, size=1 - np.finfo(float).eps,
+                trade_on_close=False, start=1):
+    """
+    Führt einen Long-only-Backtest auf Basis von Signal-Arrays aus.
+
+    - `data`: OHLC(V)-DataFrame wie für backtesting.py
+    - `entries` / `exits`: bool-Arrays, ein True auf Kerze `i` entspricht
+      `self.buy()` bzw. `self.position.close()` in `next()` auf Kerze `i`
+    - `sl` / `tp`: Preisniveaus (Skalar oder Array), beim Einstieg wird der
+      Wert der Signal-Kerze übernommen (z.B. `close * 0.85`)
+    - `trail`: Array mit Trailing-Niveaus (z.B. `high * 0.85`); der Stop ist
+      das Maximum seit der Einstiegskerze und wird nie gesenkt
+    - `start`: erste Kerze, auf der Signale zählen (backtesting.py beginnt
+      bei 1 + Aufwärmphase der Indikatoren)
+    """
+    n = len(data)
+    open_ = data['Open'].to_numpy(dtype=float)
+    high = data['High'].to_numpy(dtype=float)
+    low = data['Low'].to_numpy(dtype=float)
+    close = data['Close'].to_numpy(dtype=float)
+
+    entries = np.asarray(entries, dtype=bool).copy()
+    entries[:start] = False
+    exit_idx = np.flatnonzero(exits) if exits is not None else np.empty(0, dtype=int)
+    exit_idx = exit_idx[exit_idx >= start]
+    entry_idx = np.flatnonzero(entries)
+    sl = _level(sl, n)
+    tp = _level(tp, n)
+    trail = None if trail is None else np.asarray(trail, dtype=float)
+
+    equity = np.empty(n)
+    trades = []
+    balance = float(cash)
+    filled_until = 0
+    pos = start
+
+    while True:
+        k = np.searchsorted(entry_idx, pos)
+        if k == len(entry_idx):
+            break
+        i = int(entry_idx[k])
+        f = i + 1
+        if f >= n:
+            break
+
+        entry_price = close[i] if trade_on_close else open_[f]
+        entry_bar = i if trade_on_close else f
+        units = int(_order_units(balance, entry_price, size, commission))
+        if units <= 0:
+            # Wie beim Broker: Order mangels Kapital verworfen
+            pos = i + 1
+            continue
+
+        equity[filled_until:f] = balance
+        balance -= units * entry_price * commission
+
+        # Signal-Exit: erstes Exit-Signal ab der Ausführungskerze, wirkt eine Kerze später
+        m = np.searchsorted(exit_idx, f)
+        sig_bar = int(exit_idx[m]) + 1 if m < len(exit_idx) and exit_idx[m] + 1 < n else None
+
+        stop0 = sl[i] if sl is not None else np.nan
+        tp_level = tp[i] if tp is not None else np.nan
+        hit = _find_exit(f, entry_bar, stop0, tp_level, trail, sig_bar, open_, high, low)
+        if hit is None and sig_bar is not None:
+            hit = (sig_bar, close[sig_bar - 1] if trade_on_close else open_[sig_bar], 'Signal')
+
+        if hit is None:
+            # Trade bleibt bis zum Ende offen
+            equity[f:] = balance + units * (close[f:] - entry_price)
+            filled_until = n
+            break
+
+        e, exit_price, reason = hit
+        equity[f:e] = balance + units * (close[f:e] - entry_price)
+        exit_bar = e - 1 if reason == 'Signal' and trade_on_close else e
+        commissions = units * (entry_price + exit_price) * commission
+        pnl = units * (exit_price - entry_price) - commissions
+        balance += units * (exit_price - entry_price) - units * exit_price * commission
+        trades.append((units, entry_bar, exit_bar, entry_price, exit_price,
+                       stop0, tp_level, pnl, commissions, reason))
+        filled_until = e
+        pos = e
+
+    equity[filled_until:] = balance
+
+    trades_df = pd.DataFrame(trades, columns=['Size', 'EntryBar', 'ExitBar', 'EntryPrice', 'ExitPrice',
+                                              'SL', 'TP', 'PnL', 'Commission', 'ExitReason'])
+    trades_df['ReturnPct'] = trades_df['PnL'] / (trades_df['Size'] * trades_df['EntryPrice'])
+    trades_df['EntryTime'] = data.index[trades_df['EntryBar'].to_numpy(dtype=int)]
+    trades_df['ExitTime'] = data.index[trades_df['ExitBar'].to_numpy(dtype=int)]
+    trades_df['Duration'] = trades_df['ExitTime'] - trades_df['EntryTime']
+
+    return compute_stats(equity, trades_df, data, first_trading_bar=start - 1)
+
+
+def _geometric_mean(returns):
+    returns = np.asarray(returns, dtype=float)
+    returns = np.nan_to_num(returns) + 1
+    if len(returns) == 0:
+        return np.nan
+    if np.any(returns <= 0):
+        return 0
+    return np.exp(np.log(returns).sum() / len(returns)) - 1
+
+
+def _period_ends(index):
+    """
+    Positionen der letzten Kerze je Tag (bzw. Woche/Monat/Jahr bei gröberen
+    Daten) und die Anzahl Handelsperioden pro Jahr, wie in backtesting.py.
+    Ohne DatetimeIndex: (None, NaN).
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return None, np.nan
+    period = pd.Series(index[-100:]).diff().dropna().median()
+    freq_days = period.days
+    have_weekends = index.dayofweek.to_series().between(5, 6).mean() > 2 / 7 * .6
+    annual_trading_days = (52 if freq_days == 7 else 12 if freq_days == 31 else
+                           1 if freq_days == 365 else (365 if have_weekends else 252))
+    freq = {7: 'W', 31: 'ME', 365: 'YE'}.get(freq_days, 'D')
+    positions = pd.Series(np.arange(len(index)), index=index).resample(freq).last().dropna()
+    return positions.to_numpy(dtype=np.int64), annual_trading_days
+
+
+def compute_stats(equity, trades, data, first_trading_bar=0):
+    """
+    Berechnet die Kennzahlen aus Equity-Kurve und Trade-Liste mit denselben
+    Formeln und Namen wie backtesting.py (`bt.run()`).
+    """
+    index = data.index
+    equity = np.asarray(equity, dtype=float)
+    dd = 1 - equity / np.maximum.accumulate(equity)
+    equity_df = pd.DataFrame({'Equity': equity, 'DrawdownPct': dd}, index=index)
+
+    pl = trades['PnL'] if len(trades) else pd.Series(dtype=float)
+    returns = trades['ReturnPct'] if len(trades) else pd.Series(dtype=float)
+
+    s = {}
+    s['Start'] = index[0]
+    s['End'] = index[-1]
+    s['Duration'] = s['End'] - s['Start']
+
+    have_position = np.zeros(len(index))
+    for entry_bar, exit_bar in trades[['EntryBar', 'ExitBar']].itertuples(index=False):
+        have_position[entry_bar:exit_bar + 1] = 1
+    s['Exposure Time [%]'] = have_position.mean() * 100
+    s['Equity Final [$]'] = equity[-1]
+    s['Equity Peak [$]'] = equity.max()
+    if len(trades):
+        s['Commissions [$]'] = trades['Commission'].sum()
+    s['Return [%]'] = (equity[-1] - equity[0]) / equity[0] * 100
+    c = data['Close'].to_numpy(dtype=float)
+    s['Buy & Hold Return [%]'] = (c[-1] - c[first_trading_bar]) / c[first_trading_bar] * 100
+
+    gmean_day_return = 0
+    day_returns = pd.Series(dtype=float)
+    period_ends, annual_trading_days = _period_ends(index)
+    if period_ends is not None:
+        day_returns = equity_df['Equity'].iloc[period_ends].pct_change().dropna()
+        gmean_day_return = _geometric_mean(day_returns)
+
+    annualized_return = (1 + gmean_day_return) ** annual_trading_days - 1
+    s['Return (Ann.) [%]'] = annualized_return * 100
+    s['Volatility (Ann.) [%]'] = np.sqrt(
+        (day_returns.var(ddof=int(bool(day_returns.shape))) + (1 + gmean_day_return) ** 2) ** annual_trading_days
+        - (1 + gmean_day_return) ** (2 * annual_trading_days)) * 100
+    if isinstance(index, pd.DatetimeIndex):
+        time_in_years = (s['Duration'].days + s['Duration'].seconds / 86400) / 365.25
+        s['CAGR [%]'] = ((equity[-1] / equity[0]) ** (1 / time_in_years) - 1) * 100 if time_in_years else np.nan
+    s['Sharpe Ratio'] = s['Return (Ann.) [%]'] / (s['Volatility (Ann.) [%]'] or np.nan)
+    max_dd = -np.nan_to_num(dd.max())
+    s['Calmar Ratio'] = annualized_return / (-max_dd or np.nan)
+    s['Max. Drawdown [%]'] = max_dd * 100
+    s['# Trades'] = n_trades = len(trades)
+    win_rate = np.nan if not n_trades else (pl > 0).mean()
+    s['Win Rate [%]'] = win_rate * 100
+    s['Best Trade [%]'] = returns.max() * 100
+    s['Worst Trade [%]'] = returns.min() * 100
+    s['Avg. Trade [%]'] = _geometric_mean(returns) * 100
+    s['Profit Factor'] = returns[returns > 0].sum() / (abs(returns[returns < 0].sum()) or np.nan)
+    s['Expectancy [%]'] = returns.mean() * 100
+    s['SQN'] = np.sqrt(n_trades) * pl.mean() / (pl.std() or np.nan)
+    s['_equity_curve'] = equity_df
+    s['_trades'] = trades
+    return pd.Series(s, dtype=object)
@@ -0,0 +1,201 @@
+# walk_forward.py
+"""
+Walk-Forward-Optimierung mit den Signal-Funktionen von `evaluate_grid`.
+
+Die Daten werden in Trainings- und Testfenster zerlegt, rollierend (festes
+Trainingsfenster, das mitwandert) oder verankert (Training immer ab der
+ersten Kerze). Auf jedem Trainingsfenster wird das Gitter optimiert, die
+beste Kombination läuft danach auf dem folgenden Testfenster. Die
+Testfenster schließen lückenlos aneinander an und ergeben zusammen eine
+Out-of-Sample-Equity-Kurve mit Kennzahlen wie bei `bt.run()`.
+
+Kosten: Die Signale (und damit alle Indikatoren) eines Kombinations-Blocks
+werden pro Worker nur *einmal* auf der ganzen Historie berechnet. Jedes
+Fenster simuliert nur seinen Ausschnitt daraus. Bei kausalen Indikatoren
+(EMA, RSI, ...) ist das dasselbe wie ein Backtest, der ab dem Fensterbeginn
+handelt, die Indikatoren aber mit der Historie davor aufgewärmt hat. Die
+Fenster werden auf `max_workers` Prozesse verteilt.
+
+    stats = walk_forward(data, grid_signals, train='365D', test='90D',
+                         n1=range(10, 35, 5), n2=range(40, 75, 5),
+                         constraint=lambda p: p.n1 < p.n2,
+                         maximize='Equity Final [$]', cash=100_000, commission=0.001)
+    print(stats)                  # Out-of-Sample-Kennzahlen
+    print(stats['_windows'])      # Fenster, beste Parameter, IS-/OOS-Werte
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from project_goldengo.grid import (_BLOCK_BYTES, _BYTES_PER_CELL, _block_stats, _maximize_key,
+                                   _simulate_block, heatmap_from_stats, parameter_grid)
+from project_goldengo.vectorized import compute_stats
+
+
+def _bars(index, start, length):
+    """Position der ersten Kerze ab `index[start] + length` (Anzahl Kerzen oder Zeitspanne)."""
+    if isinstance(length, (int, np.integer)):
+        return min(start + int(length), len(index))
+    if not isinstance(index, pd.DatetimeIndex):
+        raise TypeError("Zeitspannen wie '90D' brauchen einen DatetimeIndex, sonst Anzahl Kerzen angeben.")
+    return int(index.searchsorted(index[start] + pd.Timedelta(length), side='left'))
+
+
+def walk_forward_windows(index, train, test, anchored=False):
+    """
+    Fenster als Liste von (train_lo, train_hi, test_lo, test_hi) in
+    Kerzen-Positionen (Ende jeweils exklusiv). `train`/`test` sind
+    Anzahl Kerzen oder Zeitspannen wie '365D'. Das letzte Testfenster darf
+    kürzer sein.
+    """
+    windows = []
+    test_lo = _bars(index, 0, train)
+    while test_lo < len(index) - 1:
+        test_hi = min(max(_bars(index, test_lo, test), test_lo + 2), len(index))
+        if anchored:
+            train_lo = 0
+        elif isinstance(train, (int, np.integer)):
+            train_lo = max(0, test_lo - int(train))
+        else:
+            train_lo = int(index.searchsorted(index[test_lo] - pd.Timedelta(train), side='left'))
+        windows.append((train_lo, test_lo, test_lo, test_hi))
+        test_lo = test_hi
+    if not windows:
+        raise ValueError("Zu wenig Daten für ein Trainings- und ein Testfenster.")
+    return windows
+
+
+def _slice_signals(signals, n, lo, hi):
+    """Schneidet die Zeilen `lo:hi` aus allen Signal-Matrizen, `start` wird angepasst."""
+    sliced = {}
+    for key, value in signals.items():
+        if key == 'start':
+            sliced[key] = np.maximum(1, np.asarray(value, dtype=np.int64) - lo)
+            continue
+        array = np.asarray(value)
+        sliced[key] = array[lo:hi] if array.ndim >= 1 and len(array) == n else value
+    return sliced
+
+
+def _simulate_window(signals, market, n, k, lo, hi, run):
+    window_market = {col: values[lo:hi] for col, values in market.items()}
+    return _simulate_block(_slice_signals(signals, n, lo, hi), window_market, k, run['cash'],
+                           run['commission'], run['size'], run['trade_on_close'])
+
+
+def _optimize_windows(data, signal_func, combos, windows, maximize, block_size, run):
+    """
+    Worker: bewertet alle `combos` auf den Trainingsfenstern `windows`. Die
+    Signale eines Blocks werden einmal berechnet und für alle Fenster geteilt.
+    Gibt pro Fenster die Heatmap zurück.
+    """
+    n = len(data)
+    market = {col: data[col].to_numpy(dtype=float) for col in ('Open', 'High', 'Low', 'Close')}
+    names = list(combos[0])
+    frames = [[] for _ in windows]
+    for lo in range(0, len(combos), block_size):
+        block = combos[lo:lo + block_size]
+        signals = signal_func(data, **{name: np.array([combo[name] for combo in block]) for name in names})
+        for frame, (train_lo, train_hi, _, _) in zip(frames, windows):
+            equity, trades, start = _simulate_window(signals, market, n, len(block), train_lo, train_hi, run)
+            frame.append(_block_stats(equity, trades, start, data.index[train_lo:train_hi],
+                                      market['Close'][train_lo:train_hi]))
+        del signals
+
+    index = pd.MultiIndex.from_tuples([tuple(combo[name] for name in names) for combo in combos], names=names)
+    heatmaps = []
+    for frame in frames:
+        stats = pd.concat(frame, ignore_index=True)
+        stats.index = index
+        heatmaps.append(heatmap_from_stats(stats, maximize))
+    return heatmaps
+
+
+def walk_forward(data, signal_func, train='365D', test='90D', anchored=False,
+                 maximize='Equity Final [$]', constraint=None, max_workers=None,
+                 cash=10_000, commission=0.0, size=1 - np.finfo(float).eps,
+                 trade_on_close=False, block_size=None, **params):
+    """
+    Walk-Forward-Optimierung des Gitters `params` (siehe Modul-Doku). Gibt
+    die Out-of-Sample-Kennzahlen als pd.Series zurück wie `bt.run()`, mit
+    `_equity_curve`, `_trades` und zusätzlich `_windows` (DataFrame mit
+    Fenstergrenzen, besten Parametern, In-Sample-Wert und OOS-Rendite).
+
+    - `train`/`test`: Länge von Trainings- und Testfenster (Anzahl Kerzen
+      oder Zeitspanne wie '365D'); die Testfenster rücken um `test` weiter
+    - `anchored=True`: Training immer ab der ersten Kerze
+    - `max_workers`: Prozesse für die Trainingsfenster (Standard: alle
+      Kerne), `max_workers=1` läuft im aktuellen Prozess
+    - übrige Argumente wie bei `evaluate_grid`
+
+    Das Kapital wird von Testfenster zu Testfenster weitergereicht. Eine am
+    Ende eines Testfensters offene Position wird zum letzten Schlusskurs
+    bewertet (ohne Kommission) und nicht in das nächste Fenster übernommen.
+    """
+    maximize_key = _maximize_key(maximize)
+    combos = parameter_grid(constraint, **params)
+    names = list(params)
+    windows = walk_forward_windows(data.index, train, test, anchored)
+    run = dict(cash=cash, commission=commission, size=size, trade_on_close=trade_on_close)
+    n = len(data)
+    block_size = block_size or max(1, _BLOCK_BYTES // (n * _BYTES_PER_CELL))
+
+    # Zusammenhängende Fenster pro Worker: überlappende Trainingsfenster teilen sich die Signale
+    max_workers = min(max_workers or os.cpu_count() or 1, len(windows))
+    chunks = [list(chunk) for chunk in np.array_split(np.arange(len(windows)), max_workers) if len(chunk)]
+    tasks = [(data, signal_func, combos, [windows[i] for i in chunk], maximize, block_size, run)
+             for chunk in chunks]
+    if max_workers == 1:
+        results = [_optimize_windows(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_optimize_windows, *zip(*tasks)))
+    heatmaps = [heatmap for result in results for heatmap in result]
+
+    # Out-of-Sample: beste Kombination pro Fenster, Kapital wird weitergereicht
+    market = {col: data[col].to_numpy(dtype=float) for col in ('Open', 'High', 'Low', 'Close')}
+    oos_lo, oos_hi = windows[0][2], windows[-1][3]
+    equity_parts, trade_parts, rows = [], [], []
+    balance = float(cash)
+    for number, ((train_lo, train_hi, test_lo, test_hi), heatmap) in enumerate(zip(windows, heatmaps)):
+        row = {'Fenster': number, 'Train Start': data.index[train_lo], 'Train Ende': data.index[train_hi - 1],
+               'Test Start': data.index[test_lo], 'Test Ende': data.index[test_hi - 1]}
+        if heatmap.isna().all():
+            # Keine Kombination hat im Training gehandelt: Testfenster ohne Trades
+            equity_parts.append(np.full(test_hi - test_lo, balance))
+            row.update({name: np.nan for name in names})
+            rows.append(row)
+            continue
+
+        best = dict(zip(names, heatmap.idxmax()))
+        signals = signal_func(data, **{name: np.array([value]) for name, value in best.items()})
+        equity, trades, _ = _simulate_window(signals, market, n, 1, test_lo, test_hi, dict(run, cash=balance))
+        equity_parts.append(equity[:, 0])
+
+        offset = test_lo - oos_lo
+        trade_parts.append(pd.DataFrame({
+            'Size': trades['size'], 'EntryBar': trades['entry_bar'].astype(np.int64) + offset,
+            'ExitBar': trades['exit_bar'].astype(np.int64) + offset, 'EntryPrice': trades['entry_price'],
+            'ExitPrice': trades['exit_price'], 'PnL': trades['pnl'], 'Commission': trades['commission'],
+            'Window': number,
+        }))
+        row.update(best)
+        row['IS ' + (maximize_key or 'Wert')] = heatmap.max()
+        row['OOS Return [%]'] = (equity[-1, 0] / balance - 1) * 100
+        rows.append(row)
+        balance = float(equity[-1, 0])
+
+    oos = data.iloc[oos_lo:oos_hi]
+    trades = pd.concat(trade_parts, ignore_index=True) if trade_parts else pd.DataFrame(
+        columns=['Size', 'EntryBar', 'ExitBar', 'EntryPrice', 'ExitPrice', 'PnL', 'Commission', 'Window'])
+    trades['ReturnPct'] = trades['PnL'] / (trades['Size'] * trades['EntryPrice'])
+    trades['EntryTime'] = oos.index[trades['EntryBar'].to_numpy(dtype=int)]
+    trades['ExitTime'] = oos.index[trades['ExitBar'].to_numpy(dtype=int)]
+    trades['Duration'] = trades['ExitTime'] - trades['EntryTime']
+
+    stats = compute_stats(np.concatenate(equity_parts), trades, oos)
+    stats['_windows'] = pd.DataFrame(rows)
+    return stats